@@ -0,0 +1,68 @@
+"""
+Compares time and memory of building dataframe from /api/sql/query result:
+  - rows: pd.DataFrame(rows), path used by default
+  - streamed columns: columns decoded by SqlResponseStreamDecoder
+  - nullable: dtype_backend='numpy_nullable'
+  - categorical: categorical_threshold=0.1
+
+Run: python benchmarks/dataframe_build.py
+"""
+import time
+import tracemalloc
+
+import pandas as pd
+
+from mindsdb_sdk.utils.dataframe import build_dataframe
+
+
+def make_rows(rows_count, columns_count):
+    rows = []
+    for i in range(rows_count):
+        row = []
+        for j in range(columns_count):
+            kind = j % 4
+            if kind == 0:
+                row.append(i)
+            elif kind == 1:
+                row.append(None if i % 10 == 0 else i * 0.5)
+            elif kind == 2:
+                row.append(f'category {i % 20}')
+            else:
+                # int column with nulls
+                row.append(None if i % 7 == 0 else i)
+        rows.append(row)
+    return rows
+
+
+def measure(name, fnc):
+    # time is measured without tracing of memory, it slows down allocations
+    start = time.perf_counter()
+    fnc()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    df = fnc()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = df.memory_usage(deep=True).sum()
+    print(f'  {name:<20} {elapsed:8.3f}s  peak {peak / 2**20:8.1f}MB  dataframe {size / 2**20:8.1f}MB')
+
+
+def run(title, rows_count, columns_count):
+    print(f'{title}: {rows_count} rows x {columns_count} columns')
+    rows = make_rows(rows_count, columns_count)
+    names = [f'col{i}' for i in range(columns_count)]
+    columns_data = [list(column) for column in zip(*rows)]
+
+    measure('rows', lambda: pd.DataFrame(rows, columns=names))
+    measure('streamed columns', lambda: build_dataframe(names, columns_data=columns_data))
+    measure('nullable', lambda: build_dataframe(names, rows=rows, dtype_backend='numpy_nullable'))
+    measure('categorical', lambda: build_dataframe(names, rows=rows, categorical_threshold=0.1))
+    measure('nullable+categorical', lambda: build_dataframe(
+        names, rows=rows, dtype_backend='numpy_nullable', categorical_threshold=0.1
+    ))
+
+
+if __name__ == '__main__':
+    run('tall', 500_000, 8)
+    run('wide', 5_000, 800)
@@ -0,0 +1,70 @@
+"""
+Compares time of rendering of INSERT statement for dataframe:
+  - ast: Insert(values=df.to_dict('split')['data']).to_string(), previous implementation
+  - columns: render_values, values are rendered by columns
+
+Run: python benchmarks/insert_render.py
+"""
+import time
+
+import numpy as np
+import pandas as pd
+from mindsdb_sql_parser.ast import Insert
+
+from mindsdb_sdk.utils.sql import render_values
+
+
+def make_dataframe(rows_count, columns_count):
+    rng = np.random.default_rng(0)
+    data = {}
+    for j in range(columns_count):
+        kind = j % 5
+        if kind == 0:
+            data[f'col{j}'] = rng.integers(0, 10 ** 9, rows_count)
+        elif kind == 1:
+            values = rng.random(rows_count)
+            values[::10] = np.nan
+            data[f'col{j}'] = values
+        elif kind == 2:
+            data[f'col{j}'] = [f"item {i % 1000}'s" for i in range(rows_count)]
+        elif kind == 3:
+            data[f'col{j}'] = rng.random(rows_count) < 0.5
+        else:
+            data[f'col{j}'] = pd.date_range('2020-01-01', periods=rows_count, freq='min')
+    return pd.DataFrame(data)
+
+
+def render_ast(df):
+    return Insert(table='t', columns=list(df.columns), values=df.to_dict('split')['data']).to_string()
+
+
+def render_columns(df):
+    header = Insert(table='t', columns=list(df.columns)).to_string() + 'VALUES '
+    return header + ', '.join(render_values(df))
+
+
+def measure(name, fnc, df):
+    start = time.perf_counter()
+    sql = fnc(df)
+    elapsed = time.perf_counter() - start
+    print(f'  {name:<10} {elapsed:8.3f}s  {len(sql) / 2**20:8.1f}MB')
+    return sql, elapsed
+
+
+def run(rows_count, columns_count):
+    df = make_dataframe(rows_count, columns_count)
+    print(f'{rows_count} rows x {columns_count} columns')
+    sql_ast, time_ast = measure('ast', render_ast, df)
+    sql_columns, time_columns = measure('columns', render_columns, df)
+    assert sql_ast == sql_columns
+    print(f'  speedup {time_ast / time_columns:.1f}x')
+
+    df = df.drop(columns=[col for i, col in enumerate(df.columns) if i % 5 == 4])
+    print(f'without datetime columns: {len(df.columns)} columns')
+    _, time_ast = measure('ast', render_ast, df)
+    _, time_columns = measure('columns', render_columns, df)
+    print(f'  speedup {time_ast / time_columns:.1f}x')
+
+
+if __name__ == '__main__':
+    run(100_000, 20)
@@ -0,0 +1,90 @@
+"""
+Compares size of request to predict endpoint and client time to encode request and to decode response
+for formats of predict input: records (default), split and arrow.
+
+Run: python benchmarks/predict_payload.py
+"""
+import io
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from mindsdb_sdk.utils.dataframe import dataframe_to_arrow, arrow_to_dataframe
+
+
+def make_dataframe(rows_count, columns_count):
+    rng = np.random.default_rng(0)
+    data = {}
+    for i in range(columns_count):
+        if i % 4 == 0:
+            data[f'feature_category_{i}'] = [f'value {j % 30}' for j in range(rows_count)]
+        elif i % 4 == 1:
+            data[f'feature_count_{i}'] = rng.integers(0, 1000, rows_count)
+        else:
+            data[f'feature_value_{i}'] = rng.random(rows_count).round(4)
+    return pd.DataFrame(data)
+
+
+def encode_records(df):
+    return json.dumps({'data': df.to_dict('records'), 'params': {}}).encode()
+
+
+def decode_records(body):
+    return pd.DataFrame(json.loads(body))
+
+
+def encode_split(df):
+    data = df.to_dict('split', index=False)
+    return json.dumps({'columns': data['columns'], 'rows': data['data'], 'params': {}}).encode()
+
+
+def decode_split(body):
+    data = json.loads(body)
+    return pd.DataFrame(data['data'], columns=data['columns'])
+
+
+def encode_arrow(df):
+    import pyarrow as pa
+
+    sink = io.BytesIO()
+    table = dataframe_to_arrow(df)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def decode_arrow(body):
+    import pyarrow as pa
+
+    return arrow_to_dataframe(pa.ipc.open_stream(body).read_all())
+
+
+def measure(name, encode, decode, df, response):
+    start = time.perf_counter()
+    body = encode(df)
+    encode_time = time.perf_counter() - start
+
+    # response has the same size as request plus prediction column
+    start = time.perf_counter()
+    decode(response)
+    decode_time = time.perf_counter() - start
+    print(f'  {name:<8} request {len(body) / 2**20:7.2f}MB  encode {encode_time:6.3f}s  decode {decode_time:6.3f}s')
+
+
+def run(rows_count, columns_count):
+    df = make_dataframe(rows_count, columns_count)
+    print(f'{rows_count} rows x {columns_count} columns')
+    result = df.assign(prediction=np.arange(rows_count))
+
+    measure('records', encode_records, decode_records, df,
+            result.to_json(orient='records').encode())
+    measure('split', encode_split, decode_split, df,
+            result.to_json(orient='split', index=False).encode())
+    measure('arrow', encode_arrow, decode_arrow, df, encode_arrow(result))
+
+
+if __name__ == '__main__':
+    run(10_000, 100)
+    run(100_000, 20)
@@ -1,2 +1,2 @@
-from mindsdb_sdk.connect import connect
+from mindsdb_sdk.connect import connect, connect_async
 from mindsdb_sdk.tree import TreeNode
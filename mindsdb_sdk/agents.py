@@ -1,13 +1,19 @@
-from typing import Iterable, List, Union
+from typing import Callable, Iterable, List, Union
 from urllib.parse import urlparse
 from uuid import uuid4
 import datetime
+import hashlib
 
-from requests.exceptions import HTTPError
+import validators
 
 from mindsdb_sdk.knowledge_bases import KnowledgeBase
 from mindsdb_sdk.models import Model
+from mindsdb_sdk.utils.batch import BatchError, BatchReport, RateLimiter, process_chunks
 from mindsdb_sdk.utils.objects_collection import CollectionBase
+from mindsdb_sdk.utils.sync import FilesManifest, files_manifest_path
+
+# size of blocks to read file to calculate hash of content
+HASH_BLOCK_SIZE = 1 << 20
 
 
 class AgentCompletion:
@@ -103,6 +109,14 @@ class Agent:
     def completion_v2(self, messages: List[dict]) -> AgentCompletion:
         return self.collection.completion_v2(self.name, messages)
 
+    def completion_many(self, messages_list: List[List[dict]], max_concurrency: int = 4, rate_limit: float = None,
+                        retries: int = 0, on_progress: Callable[[BatchReport], None] = None,
+                        report: BatchReport = None) -> List[Union[AgentCompletion, Exception]]:
+        return self.collection.completion_many(
+            self.name, messages_list, max_concurrency=max_concurrency, rate_limit=rate_limit,
+            retries=retries, on_progress=on_progress, report=report
+        )
+
     def completion_stream(self, messages: List[dict]) -> Iterable[object]:
         return self.collection.completion_stream(self.name, messages)
 
@@ -115,7 +129,7 @@ class Agent:
 
         :param file_paths: List of paths to the files to be added.
         """
-        self.collection.add_files(self.name, file_paths, description, knowledge_base)
+        return self.collection.add_files(self.name, file_paths, description=description)
 
     def add_file(self, file_path: str, description: str, knowledge_base: str = None):
         """
@@ -123,7 +137,7 @@ class Agent:
 
         :param file_path: Path to the file to be added.
         """
-        self.collection.add_file(self.name, file_path, description, knowledge_base)
+        return self.collection.add_file(self.name, file_path, description=description)
 
     def add_webpages(
             self,
@@ -143,7 +157,7 @@ class Agent:
         :param limit: max count of pages to crawl
         :param filters: Include only URLs that match these regex patterns
         """
-        self.collection.add_webpages(self.name, urls, description, knowledge_base=knowledge_base,
+        return self.collection.add_webpages(self.name, urls, description, knowledge_base=knowledge_base,
                                      crawl_depth=crawl_depth, limit=limit, filters=filters)
 
     def add_webpage(
@@ -164,7 +178,7 @@ class Agent:
         :param limit: max count of pages to crawl
         :param filters: Include only URLs that match these regex patterns
         """
-        self.collection.add_webpage(self.name, url, description, knowledge_base=knowledge_base,
+        return self.collection.add_webpage(self.name, url, description, knowledge_base=knowledge_base,
                                     crawl_depth=crawl_depth, limit=limit, filters=filters)
 
     def add_database(self, database: str, tables: List[str], description: str):
@@ -175,7 +189,7 @@ class Agent:
         :param tables: List of tables to be added.
         :param description: Description of the database tables. Used by the agent to know when to query the database.
         """
-        self.collection.add_database(self.name, database, tables, description)
+        return self.collection.add_database(self.name, database, tables, description)
 
     def __repr__(self):
         return f'{self.__class__.__name__}(name: {self.name})'
@@ -262,6 +276,70 @@ class Agents(CollectionBase):
 
         return AgentCompletion(data['message']['content'])
 
+    def completion_many(self, name: str, messages_list: List[List[dict]], max_concurrency: int = 4,
+                        rate_limit: float = None, retries: int = 0,
+                        on_progress: Callable[[BatchReport], None] = None,
+                        report: BatchReport = None) -> List[Union[AgentCompletion, Exception]]:
+        """
+        Queries the agent for completions of many conversations concurrently.
+
+        Results are in the same order as conversations. Failed completion doesn't stop the others:
+        exception is returned in place of its result.
+
+        >>> results = agent.completion_many(
+        ...     [[{'question': text, 'answer': None}] for text in tickets],
+        ...     max_concurrency=8, rate_limit=20
+        ... )
+        >>> errors = [r for r in results if isinstance(r, Exception)]
+
+        Latency of completions is available in BatchReport which is passed to on_progress
+        and is filled in `report` after the end:
+
+        >>> def show_progress(report):
+        ...     print(f'{len(report.completed)} done, p50: {report.p50:.1f}s, p95: {report.p95:.1f}s')
+        >>> report = BatchReport()
+        >>> results = agent.completion_many(messages_list, report=report)
+        >>> report.p95
+
+        If max_concurrency is bigger than pool of connections of the server object,
+        the pool is enlarged for the rest of its life (see `RestAPI.set_pool_size`).
+
+        :param name: Name of the agent
+        :param messages_list: list of conversations, every conversation is a list of messages
+        :param max_concurrency: count of completions which are requested at the same time
+        :param rate_limit: max count of requests per second, optional
+        :param retries: count of retries of failed completion
+        :param on_progress: function which is called with BatchReport after every completion
+        :param report: empty BatchReport to fill with latencies and results of completions, optional
+
+        :return: list of AgentCompletion objects or exceptions
+        """
+        messages_list = list(messages_list)
+        limiter = RateLimiter(rate_limit) if rate_limit is not None else None
+
+        def complete(messages):
+            if limiter is not None:
+                limiter.wait()
+            return self.completion(name, messages)
+
+        if max_concurrency > 1:
+            self.api.set_pool_size(max_concurrency)
+
+        report = process_chunks(
+            complete,
+            ((messages, 1) for messages in messages_list),
+            max_workers=max_concurrency,
+            retries=retries,
+            on_progress=on_progress,
+            stop_on_error=False,
+            keep_results=True,
+            report=report,
+        )
+        return [
+            report.failed[num] if num in report.failed else report.results[num]
+            for num in range(len(messages_list))
+        ]
+
     def completion_v2(self, name: str, messages: List[dict]) -> AgentCompletion:
         """
         Queries the agent for a completion.
@@ -306,33 +384,66 @@ class Agents(CollectionBase):
                 "or set your default embedding model via server.config.set_default_embedding_model(...) or through the MindsDB UI."
             )
 
-    def add_files(self, name: str, file_paths: List[str], description: str = None):
+    def _content_hash(self, file_path: str) -> str:
+        # urls are not downloaded to compare content
+        if validators.url(file_path):
+            return file_path
+
+        content_hash = hashlib.sha256()
+        with self.api.open_file(file_path) as fd:
+            for block in iter(lambda: fd.read(HASH_BLOCK_SIZE), b''):
+                content_hash.update(block)
+        return content_hash.hexdigest()
+
+    def add_files(self, name: str, file_paths: List[str], description: str = None, max_workers: int = 4,
+                  manifest_path: str = None):
         """
         Add a list of files to the agent for retrieval.
 
+        Files which are not uploaded to mindsdb yet are uploaded concurrently.
+        Files with the same content are uploaded once: hashes of content of uploaded files are kept in local manifest,
+        file which was uploaded before (in this or previous calls) under other name isn't uploaded again
+        if that file still exists in mindsdb.
+
         :param name: Name of the agent
         :param file_paths: List of paths or URLs to the files to be added.
         :param description: Description of the file. Used by agent to know when to do retrieval
+        :param max_workers: count of files which are uploaded at the same time
+        :param manifest_path: path to manifest of uploaded files, default is file in ~/.mindsdb_sdk/sync/
         """
         if not file_paths:
             return
 
         agent = self.get(name)
-        filename_no_extension = ''
-        for file_path in file_paths:
-            filename = file_path.split('/')[-1].lower()
-            filename_no_extension = filename.split('.')[0]
-            try:
-                _ = self.api.get_file_metadata(filename_no_extension)
-            except HTTPError as e:
-                if e.response.status_code >= 400 and e.response.status_code != 404:
-                    raise e
-                # upload file to mindsdb
-                self.api.upload_file(filename, file_path)
 
-            # Add file to agent's data if it hasn't been added already.
-            if 'tables' not in agent.data or f'files.{filename_no_extension}' not in agent.data['tables']:
-                agent.data.setdefault('tables', []).append(f'files.{filename_no_extension}')
+        # list of files is requested once
+        existing_files = set(metadata.get('name') for metadata in self.api.list_files())
+
+        if manifest_path is None:
+            manifest_path = files_manifest_path(self.api.url)
+
+        with FilesManifest(manifest_path) as manifest:
+            to_upload = self._files_to_upload(agent, file_paths, existing_files, manifest)
+
+            def upload(item):
+                filename, file_path, content_hash = item
+                # server recognizes type of file by extension
+                self.api.upload_file(filename, file_path)
+                manifest.add(content_hash, filename.split('.')[0])
+
+            # upload files to mindsdb
+            if max_workers > 1:
+                self.api.set_pool_size(max_workers)
+            report = process_chunks(
+                upload,
+                ((item, 1) for item in to_upload.values()),
+                max_workers=max_workers,
+                stop_on_error=False,
+            )
+        if report.failed:
+            num = report.resume_from
+            file_path = list(to_upload.values())[num][1]
+            raise BatchError(f'Upload of file {file_path} failed: {report.failed[num]}', report)
 
         # Add the description provided to the agent's prompt template.
         if description:
@@ -340,6 +451,31 @@ class Agents(CollectionBase):
 
         self.update(agent.name, agent)
 
+    def _files_to_upload(self, agent: Agent, file_paths: List[str], existing_files: set,
+                         manifest: FilesManifest) -> dict:
+        # adds files to agent's data, returns files to upload:
+        # name of file in mindsdb -> (file name, path, hash of content)
+        to_upload = {}
+        # hash of content -> name of file in mindsdb, files with the same content are uploaded once
+        uploaded_hashes = {}
+        for file_path in file_paths:
+            filename = file_path.split('/')[-1].lower()
+            filename_no_extension = filename.split('.')[0]
+            if filename_no_extension not in existing_files and filename_no_extension not in to_upload:
+                content_hash = self._content_hash(file_path)
+                uploaded_name = uploaded_hashes.get(content_hash) or manifest.get(content_hash)
+                if uploaded_name is not None and (uploaded_name in existing_files or uploaded_name in to_upload):
+                    # use already uploaded file
+                    filename_no_extension = uploaded_name
+                else:
+                    uploaded_hashes[content_hash] = filename_no_extension
+                    to_upload[filename_no_extension] = (filename, file_path, content_hash)
+
+            # Add file to agent's data if it hasn't been added already.
+            if 'tables' not in agent.data or f'files.{filename_no_extension}' not in agent.data['tables']:
+                agent.data.setdefault('tables', []).append(f'files.{filename_no_extension}')
+        return to_upload
+
     def add_file(self, name: str, file_path: str, description: str = None):
         """
         Add a file to the agent for retrieval.
@@ -477,6 +613,13 @@ class Agents(CollectionBase):
 
         :return: created agent object
         """
+        agent = self.api.create_agent(*self._create_args(name, model, provider, data, prompt_template,
+                                                         params, **kwargs))
+        return Agent.from_json(agent, self)
+
+    def _create_args(self, name: str, model: Union[Model, str, dict] = None, provider: str = None,
+                     data: dict = None, prompt_template: str = None, params: dict = None, **kwargs) -> tuple:
+        # arguments of api.create_agent
         if params is None:
             params = {}
         params.update(kwargs)
@@ -490,7 +633,7 @@ class Agents(CollectionBase):
             model_name = model
             model = None
 
-        agent = self.api.create_agent(
+        return (
             self.project.name,
             name,
             model_name,
@@ -500,7 +643,6 @@ class Agents(CollectionBase):
             prompt_template,
             params
         )
-        return Agent.from_json(agent, self)
 
     def update(self, name: str, updated_agent: Agent):
         """
@@ -511,6 +653,11 @@ class Agents(CollectionBase):
 
         :return: updated agent object
         """
+        agent = self.api.update_agent(*self._update_args(name, updated_agent))
+        return Agent.from_json(agent, self)
+
+    def _update_args(self, name: str, updated_agent: Agent) -> tuple:
+        # arguments of api.update_agent
         updated_model_name = None
         updated_provider = updated_agent.provider
         updated_model = None
@@ -522,7 +669,7 @@ class Agents(CollectionBase):
         elif isinstance(updated_agent.model, dict):
             updated_model = updated_agent.model
 
-        agent = self.api.update_agent(
+        return (
             self.project.name,
             name,
             updated_agent.name,
@@ -533,7 +680,6 @@ class Agents(CollectionBase):
             updated_agent.prompt_template,
             updated_agent.params
         )
-        return Agent.from_json(agent, self)
 
     def drop(self, name: str):
         """
@@ -0,0 +1,1060 @@
+import asyncio
+import os
+import time
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Union
+from urllib.parse import urlparse
+from uuid import uuid4
+
+import pandas as pd
+
+from mindsdb_sql_parser.ast import Describe, DropDatabase, DropView, Identifier
+from mindsdb_sql_parser.ast.mindsdb import CreateDatabase, CreateMLEngine, DropMLEngine, DropPredictor
+from mindsdb_sql_parser.ast.mindsdb import FinetunePredictor, RetrainPredictor
+
+from .query import Query
+from .tables import Table, Tables
+from .views import Views
+from .databases import Database, Databases
+from .models import Model, ModelVersion, Models, TRAINING_STATUSES, _poll_delays
+from .knowledge_bases import KnowledgeBase, KnowledgeBases, MAX_INSERT_SIZE, INSERT_BLOCK_ROWS, split_data
+from .agents import Agent, AgentCompletion, Agents
+from .ml_engines import MLEngine, MLEngines
+from .handlers import Handler, Handlers
+from .projects import Project, Projects
+from .tree import TreeNode
+from .utils.batch import BatchError, BatchReport, RateLimiter, process_chunks_async
+from .utils.sync import FilesManifest, SyncManifest, files_manifest_path
+
+
+class AsyncCollectionMixin:
+    # list() is a coroutine in async collections, it can't be used to fill dir()
+
+    def __dir__(self) -> Iterable[str]:
+        return ['create', 'drop', 'get', 'list']
+
+
+class AsyncFetchMixin:
+    # awaitable versions of Query.fetch and Query.fetch_iter
+
+    async def fetch(self, stream: bool = None, format: str = 'pandas', cache: bool = True) -> pd.DataFrame:
+        """
+        Executes query in mindsdb server and returns result, see :meth:`~mindsdb_sdk.query.Query.fetch`
+        :return: dataframe or pyarrow.Table with result
+        """
+        return await self.api.sql_query(self.sql, self.database, stream=stream, format=format, cache=cache)
+
+    async def fetch_iter(self, batch_size: int = 1000, order_by: str = None) -> AsyncIterator[pd.DataFrame]:
+        """
+        Async generator of result batches, see :meth:`~mindsdb_sdk.query.Query.fetch_iter`
+
+        >>> async for df in table.fetch_iter(batch_size=10000):
+        ...     process(df)
+        """
+        if batch_size <= 0:
+            raise ValueError('batch_size must be positive')
+
+        base_query, database, total_limit = self._get_batch_select()
+
+        fetched = 0
+        last_value = None
+        while True:
+            size = batch_size
+            if total_limit is not None:
+                size = min(size, total_limit - fetched)
+                if size <= 0:
+                    return
+
+            sql = self._batch_sql(base_query, size, fetched, order_by=order_by, last_value=last_value)
+            df = await self.api.sql_query(sql, database)
+            if df is None or len(df) == 0:
+                return
+
+            yield df
+
+            fetched += len(df)
+            if len(df) < size:
+                return
+            if order_by is not None:
+                last_value = self._last_value(df, order_by)
+
+
+class AsyncQuery(AsyncFetchMixin, Query):
+    """
+    Query object of async client. The same as :class:`~mindsdb_sdk.query.Query` but `fetch` is coroutine
+
+    >>> df = await project.query('select * from models').fetch()
+    """
+
+
+class AsyncTable(AsyncFetchMixin, Table):
+    """
+    Table of async client. `filter`, `limit`, `track` are the same as in sync table.
+    Methods which are executed on server are coroutines:
+
+    >>> df = await table.filter(a=1).limit(10).fetch()
+    >>> await table.insert(df)
+    """
+
+    async def insert(
+        self,
+        query: Union[pd.DataFrame, Query],
+        chunk_size: int = None,
+        max_chunk_bytes: int = None,
+        max_workers: int = 1,
+        retries: int = 0,
+        on_progress: Callable[[BatchReport], None] = None,
+        resume: BatchReport = None,
+    ) -> BatchReport:
+        """
+        Insert data from query of dataframe, see :meth:`~mindsdb_sdk.tables.Table.insert`.
+        Chunks are sent concurrently in the current event loop
+        """
+        chunked = chunk_size is not None or max_chunk_bytes is not None
+        if not isinstance(query, pd.DataFrame) or not chunked:
+            await self.api.sql_query(self._insert_sql(query))
+            return
+
+        if chunk_size is not None and chunk_size <= 0:
+            raise ValueError('chunk_size must be positive')
+
+        report = await process_chunks_async(
+            self.api.sql_query,
+            self._insert_chunks(query, chunk_size=chunk_size, max_chunk_bytes=max_chunk_bytes),
+            max_workers=max_workers,
+            retries=retries,
+            on_progress=on_progress,
+            skip=None if resume is None else resume.completed,
+            report=resume,
+        )
+        if report.failed:
+            num = report.resume_from
+            raise BatchError(f'Insert of chunk {num} failed: {report.failed[num]}', report)
+        return report
+
+    async def delete(self, **kwargs):
+        await self.api.sql_query(self._delete_sql(kwargs))
+
+    async def update(self, values: Union[dict, Query], on: list = None, filters: dict = None):
+        await self.api.sql_query(self._update_sql(values, on=on, filters=filters))
+
+
+class AsyncView(AsyncTable):
+    # The same as table
+    pass
+
+
+class AsyncTables(AsyncCollectionMixin, Tables):
+    _table_class = AsyncTable
+
+    async def list(self) -> List[AsyncTable]:
+        df = await self.database.query('show tables').fetch(cache=False)
+        return [self._table_class(self.database, name) for name in self._names_from_df(df)]
+
+    async def get(self, name: str) -> AsyncTable:
+        return self._table_class(self.database, name)
+
+    async def create(self, name: str, query: Union[pd.DataFrame, Query], replace: bool = False,
+                     file_format: str = None) -> AsyncTable:
+        if isinstance(query, pd.DataFrame) and self.database.name == 'files':
+            await self.api.upload_file(name, query, file_format=file_format)
+            return self._table_class(self.database, name)
+
+        if not isinstance(query, Query):
+            raise NotImplementedError
+
+        await self.api.sql_query(self._create_sql(name, query, replace=replace))
+        return self._table_class(self.database, name)
+
+    async def drop(self, name: str):
+        await self.api.sql_query(self._drop_sql(name))
+
+
+class AsyncDatabase(Database):
+    """
+    Database of async client, see :class:`~mindsdb_sdk.databases.Database`
+    """
+
+    _tables_class = AsyncTables
+
+    def query(self, sql: str) -> AsyncQuery:
+        return AsyncQuery(self.api, sql, database=self.name)
+
+    async def tree(self, with_schemas: bool = False) -> List[TreeNode]:
+        df = await self.api.objects_tree(self.name, with_schemas=with_schemas)
+        return [TreeNode.from_dict(row.to_dict()) for _, row in df.iterrows()]
+
+
+class AsyncDatabases(AsyncCollectionMixin, Databases):
+    _database_class = AsyncDatabase
+
+    async def _list_databases(self) -> Dict[str, AsyncDatabase]:
+        data = await self.api.sql_query(self._list_sql())
+        return self._databases_from_df(data)
+
+    async def list(self) -> List[AsyncDatabase]:
+        databases = await self._list_databases()
+        return list(databases.values())
+
+    async def get(self, name: str) -> AsyncDatabase:
+        databases = self._databases_from_df(await self.api.sql_query(self._list_sql(name)))
+        if name not in databases:
+            raise AttributeError(f"Database '{name}' doesn't exist")
+        return databases[name]
+
+    async def create(self, name: str, engine: Union[str, Handler], connection_args: Dict) -> AsyncDatabase:
+        if isinstance(engine, Handler):
+            engine = engine.name
+
+        ast_query = CreateDatabase(
+            name=Identifier(name),
+            engine=engine,
+            parameters=connection_args,
+        )
+        await self.api.sql_query(ast_query.to_string())
+        return self._database_class(self.server, name, engine=engine, params=connection_args)
+
+    async def update(self, name: str, connection_args: Dict) -> AsyncDatabase:
+        await self.api.sql_query(self._update_sql(name, connection_args))
+        return await self.get(name)
+
+    async def drop(self, name: str):
+        ast_query = DropDatabase(name=Identifier(name))
+        await self.api.sql_query(ast_query.to_string())
+
+
+class AsyncModel(Model):
+    """
+    Model of async client, see :class:`~mindsdb_sdk.models.Model`
+
+    >>> df = await model.predict(df)
+    >>> await model.wait_complete()
+    """
+
+    async def predict(self, data: Union[pd.DataFrame, Query, dict], params: dict = None, batch_size: int = None,
+                      max_workers: int = 1, retries: int = 0,
+                      on_progress: Callable[[BatchReport], None] = None) -> pd.DataFrame:
+        """
+        Make prediction using model, see :meth:`~mindsdb_sdk.models.Model.predict`.
+        Batches are predicted concurrently in the current event loop.
+        Async client doesn't have prediction cache
+        """
+        api = self.project.api
+        if isinstance(data, Query):
+            return await api.sql_query(self._predict_sql(data, params), database=None)
+        elif isinstance(data, dict):
+            data = pd.DataFrame([data])
+        elif not isinstance(data, pd.DataFrame):
+            raise ValueError('Unknown input')
+
+        async def predict_batch(batch):
+            return await api.model_predict(self.project.name, self.name, batch,
+                                           params=params, version=self.version)
+
+        if batch_size is None:
+            return await predict_batch(data)
+
+        report = await process_chunks_async(
+            predict_batch,
+            self._batches(data, batch_size),
+            max_workers=max_workers,
+            retries=retries,
+            on_progress=on_progress,
+            keep_results=True,
+        )
+        result = self._batches_result(report)
+        if result is None:
+            return await predict_batch(data)
+        return result
+
+    async def refresh(self):
+        model = await self.project.models.get(self.name, self.version)
+        self.data = model.data
+        return self.data
+
+    async def get_status(self) -> str:
+        await self.refresh()
+        return self.data['status']
+
+    async def wait_complete(self, timeout: float = None, min_interval: float = 0.3, max_interval: float = 10,
+                            backoff: float = 1.5):
+        async for _ in self.project.models.wait_all(
+            [self], timeout=timeout, min_interval=min_interval, max_interval=max_interval, backoff=backoff
+        ):
+            pass
+
+        if self.data.get('status') == 'error':
+            raise RuntimeError(f'Training failed: {self.data.get("error")}')
+        await self.refresh()
+
+    async def finetune(self, query: Union[str, Query] = None, database: str = None, options: dict = None,
+                       engine: str = None) -> Union['AsyncModel', 'AsyncModelVersion']:
+        sql = self._retrain_sql(FinetunePredictor, query=query, database=database, options=options, engine=engine)
+        return self._retrained_model(await self.project.api.sql_query(sql))
+
+    async def retrain(self, query: Union[str, Query] = None, database: str = None, options: dict = None,
+                      engine: str = None) -> Union['AsyncModel', 'AsyncModelVersion']:
+        sql = self._retrain_sql(RetrainPredictor, query=query, database=database, options=options, engine=engine)
+        return self._retrained_model(await self.project.api.sql_query(sql))
+
+    async def describe(self, type: str = None) -> pd.DataFrame:
+        if self.version is not None:
+            raise NotImplementedError
+
+        identifier = self._get_identifier()
+        if type is not None:
+            identifier.parts.append(type)
+            identifier.is_quoted.append(False)
+        return await self.project.api.sql_query(Describe(identifier).to_string())
+
+    async def list_versions(self) -> List['AsyncModelVersion']:
+        return await self.project.models.list(with_versions=True, name=self.name)
+
+    async def get_version(self, num: int) -> 'AsyncModelVersion':
+        num = int(num)
+        for m in await self.list_versions():
+            if m.version == num:
+                return m
+        raise ValueError('Version is not found')
+
+    async def drop_version(self, num: int):
+        await self.project.drop_model_version(self.name, num)
+
+    async def set_active(self, version: int):
+        await self.project.api.sql_query(self._set_active_sql(version))
+        self.project.models._invalidate_metadata()
+        self._invalidate_predictions()
+        await self.refresh()
+
+
+class AsyncModelVersion(AsyncModel, ModelVersion):
+    pass
+
+
+class AsyncModels(AsyncCollectionMixin, Models):
+    _model_class = AsyncModel
+    _model_version_class = AsyncModelVersion
+
+    async def create(self, name: str, predict: str = None, engine: Union[str, MLEngine] = None,
+                     query: Union[str, Query] = None, database: str = None, options: dict = None,
+                     timeseries_options: dict = None, **kwargs) -> AsyncModel:
+        sql = self._create_sql(name, predict=predict, engine=engine, query=query, database=database,
+                               options=options, timeseries_options=timeseries_options, **kwargs)
+        df = await self.project.api.sql_query(sql)
+        self._invalidate_metadata()
+        return self._created_model(df)
+
+    async def drop(self, name: str):
+        await self.project.api.sql_query(self._drop_sql(name))
+        self._invalidate_dropped(name)
+
+    async def list(self, with_versions: bool = False,
+                   name: str = None,
+                   version: int = None) -> List[Union[AsyncModel, AsyncModelVersion]]:
+        sql = self._list_sql(with_versions=with_versions, name=name, version=version)
+        df = await self.project.query(sql).fetch(cache=False)
+
+        return self._models_from_df(df, with_versions=with_versions)
+
+    async def get(self, name: str, version: int = None) -> Union[AsyncModel, AsyncModelVersion]:
+        if version is not None:
+            ret = await self.list(with_versions=True, name=name, version=version)
+        else:
+            ret = await self.list(name=name)
+        if len(ret) == 0:
+            raise AttributeError("Model doesn't exist")
+        elif len(ret) == 1:
+            return ret[0]
+        else:
+            raise RuntimeError('Several models with the same name/version')
+
+    async def wait_all(self, models: Iterable[AsyncModel], timeout: float = None, min_interval: float = 0.3,
+                       max_interval: float = 10, backoff: float = 1.5) -> AsyncIterator[AsyncModel]:
+        pending = list(models)
+        delays = _poll_delays(min_interval, max_interval, backoff)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while pending:
+            delay = next(delays)
+            if deadline is not None:
+                remains = deadline - time.monotonic()
+                if remains <= 0:
+                    names = ', '.join(model.name for model in pending)
+                    raise TimeoutError(f'Models are not trained in {timeout} seconds: {names}')
+                delay = min(delay, remains)
+            await asyncio.sleep(delay)
+
+            rows = await self._fetch_statuses(pending)
+            still_pending = []
+            for model in pending:
+                if self._update_status(model, rows) in TRAINING_STATUSES:
+                    still_pending.append(model)
+                else:
+                    yield model
+            pending = still_pending
+
+    async def _fetch_statuses(self, models: List[AsyncModel]) -> List[dict]:
+        by_project = {}
+        for model in models:
+            by_project.setdefault(model.project.name, (model.project, set()))[1].add(model.name)
+
+        rows = []
+        for project, names in by_project.values():
+            df = await project.query(self._status_sql(names)).fetch(cache=False)
+            rows.extend(self._status_rows(df, project.name))
+        return rows
+
+
+class AsyncViews(AsyncCollectionMixin, Views):
+
+    async def _list_views(self):
+        df = await self.api.objects_tree(self.project.name)
+        return self._names_from_tree(df)
+
+    async def list(self) -> List[AsyncView]:
+        return [AsyncView(self.project, name) for name in await self._list_views()]
+
+    async def get(self, name: str) -> AsyncView:
+        df = await self.api.sql_query(self._get_sql(self.project.name, name))
+        if name not in self._names_from_df(df):
+            raise AttributeError("View doesn't exist")
+        return AsyncView(self.project, name)
+
+    async def create(self, name: str, sql: Union[str, Query], database: str = None) -> AsyncView:
+        await self.project.query(self._create_sql(name, sql, database)).fetch()
+        return AsyncView(self.project, name)
+
+    async def drop(self, name: str):
+        ast_query = DropView(names=[Identifier(name)])
+        await self.project.query(ast_query.to_string()).fetch()
+
+
+class AsyncKnowledgeBase(AsyncFetchMixin, KnowledgeBase):
+    """
+    Knowledge base of async client, see :class:`~mindsdb_sdk.knowledge_bases.KnowledgeBase`
+
+    >>> df = await kb.find('flats').fetch()
+    """
+
+    async def insert(
+        self,
+        data: Union[pd.DataFrame, Query, dict, list],
+        params: dict = None,
+        chunk_size: int = None,
+        max_chunk_bytes: int = None,
+        max_workers: int = 1,
+        retries: int = 0,
+        target_latency: float = None,
+        on_progress: Callable[[BatchReport], None] = None,
+        resume: BatchReport = None,
+    ) -> BatchReport:
+        """
+        Insert data to knowledge base, see :meth:`~mindsdb_sdk.knowledge_bases.KnowledgeBase.insert`.
+        Chunks are sent concurrently in the current event loop
+        """
+        if isinstance(data, Query):
+            return await self.insert_query(data, params)
+
+        data = self._insert_data(data)
+
+        chunked = (
+            chunk_size is not None or max_chunk_bytes is not None or max_workers > 1 or retries > 0
+            or target_latency is not None or on_progress is not None or resume is not None
+        )
+        if not chunked:
+            for chunk, _ in self._insert_chunks(self._row_blocks(data), MAX_INSERT_SIZE):
+                await self._insert_rows(chunk, params)
+            return
+
+        return await self._insert_batches_async(
+            self._row_blocks(data, with_sizes=True),
+            params=params,
+            chunk_size=chunk_size,
+            max_chunk_bytes=max_chunk_bytes,
+            max_workers=max_workers,
+            retries=retries,
+            target_latency=target_latency,
+            on_progress=on_progress,
+            resume=resume,
+        )
+
+    async def insert_query(self, data: Query, params: dict = None):
+        return await self.api.insert_into_knowledge_base(
+            self.project.name, self.name, data=self._query_data(data, params)
+        )
+
+    async def insert_files(self, file_paths: List[str], params: dict = None):
+        return await self.api.insert_into_knowledge_base(
+            self.project.name, self.name, data=self._files_data(file_paths, params)
+        )
+
+    async def insert_webpages(self, urls: List[str], crawl_depth: int = 1,
+                              filters: List[str] = None, limit=None, params: dict = None):
+        data = self._webpages_data(urls, crawl_depth=crawl_depth, filters=filters, limit=limit, params=params)
+        return await self.api.insert_into_knowledge_base(self.project.name, self.name, data=data)
+
+    async def insert_stream(
+        self,
+        source: Union[str, os.PathLike, Iterable[Union[dict, pd.DataFrame]]],
+        params: dict = None,
+        file_format: str = None,
+        block_rows: int = INSERT_BLOCK_ROWS,
+        chunk_size: int = None,
+        max_chunk_bytes: int = None,
+        max_workers: int = 1,
+        retries: int = 0,
+        target_latency: float = None,
+        on_progress: Callable[[BatchReport], None] = None,
+        resume: BatchReport = None,
+    ) -> BatchReport:
+        """
+        Insert data to knowledge base from stream of rows,
+        see :meth:`~mindsdb_sdk.knowledge_bases.KnowledgeBase.insert_stream`.
+        Source is read in the event loop, chunks are sent concurrently
+        """
+        return await self._insert_batches_async(
+            self._source_blocks(source, file_format, block_rows),
+            params=params,
+            chunk_size=chunk_size,
+            max_chunk_bytes=max_chunk_bytes,
+            max_workers=max_workers,
+            retries=retries,
+            target_latency=target_latency,
+            on_progress=on_progress,
+            resume=resume,
+        )
+
+    async def sync(
+        self,
+        data: Union[pd.DataFrame, str, os.PathLike, Iterable[Union[dict, pd.DataFrame]]],
+        id_column: str = None,
+        delete_missing: bool = False,
+        manifest_path: str = None,
+        params: dict = None,
+        block_rows: int = INSERT_BLOCK_ROWS,
+        chunk_size: int = None,
+        max_chunk_bytes: int = None,
+        max_workers: int = 1,
+        retries: int = 0,
+        on_progress: Callable[[BatchReport], None] = None,
+    ) -> dict:
+        """
+        Incremental insert: only new and changed rows are sent to knowledge base,
+        see :meth:`~mindsdb_sdk.knowledge_bases.KnowledgeBase.sync`
+        """
+        id_column, manifest_path = self._sync_options(id_column, manifest_path, block_rows)
+
+        stats = {'inserted': 0, 'unchanged': 0, 'deleted': 0}
+
+        with SyncManifest(manifest_path) as manifest:
+            try:
+                stats['report'] = await self._insert_batches_async(
+                    self._changed_blocks(data, id_column, block_rows, manifest, stats),
+                    params=params,
+                    chunk_size=chunk_size,
+                    max_chunk_bytes=max_chunk_bytes,
+                    max_workers=max_workers,
+                    retries=retries,
+                    on_progress=on_progress,
+                    keep_ids=id_column,
+                )
+            except BatchError as e:
+                self._commit_inserted(manifest, e.report)
+                raise
+            except Exception:
+                manifest.reset()
+                raise
+
+            deleted = []
+            if delete_missing:
+                deleted = manifest.missing()
+                try:
+                    for chunk in split_data(deleted, MAX_INSERT_SIZE):
+                        await self.api.sql_query(self._delete_ids_sql(chunk))
+                except Exception:
+                    # all changed rows were inserted
+                    manifest.commit()
+                    raise
+                self._invalidate_deleted(deleted)
+                stats['deleted'] = len(deleted)
+
+            manifest.commit(deleted)
+        return stats
+
+    async def _insert_batches_async(
+        self,
+        blocks,
+        params: dict = None,
+        chunk_size: int = None,
+        max_chunk_bytes: int = None,
+        max_workers: int = 1,
+        retries: int = 0,
+        target_latency: float = None,
+        on_progress: Callable[[BatchReport], None] = None,
+        resume: BatchReport = None,
+        keep_ids: str = None,
+    ) -> BatchReport:
+        chunk_size, max_chunk_bytes, adaptive = self._chunk_options(chunk_size, max_chunk_bytes,
+                                                                    target_latency, resume)
+
+        async def insert_chunk(rows):
+            start = time.monotonic()
+            # returns coroutine of async api
+            ret = await self._insert_rows(rows, params)
+            if adaptive is not None:
+                adaptive.update(len(rows), time.monotonic() - start)
+            if keep_ids is not None:
+                return [row.get(keep_ids) for row in rows]
+            return ret
+
+        report = await process_chunks_async(
+            insert_chunk,
+            self._insert_chunks(blocks, chunk_size, max_chunk_bytes),
+            max_workers=max_workers,
+            retries=retries,
+            on_progress=on_progress,
+            skip=None if resume is None else resume.completed,
+            keep_results=keep_ids is not None,
+            report=resume,
+        )
+        return self._insert_report(report)
+
+    async def find_many(
+        self,
+        queries: List[str],
+        limit: int = 10,
+        max_workers: int = 4,
+        batch_size: int = None,
+        retries: int = 0,
+        on_progress: Callable[[BatchReport], None] = None,
+        filters: dict = None,
+        columns: List[str] = None,
+        relevance_threshold: float = None,
+    ) -> pd.DataFrame:
+        """
+        Query knowledge base with many text queries at once,
+        see :meth:`~mindsdb_sdk.knowledge_bases.KnowledgeBase.find_many`
+        """
+        self._check_filters(filters)
+        if batch_size is not None and batch_size <= 0:
+            raise ValueError('batch_size must be positive')
+        queries = list(queries)
+
+        async def search(indexes):
+            if batch_size is None:
+                select = self._search_select(queries[indexes[0]], limit, filters, columns, relevance_threshold)
+                df = await self.api.sql_query(select.to_string(), self.database, cache=True)
+                df['query_index'] = indexes[0]
+                return df
+            sql = self._union_search_sql(queries, indexes, limit, filters, columns, relevance_threshold)
+            return await self.api.sql_query(sql, self.database, cache=True)
+
+        report = await process_chunks_async(
+            search,
+            self._search_batches(queries, batch_size),
+            max_workers=max_workers,
+            retries=retries,
+            on_progress=on_progress,
+            keep_results=True,
+        )
+        return self._search_results(report)
+
+
+class AsyncKnowledgeBases(AsyncCollectionMixin, KnowledgeBases):
+    _knowledge_base_class = AsyncKnowledgeBase
+
+    async def list(self) -> List[AsyncKnowledgeBase]:
+        return [
+            self._knowledge_base_class(self.api, self.project, item)
+            for item in await self.api.list_knowledge_bases(self.project.name)
+        ]
+
+    async def get(self, name: str) -> AsyncKnowledgeBase:
+        data = await self.api.get_knowledge_base(self.project.name, name)
+        return self._knowledge_base_class(self.api, self.project, data)
+
+    async def create(self, name: str, embedding_model: dict = None, reranking_model: dict = None,
+                     storage: Table = None, metadata_columns: list = None, content_columns: list = None,
+                     id_column: str = None, params: dict = None) -> AsyncKnowledgeBase:
+        payload = self._create_payload(name, embedding_model, reranking_model, storage, metadata_columns,
+                                       content_columns, id_column, params)
+        await self.api.create_knowledge_base(self.project.name, data=payload)
+        return await self.get(name)
+
+    async def drop(self, name: str):
+        return await self.api.delete_knowledge_base(self.project.name, name)
+
+
+class AsyncAgents(AsyncCollectionMixin, Agents):
+    """
+    Agents of async client, see :class:`~mindsdb_sdk.agents.Agents`.
+    Agent object returned from this collection has awaitable `completion`:
+
+    >>> agent = await project.agents.get('my_agent')
+    >>> completion = await agent.completion([{'question': 'Hi', 'answer': None}])
+    """
+
+    def __init__(self, project, api):
+        self.api = api
+        self.project = project
+
+        self.knowledge_bases = project.knowledge_bases
+        self.models = project.models
+        self.databases = project.server.databases
+
+    async def list(self) -> List[Agent]:
+        data = await self.api.agents(self.project.name)
+        return [Agent.from_json(agent, self) for agent in data]
+
+    async def get(self, name: str) -> Agent:
+        data = await self.api.agent(self.project.name, name)
+        return Agent.from_json(data, self)
+
+    async def completion(self, name: str, messages: List[dict]) -> AgentCompletion:
+        data = await self.api.agent_completion(self.project.name, name, messages)
+        if 'context' in data['message']:
+            return AgentCompletion(data['message']['content'], data['message'].get('context'))
+
+        return AgentCompletion(data['message']['content'])
+
+    async def completion_v2(self, name: str, messages: List[dict]) -> dict:
+        return await self.api.agent_completion(self.project.name, name, messages)
+
+    async def completion_many(self, name: str, messages_list: List[List[dict]], max_concurrency: int = 4,
+                              rate_limit: float = None, retries: int = 0,
+                              on_progress: Callable[[BatchReport], None] = None,
+                              report: BatchReport = None) -> List[Union[AgentCompletion, Exception]]:
+        """
+        Queries the agent for completions of many conversations concurrently,
+        see :meth:`~mindsdb_sdk.agents.Agents.completion_many`
+        """
+        messages_list = list(messages_list)
+        limiter = RateLimiter(rate_limit) if rate_limit is not None else None
+
+        async def complete(messages):
+            if limiter is not None:
+                await limiter.wait_async()
+            return await self.completion(name, messages)
+
+        report = await process_chunks_async(
+            complete,
+            ((messages, 1) for messages in messages_list),
+            max_workers=max_concurrency,
+            retries=retries,
+            on_progress=on_progress,
+            stop_on_error=False,
+            keep_results=True,
+            report=report,
+        )
+        return [
+            report.failed[num] if num in report.failed else report.results[num]
+            for num in range(len(messages_list))
+        ]
+
+    def completion_stream(self, name, messages: List[dict]):
+        # async generator
+        return self.api.agent_completion_stream(self.project.name, name, messages)
+
+    def completion_stream_v2(self, name, messages: List[dict]):
+        # async generator of SSE events
+        return self.api.agent_completion_stream_v2(self.project.name, name, messages)
+
+    async def create(self, name: str, model: Union[Model, str, dict] = None, provider: str = None,
+                     data: dict = None, prompt_template: str = None, params: dict = None, **kwargs) -> Agent:
+        agent = await self.api.create_agent(*self._create_args(name, model, provider, data, prompt_template,
+                                                               params, **kwargs))
+        return Agent.from_json(agent, self)
+
+    async def update(self, name: str, updated_agent: Agent) -> Agent:
+        agent = await self.api.update_agent(*self._update_args(name, updated_agent))
+        return Agent.from_json(agent, self)
+
+    async def add_files(self, name: str, file_paths: List[str], description: str = None, max_workers: int = 4,
+                        manifest_path: str = None):
+        """
+        Add a list of files to the agent for retrieval, see :meth:`~mindsdb_sdk.agents.Agents.add_files`
+        """
+        if not file_paths:
+            return
+
+        agent = await self.get(name)
+
+        existing_files = set(metadata.get('name') for metadata in await self.api.list_files())
+
+        if manifest_path is None:
+            manifest_path = files_manifest_path(self.api.url)
+
+        with FilesManifest(manifest_path) as manifest:
+            # content of files is hashed in thread
+            to_upload = await asyncio.get_running_loop().run_in_executor(
+                None, self._files_to_upload, agent, file_paths, existing_files, manifest
+            )
+
+            async def upload(item):
+                filename, file_path, content_hash = item
+                # server recognizes type of file by extension
+                await self.api.upload_file(filename, file_path)
+                manifest.add(content_hash, filename.split('.')[0])
+
+            report = await process_chunks_async(
+                upload,
+                ((item, 1) for item in to_upload.values()),
+                max_workers=max_workers,
+                stop_on_error=False,
+            )
+        if report.failed:
+            num = report.resume_from
+            file_path = list(to_upload.values())[num][1]
+            raise BatchError(f'Upload of file {file_path} failed: {report.failed[num]}', report)
+
+        if description:
+            agent.prompt_template = (agent.prompt_template or '') + f'\n{description}'
+
+        await self.update(agent.name, agent)
+
+    async def add_file(self, name: str, file_path: str, description: str = None):
+        await self.add_files(name, [file_path], description)
+
+    async def add_webpages(self, name: str, urls: List[str], description: str = None, knowledge_base: str = None,
+                           crawl_depth: int = 1, limit: int = None, filters: List[str] = None):
+        if not urls:
+            return
+        agent = await self.get(name)
+        for url in urls:
+            # Validate URLs.
+            _ = urlparse(url)
+        if knowledge_base is not None:
+            kb = await self.knowledge_bases.get(knowledge_base)
+        else:
+            kb_name = f'{name.lower()}_web_{uuid4().hex}_kb'
+            kb = await self._create_default_knowledge_base(agent, kb_name)
+
+        await kb.insert_webpages(urls, crawl_depth=crawl_depth, filters=filters, limit=limit)
+
+        if 'knowledge_bases' not in agent.data or kb.name not in agent.data['knowledge_bases']:
+            agent.data.setdefault('knowledge_bases', []).append(kb.name)
+
+        if description:
+            agent.prompt_template = (agent.prompt_template or '') + f'\n{description}'
+
+        await self.update(agent.name, agent)
+
+    async def add_webpage(self, name: str, url: str, description: str = None, knowledge_base: str = None,
+                          crawl_depth: int = 1, limit: int = None, filters: List[str] = None):
+        await self.add_webpages(name, [url], description, knowledge_base=knowledge_base,
+                                crawl_depth=crawl_depth, limit=limit, filters=filters)
+
+    async def add_database(self, name: str, database: str, tables: List[str] = None, description: str = None):
+        # Make sure database exists.
+        db = await self.databases.get(database)
+
+        agent = await self.get(name)
+
+        if tables:
+            all_table_names = set([t.name for t in await db.tables.list()])
+            for t in tables:
+                if t not in all_table_names:
+                    raise ValueError(f'Table {t} does not exist in database {database}.')
+
+            if 'tables' not in agent.data or f'{database}.{t}' not in agent.data['tables']:
+                agent.data.setdefault('tables', []).append(f'{database}.{t}')
+        else:
+            if 'tables' not in agent.data or f'{database}.*' not in agent.data['tables']:
+                agent.data.setdefault('tables', []).append(f'{database}.*')
+
+        if description:
+            agent.prompt_template = (agent.prompt_template or '') + f'\n{description}'
+
+        await self.update(agent.name, agent)
+
+    async def _create_default_knowledge_base(self, agent: Agent, name: str) -> AsyncKnowledgeBase:
+        try:
+            return await self.knowledge_bases.create(name)
+        except Exception:
+            raise ValueError(
+                f"Failed to automatically create knowledge base for agent {agent.name}. "
+                "Either provide an existing knowledge base name, "
+                "or set your default embedding model via server.config.set_default_embedding_model(...) "
+                "or through the MindsDB UI."
+            )
+
+    async def drop(self, name: str):
+        await self.api.delete_agent(self.project.name, name)
+
+
+class AsyncProject(Project):
+    """
+    Project of async client, see :class:`~mindsdb_sdk.projects.Project`
+
+    Available collections: models, views, knowledge_bases, agents
+    """
+
+    def __init__(self, server, api, name):
+        self.name = name
+        self.api = api
+        self.server = server
+
+        self.models = AsyncModels(self, api)
+        self.views = AsyncViews(self, api)
+        self.knowledge_bases = AsyncKnowledgeBases(self, api)
+        self.agents = AsyncAgents(self, api)
+
+    def query(self, sql: str) -> AsyncQuery:
+        return AsyncQuery(self.api, sql, database=self.name)
+
+    async def drop_model_version(self, name: str, version: int):
+        ast_query = DropPredictor(Identifier(parts=[name, str(version)]))
+        await self.query(ast_query.to_string()).fetch()
+        self.models._invalidate_dropped(name)
+
+
+class AsyncProjects(AsyncCollectionMixin, Projects):
+
+    async def _list_projects(self):
+        data = await self.api.sql_query(self._list_sql())
+        return list(data.NAME)
+
+    async def list(self) -> List[AsyncProject]:
+        return [AsyncProject(self.server, self.api, name) for name in await self._list_projects()]
+
+    async def get(self, name: str = 'mindsdb') -> AsyncProject:
+        data = await self.api.sql_query(self._list_sql(name))
+        if name not in list(data.NAME):
+            raise AttributeError("Project doesn't exist")
+        return AsyncProject(self.server, self.api, name)
+
+    async def create(self, name: str) -> AsyncProject:
+        await self.api.sql_query(self._create_sql(name))
+        return AsyncProject(self.server, self.api, name)
+
+    async def drop(self, name: str):
+        ast_query = DropDatabase(name=Identifier(name))
+        await self.api.sql_query(ast_query.to_string())
+
+
+class AsyncMLEngines(AsyncCollectionMixin, MLEngines):
+
+    async def list(self) -> List[MLEngine]:
+        df = await self.api.sql_query(self._list_sql())
+        return self._engines_from_df(df)
+
+    async def get(self, name: str) -> MLEngine:
+        name = name.lower()
+        df = await self.api.sql_query(self._list_sql(name))
+        engines = self._index_engines(self._engines_from_df(df))
+        if name not in engines:
+            raise AttributeError(f"MLEngine doesn't exist {name}")
+        return engines[name]
+
+    async def create(self, name: str, handler: Union[str, Handler], connection_data: dict = None) -> MLEngine:
+        if isinstance(handler, Handler):
+            handler = handler.name
+
+        ast_query = CreateMLEngine(Identifier(name), handler, params=connection_data)
+        await self.api.sql_query(ast_query.to_string())
+        return MLEngine(name, handler, connection_data)
+
+    async def create_byom(self, name: str, code: str, requirements: Union[str, List[str]] = None) -> MLEngine:
+        if requirements is None:
+            requirements = ''
+        elif isinstance(requirements, list):
+            requirements = '\n'.join(requirements)
+
+        await self.api.upload_byom(name, code, requirements)
+        return MLEngine(name, 'byom', {})
+
+    async def drop(self, name: str):
+        ast_query = DropMLEngine(Identifier(name))
+        await self.api.sql_query(ast_query.to_string())
+
+
+class AsyncHandlers(AsyncCollectionMixin, Handlers):
+
+    async def list(self) -> List[Handler]:
+        df = await self.api.sql_query(self._list_sql())
+        return self._handlers_from_df(df)
+
+    async def get(self, name: str) -> Handler:
+        name = name.lower()
+        df = await self.api.sql_query(self._list_sql(name))
+        handlers = self._index_handlers(self._handlers_from_df(df))
+        if name not in handlers:
+            raise AttributeError(f"Handler doesn't exist: {name}")
+        return handlers[name]
+
+
+class AsyncServer(AsyncProject):
+    """
+    Server instance of async client. It is created by :func:`~mindsdb_sdk.connect.connect_async`
+
+    All methods which send requests to server are coroutines.
+    Many requests can be executed concurrently in one event loop:
+
+    >>> async with await mindsdb_sdk.connect_async() as server:
+    ...     db = await server.databases.get('my_db')
+    ...     queries = [db.query(f'select * from t{i}') for i in range(100)]
+    ...     dfs = await asyncio.gather(*[q.fetch() for q in queries])
+
+    Attributes for accessing to different objects:
+
+        - projects
+        - databases
+        - ml_engines
+        - ml_handlers
+        - data_handlers
+
+    Server is also root(mindsdb) project and has attributes of project:
+        - models
+        - views
+        - knowledge_bases
+        - agents
+    """
+
+    def __init__(self, api):
+        self.databases = AsyncDatabases(self, api)
+        self.ml_engines = AsyncMLEngines(api)
+        super().__init__(self, api, 'mindsdb')
+
+        self.projects = AsyncProjects(self, api)
+
+        self.ml_handlers = AsyncHandlers(self.api, 'ml')
+        self.data_handlers = AsyncHandlers(self.api, 'data')
+
+    def enable_result_cache(self, ttl: float = 60, max_size: int = 100 * 2 ** 20):
+        """
+        Enable client-side cache of results of queries, see :meth:`~mindsdb_sdk.server.Server.enable_result_cache`
+        """
+        self.api.enable_result_cache(ttl=ttl, max_size=max_size)
+
+    def disable_result_cache(self):
+        self.api.disable_result_cache()
+
+    def result_cache_stats(self) -> dict:
+        if self.api.result_cache is None:
+            return None
+        return self.api.result_cache.stats()
+
+    async def status(self) -> dict:
+        """
+        Get server information
+        :return: server status info
+        """
+        return await self.api.status()
+
+    async def tree(self) -> List[TreeNode]:
+        df = await self.api.objects_tree('')
+        return [TreeNode.from_dict(row.to_dict()) for _, row in df.iterrows()]
+
+    async def close(self):
+        """
+        Close connection to server
+        """
+        await self.api.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.api.url})'
@@ -13,7 +13,13 @@ def connect(
         api_key: str = None,
         is_managed: bool = False,
         cookies=None,
-        headers=None) -> Server:
+        headers=None,
+        stream_results: bool = False,
+        dtype_backend: str = None,
+        categorical_threshold: float = None,
+        result_format: str = None,
+        upload_formats: list = None,
+        predict_format: str = None) -> Server:
     """
     Create connection to mindsdb server
 
@@ -24,6 +30,19 @@ def connect(
     :param is_managed: whether or not the URL points to a managed instance
     :param cookies: addtional cookies to send with the connection, optional
     :param headers: addtional headers to send with the connection, optional
+    :param stream_results: decode results of queries while they are downloaded, reduces memory usage for big results
+    :param dtype_backend: dtypes of columns of query results: 'numpy' (default) or 'numpy_nullable'.
+       With 'numpy_nullable' pandas nullable dtypes are used (Int64, Float64, boolean, string),
+       integer columns with nulls are not converted to float
+    :param categorical_threshold: convert string columns of query results to categorical
+       if ratio of unique values to rows count is not bigger than this value, optional
+    :param result_format: binary format of query results to request from server: 'arrow' or 'parquet'.
+       Requires `pyarrow` package (`pip install mindsdb_sdk[arrow]`). If server doesn't support it json is used
+    :param upload_formats: formats of files accepted by server, used to choose format of uploaded dataframes:
+       'csv', 'csv.gz', 'csv.zst', 'parquet', 'arrow'. Default is ['csv', 'parquet']
+    :param predict_format: format of dataframe which is sent to predict endpoint: 'records' (default),
+       'split' (columns and rows, without repeating of column names) or 'arrow' (requires `pyarrow`).
+       If server doesn't support the format, records are used
     :return: Server object
 
     Examples
@@ -53,7 +72,69 @@ def connect(
             # is local
             url = DEFAULT_LOCAL_API_URL
 
-    api = RestAPI(url, login, password, api_key, is_managed, 
-                  cookies=cookies, headers=headers)
+    api = RestAPI(url, login, password, api_key, is_managed,
+                  cookies=cookies, headers=headers, stream_results=stream_results,
+                  dtype_backend=dtype_backend, categorical_threshold=categorical_threshold,
+                  result_format=result_format, upload_formats=upload_formats,
+                  predict_format=predict_format)
 
     return Server(api)
+
+
+async def connect_async(
+        url: str = None,
+        login: str = None,
+        password: str = None,
+        api_key: str = None,
+        is_managed: bool = False,
+        cookies=None,
+        headers=None,
+        limit: int = 100,
+        stream_results: bool = False,
+        dtype_backend: str = None,
+        categorical_threshold: float = None,
+        result_format: str = None,
+        upload_formats: list = None,
+        predict_format: str = None):
+    """
+    Create asyncio connection to mindsdb server. Requires `aiohttp` package (`pip install mindsdb_sdk[async]`)
+
+    Arguments are the same as in :func:`connect`
+
+    :param limit: max count of simultaneous http connections to server
+    :return: AsyncServer object
+
+    Examples
+    --------
+
+    >>> import asyncio
+    >>> import mindsdb_sdk
+
+    >>> async def main():
+    ...     server = await mindsdb_sdk.connect_async('http://127.0.0.1:47334')
+    ...     project = await server.projects.get('proj')
+    ...     queries = [project.query(f'select * from my_db.t{i}') for i in range(100)]
+    ...     dfs = await asyncio.gather(*[query.fetch() for query in queries])
+    ...     await server.close()
+
+    """
+    from mindsdb_sdk.async_server import AsyncServer
+    from mindsdb_sdk.connectors.async_rest_api import AsyncRestAPI
+
+    if url is None:
+        if login is not None:
+            # default is cloud
+            url = DEFAULT_CLOUD_API_URL
+        else:
+            # is local
+            url = DEFAULT_LOCAL_API_URL
+
+    api = AsyncRestAPI(url, login, password, api_key, is_managed,
+                       cookies=cookies, headers=headers, limit=limit, stream_results=stream_results,
+                       dtype_backend=dtype_backend, categorical_threshold=categorical_threshold,
+                       result_format=result_format, upload_formats=upload_formats,
+                       predict_format=predict_format)
+    if login is not None and api_key is None:
+        await api.login()
+
+    return AsyncServer(api)
@@ -0,0 +1,530 @@
+from functools import partial, wraps
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Union
+import asyncio
+import io
+import json
+
+import aiohttp
+import requests
+import pandas as pd
+import validators
+from sseclient import Event
+
+from mindsdb_sdk import __about__
+from mindsdb_sdk.connectors.rest_api import (
+    RestAPI, STREAM_CHUNK_SIZE, PREDICT_UNSUPPORTED_STATUS, _sql_response_to_df, _check_output_format,
+    _df_to_output, _arrow_to_output, _check_predict_format, _predict_request, _predict_response_to_df
+)
+from mindsdb_sdk.connectors.decoders import SqlResponseStreamDecoder, get_result_decoder, accept_header
+from mindsdb_sdk.utils.cache import ResultCache
+from mindsdb_sdk.utils.upload import DEFAULT_UPLOAD_FORMATS, check_upload_format
+
+
+def _try_relogin(fnc):
+    @wraps(fnc)
+    async def wrapper(self, *args, **kwargs):
+        try:
+            return await fnc(self, *args, **kwargs)
+        except requests.HTTPError as e:
+            if e.response.status_code != 401:
+                raise e
+
+            # try re-login
+            try:
+                await self.login()
+            except requests.HTTPError:
+                raise e
+            # call once more
+            return await fnc(self, *args, **kwargs)
+    return wrapper
+
+
+async def _aiter(blocks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    # aiohttp streams async iterables, blocks are read (or encoded) in thread to not block event loop
+    loop = asyncio.get_running_loop()
+    blocks = iter(blocks)
+    while True:
+        block = await loop.run_in_executor(None, next, blocks, None)
+        if block is None:
+            return
+        yield block
+
+
+async def _sse_events(response: aiohttp.ClientResponse) -> AsyncIterator[Event]:
+    # minimal SSE parsing: event is finished by empty line
+    fields = {}
+    data_lines = []
+    async for line in response.content:
+        line = line.decode().rstrip('\r\n')
+        if line == '':
+            if data_lines:
+                yield Event(data='\n'.join(data_lines), **fields)
+            fields, data_lines = {}, []
+        elif line.startswith('data:'):
+            data_lines.append(line[5:].lstrip(' '))
+        elif line.startswith('event:'):
+            fields['event'] = line[6:].lstrip(' ')
+        elif line.startswith('id:'):
+            fields['id'] = line[3:].lstrip(' ')
+    if data_lines:
+        yield Event(data='\n'.join(data_lines), **fields)
+
+
+async def _raise_for_status(response: aiohttp.ClientResponse):
+    # show response text in error, the same way as sync connector does
+    if 400 <= response.status < 600:
+        text = await response.text()
+
+        # HTTPError of requests is used to have the same exceptions in sync and async clients
+        r = requests.Response()
+        r.status_code = response.status
+        r.reason = response.reason
+        r.url = str(response.url)
+        r._content = text.encode()
+        raise requests.HTTPError(f'{response.reason}: {text}', response=r)
+
+
+class AsyncRestAPI:
+    """
+    Asyncio version of :class:`~mindsdb_sdk.connectors.rest_api.RestAPI`.
+
+    It has the same methods, but all of them are coroutines.
+    Http session is opened on the first request (inside of running event loop) and has to be closed by `close()`
+    """
+
+    def __init__(self, url=None, login=None, password=None, api_key=None, is_managed=False,
+                 cookies=None, headers=None, limit=100, stream_results=False, dtype_backend=None,
+                 categorical_threshold=None, result_format=None, upload_formats=None, predict_format=None):
+
+        self.url = url
+        self.username = login
+        self.password = password
+        self.api_key = api_key
+        self.is_managed = is_managed
+
+        # max count of simultaneous connections
+        self.limit = limit
+
+        # decode results of sql queries while they are downloaded
+        self.stream_results = stream_results
+
+        # options of conversion of query results to dataframes, see utils.dataframe.build_dataframe
+        self.dtype_backend = dtype_backend
+        self.categorical_threshold = categorical_threshold
+
+        # binary format of query results to request from server: 'arrow' or 'parquet', json is used if None
+        self.result_format = result_format
+
+        # format of input of model for predict: 'records' (default), 'split' or 'arrow'
+        self.predict_format = _check_predict_format(predict_format)
+        # it is reset if server doesn't support columnar formats
+        self._predict_formats_supported = True
+
+        # formats of files which are accepted by server, to choose format of uploaded dataframes
+        if upload_formats is None:
+            upload_formats = DEFAULT_UPLOAD_FORMATS
+        self.upload_formats = [check_upload_format(file_format) for file_format in upload_formats]
+
+        # disabled by default, see enable_result_cache
+        self.result_cache = None
+
+        self.cookies = cookies
+        self.headers = {'User-Agent': f'python-sdk/{__about__.__version__}'}
+        if headers is not None:
+            self.headers.update(headers)
+        if self.api_key is not None:
+            # Authenticate with API key instead of logging in, if present.
+            self.headers['X-Api-Key'] = self.api_key
+
+        self._session = None
+
+    def __deepcopy__(self, memo):
+        # objects are copied on filtering (table.filter(...)), connection has to be shared between them
+        return self
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                cookies=self.cookies,
+                connector=aiohttp.TCPConnector(limit=self.limit),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _request(self, method: str, path: str, **kwargs):
+        async with self.session.request(method, self.url + path, **kwargs) as r:
+            await _raise_for_status(r)
+            body = await r.read()
+        if not body:
+            return None
+        try:
+            return json.loads(body)
+        except ValueError:
+            # not json response
+            return None
+
+    async def login(self):
+        managed_endpoint = '/api/login'
+        cloud_endpoint = '/cloud/login'
+
+        if self.is_managed:
+            json = {'password': self.password, 'username': self.username}
+            url = self.url + managed_endpoint
+        else:
+            json = {'password': self.password, 'email': self.username}
+            url = self.url + cloud_endpoint
+        r = await self.session.post(url, json=json)
+
+        # failback when is using managed instance with is_managed=False
+        if r.status in (405, 404) and self.is_managed is False:
+            # try managed instance login
+            r.release()
+
+            json = {'password': self.password, 'username': self.username}
+            url = self.url + managed_endpoint
+            r = await self.session.post(url, json=json)
+
+        async with r:
+            await _raise_for_status(r)
+
+            # Use newer MindsDB auth that uses a token
+            if 'application/json' in r.headers.get('Content-Type', ''):
+                resp_json = await r.json()
+                if isinstance(resp_json, dict) and "token" in resp_json:
+                    self.headers['Authorization'] = f'Bearer {resp_json["token"]}'
+                    self.session.headers['Authorization'] = self.headers['Authorization']
+
+    async def sql_query(self, sql, database=None, lowercase_columns=False, stream=None, format=None, cache=False):
+        if database is None:
+            # it means the database is included in query
+            database = 'mindsdb'
+
+        result_cache = self.result_cache
+        if result_cache is None:
+            return await self._sql_query(sql, database, lowercase_columns, stream, format)
+
+        if not cache or not result_cache.is_cacheable(sql):
+            try:
+                return await self._sql_query(sql, database, lowercase_columns, stream, format)
+            finally:
+                # query could change data
+                result_cache.on_query(sql)
+
+        options = (database, format or 'pandas', lowercase_columns)
+        result = result_cache.get_result(sql, *options)
+        if result is None:
+            result = await self._sql_query(sql, database, lowercase_columns, stream, format)
+            result_cache.set_result(sql, *options, result=result)
+        return result
+
+    def enable_result_cache(self, ttl: float = 60, max_size: int = 100 * 2 ** 20) -> ResultCache:
+        self.result_cache = ResultCache(ttl=ttl, max_size=max_size)
+        return self.result_cache
+
+    def disable_result_cache(self):
+        self.result_cache = None
+
+    @_try_relogin
+    async def _sql_query(self, sql, database, lowercase_columns=False, stream=None, format=None):
+        if stream is None:
+            stream = self.stream_results
+        format = _check_output_format(format)
+
+        result_format = self.result_format
+        if result_format is None and format == 'arrow':
+            result_format = 'arrow'
+
+        payload = {
+            'query': sql,
+            'context': {'db': database}
+        }
+        if result_format not in (None, 'json'):
+            headers = {'Accept': accept_header(result_format)}
+            async with self.session.post(self.url + '/api/sql/query', json=payload, headers=headers) as r:
+                await _raise_for_status(r)
+                body = await r.read()
+                decoder = get_result_decoder(r.headers.get('Content-Type'))
+
+            if decoder is not None:
+                return _arrow_to_output(decoder(body), format, lowercase_columns, self.dtype_backend)
+            # server doesn't support binary format and responded with json
+            data = json.loads(body)
+
+        elif not stream:
+            data = await self._request('POST', '/api/sql/query', json=payload)
+
+        else:
+            async with self.session.post(self.url + '/api/sql/query', json=payload) as r:
+                await _raise_for_status(r)
+
+                decoder = SqlResponseStreamDecoder()
+                async for chunk in r.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    decoder.feed(chunk)
+                data = decoder.close()
+
+        df = _sql_response_to_df(data, lowercase_columns, self.dtype_backend, self.categorical_threshold)
+        return _df_to_output(df, format)
+
+    @_try_relogin
+    async def projects(self):
+        return pd.DataFrame(await self._request('GET', '/api/projects'))
+
+    @_try_relogin
+    async def model_predict(self, project, model, data, params=None, version=None):
+        if version is not None:
+            model = f'{model}.{version}'
+        if params is None:
+            params = {}
+        path = f'/api/projects/{project}/models/{model}/predict'
+
+        predict_format = self.predict_format
+        if predict_format not in (None, 'records') and self._predict_formats_supported:
+            async with self.session.post(self.url + path, **_predict_request(data, params, predict_format)) as r:
+                if r.status != PREDICT_UNSUPPORTED_STATUS:
+                    await _raise_for_status(r)
+                    body = await r.read()
+                    return _predict_response_to_df(r.headers.get('Content-Type'), body, self.dtype_backend)
+            # server supports only records, don't try other formats anymore
+            self._predict_formats_supported = False
+
+        resp = await self._request('POST', path, json={
+            'data': data.to_dict('records'),
+            'params': params
+        })
+        return pd.DataFrame(resp)
+
+    @_try_relogin
+    async def objects_tree(self, item='', with_schemas=False):
+        params = {}
+        if with_schemas:
+            params['all_schemas'] = 'true'
+
+        return pd.DataFrame(await self._request('GET', f'/api/tree/{item}', params=params))
+
+    open_file = staticmethod(RestAPI.open_file)
+    read_file_as_bytes = staticmethod(RestAPI.read_file_as_bytes)
+    read_dataframe_as_csv = staticmethod(RestAPI.read_dataframe_as_csv)
+    _encode_dataframe = RestAPI._encode_dataframe
+
+    async def read_file_as_webpage(self, url: str):
+        """
+        Read and return content of a file in bytes, given its URL.
+        :param url: URL of the file to read.
+        :return: File content in bytes.
+        """
+        async with self.session.get(url) as r:
+            return await r.read()
+
+    async def upload_data(self, file_name: str, data: Union[bytes, io.IOBase, AsyncIterable[bytes]]):
+        """
+        Upload binary data to MindsDB.
+        :param file_name: Name of the file.
+        :param data: Binary data to upload: bytes, binary file object or async iterable of bytes blocks.
+           File object and iterable are streamed to server by blocks
+        """
+        # remove suffix from file if present
+        name = file_name.split('.')[0]
+
+        if isinstance(data, io.IOBase):
+            # file is read in thread
+            data = _aiter(iter(partial(data.read, STREAM_CHUNK_SIZE), b''))
+
+        form = aiohttp.FormData()
+        form.add_field('original_file_name', file_name)
+        form.add_field('name', name)
+        form.add_field('source_type', 'file')
+        form.add_field('file', data, filename=file_name)
+
+        await self._request('PUT', f'/api/files/{name}', data=form)
+        if self.result_cache is not None:
+            self.result_cache.on_change(name)
+
+    @_try_relogin
+    async def upload_file(self, name: str, data: Union[pd.DataFrame, str], file_format: str = None):
+        """
+        Upload a file or a DataFrame to MindsDB.
+
+        Files and big DataFrames are streamed by blocks: memory usage doesn't depend on size of uploaded data.
+
+        :param name: Name of the file or DataFrame.
+        :param data: DataFrame data or file path.
+        :param file_format: format to upload DataFrame, see :meth:`RestAPI.upload_file`
+        """
+        if isinstance(data, pd.DataFrame):
+            file_name, content = self._encode_dataframe(name, data, file_format)
+            if not isinstance(content, bytes):
+                content = _aiter(content)
+            await self.upload_data(file_name, content)
+        elif validators.url(data):
+            await self.upload_data(name, await self.read_file_as_webpage(data))
+        else:
+            with self.open_file(data) as file:
+                await self.upload_data(name, file)
+
+    @_try_relogin
+    async def list_files(self) -> List[dict]:
+        return await self._request('GET', '/api/files/')
+
+    async def get_file_metadata(self, name: str) -> dict:
+        # No endpoint currently to get single file.
+        for metadata in await self.list_files():
+            if metadata.get('name', None) == name:
+                return metadata
+
+        r = requests.Response()
+        r.status_code = 404
+        raise requests.HTTPError(f'Not found: No file named {name} found', response=r)
+
+    @_try_relogin
+    async def upload_byom(self, name: str, code: str, requirements: str):
+        form = aiohttp.FormData()
+        form.add_field('code', code)
+        form.add_field('modules', requirements)
+
+        await self._request('PUT', f'/api/handlers/byom/{name}', data=form)
+
+    async def status(self) -> dict:
+        return await self._request('GET', '/api/status')
+
+    # Agents operations.
+    @_try_relogin
+    async def agents(self, project: str):
+        return await self._request('GET', f'/api/projects/{project}/agents')
+
+    @_try_relogin
+    async def agent(self, project: str, name: str):
+        return await self._request('GET', f'/api/projects/{project}/agents/{name}')
+
+    @_try_relogin
+    async def agent_completion(self, project: str, name: str, messages: List[dict]):
+        return await self._request('POST', f'/api/projects/{project}/agents/{name}/completions', json={
+            'messages': messages
+        })
+
+    async def agent_completion_stream(self, project: str, name: str, messages: List[dict]):
+        url = self.url + f'/api/projects/{project}/agents/{name}/completions/stream'
+        async with self.session.post(url, json={'messages': messages}) as r:
+            await _raise_for_status(r)
+            async for event in _sse_events(r):
+                # Stream objects loaded from SSE events 'data' param.
+                yield json.loads(event.data)
+
+    async def agent_completion_stream_v2(self, project: str, name: str, messages: List[dict]):
+        url = self.url + f'/api/projects/{project}/agents/{name}/completions/stream'
+        async with self.session.post(url, json={'messages': messages}) as r:
+            # Check for HTTP errors before processing the stream
+            await _raise_for_status(r)
+            try:
+                async for event in _sse_events(r):
+                    yield event  # Stream SSE events
+            except Exception as e:
+                yield e
+
+    @_try_relogin
+    async def create_agent(
+        self,
+        project: str,
+        name: str,
+        model_name: str = None,
+        provider: str = None,
+        data: dict = None,
+        model: dict = None,
+        prompt_template: str = None,
+        params: dict = None
+    ):
+        return await self._request('POST', f'/api/projects/{project}/agents', json={
+            'agent': {
+                'name': name,
+                'model_name': model_name,
+                'provider': provider,
+                'data': data,
+                'model': model,
+                'prompt_template': prompt_template,
+                'params': params
+            }
+        })
+
+    @_try_relogin
+    async def update_agent(
+        self,
+        project: str,
+        name: str,
+        updated_name: str,
+        updated_provider: str,
+        updated_model_name: str,
+        updated_data: dict,
+        updated_model: dict,
+        updated_prompt_template: str,
+        updated_params: dict
+    ):
+        return await self._request('PUT', f'/api/projects/{project}/agents/{name}', json={
+            'agent': {
+                'name': updated_name,
+                'model_name': updated_model_name,
+                'provider': updated_provider,
+                'data': updated_data,
+                'model': updated_model,
+                'prompt_template': updated_prompt_template,
+                'params': updated_params
+            }
+        })
+
+    @_try_relogin
+    async def delete_agent(self, project: str, name: str):
+        await self._request('DELETE', f'/api/projects/{project}/agents/{name}')
+
+    # Knowledge Base operations.
+    @_try_relogin
+    async def insert_into_knowledge_base(self, project: str, knowledge_base_name: str, data):
+        response = await self._request('PUT', f'/api/projects/{project}/knowledge_bases/{knowledge_base_name}', json={
+            'knowledge_base': data
+        })
+        if self.result_cache is not None:
+            self.result_cache.on_change(knowledge_base_name)
+        return response
+
+    @_try_relogin
+    async def list_knowledge_bases(self, project: str):
+        return await self._request('GET', f'/api/projects/{project}/knowledge_bases')
+
+    @_try_relogin
+    async def get_knowledge_base(self, project: str, knowledge_base_name):
+        return await self._request('GET', f'/api/projects/{project}/knowledge_bases/{knowledge_base_name}')
+
+    @_try_relogin
+    async def delete_knowledge_base(self, project: str, knowledge_base_name):
+        await self._request('DELETE', f'/api/projects/{project}/knowledge_bases/{knowledge_base_name}')
+
+    @_try_relogin
+    async def create_knowledge_base(self, project: str, data):
+        return await self._request('POST', f'/api/projects/{project}/knowledge_bases', json={
+            'knowledge_base': data
+        })
+
+    async def get_config(self):
+        """
+        Get MindsDB configuration.
+
+        :return: Dictionary containing MindsDB configuration.
+        """
+        return await self._request('GET', '/api/config')
+
+    async def update_config(self, config: dict):
+        """
+        Update MindsDB configuration with the provided settings.
+
+        :param config: Dictionary containing configuration settings.
+        """
+        await self._request('PUT', '/api/config', json=config)
@@ -0,0 +1,271 @@
+import codecs
+import json
+import re
+from typing import Callable, Iterable
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# processed part of buffer is dropped when it is bigger than this size
+COMPACT_SIZE = 1 << 16
+
+
+class _NeedMoreData(Exception):
+    pass
+
+
+class SqlResponseStreamDecoder:
+    """
+    Incremental decoder of /api/sql/query json response.
+
+    Response is read by chunks, rows of 'data' are decoded one by one and are put into buffers per column.
+    It allows not to keep the whole body of response and a list of rows in memory at the same time.
+
+    >>> decoder = SqlResponseStreamDecoder()
+    >>> for chunk in response.iter_content(chunk_size=65536):
+    ...     decoder.feed(chunk)
+    >>> result = decoder.close()
+
+    Result is a dict with the same keys as json response has,
+    but instead of 'data' (list of rows) it has 'columns_data' (list of column values)
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+        # parser state
+        self._state = 'start'
+        self._key = None
+
+        self.result = {}
+        self.columns_data = None
+        self.row_count = 0
+
+    def feed(self, chunk: bytes):
+        self._buf += self._text_decoder.decode(chunk)
+        self._parse()
+
+    def close(self) -> dict:
+        self._buf += self._text_decoder.decode(b'', final=True)
+        self._eof = True
+        self._parse()
+        if self._state != 'end':
+            raise ValueError('Unexpected end of response')
+
+        if self.columns_data is not None or 'column_names' in self.result:
+            if self.columns_data is None:
+                self.columns_data = [[] for _ in self.result['column_names']]
+            self.result['columns_data'] = self.columns_data
+        return self.result
+
+    def _skip_ws(self):
+        self._pos = WHITESPACE.match(self._buf, self._pos).end()
+        if self._pos >= len(self._buf):
+            raise _NeedMoreData
+
+    def _decode_value(self):
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise
+            raise _NeedMoreData
+        if end == len(self._buf) and not self._eof:
+            # value can be not finished yet, for example number
+            raise _NeedMoreData
+        self._pos = end
+        return value
+
+    def _expect(self, char: str):
+        self._skip_ws()
+        if self._buf[self._pos] != char:
+            raise ValueError(f'Unexpected symbol at {self._pos}: {self._buf[self._pos]}, expected: {char}')
+        self._pos += 1
+
+    def _add_rows(self, rows: list):
+        if len(rows) == 0:
+            return
+        if self.columns_data is None:
+            self.columns_data = [[] for _ in rows[0]]
+        # transpose batch of rows and append to columns
+        for values, column in zip(self.columns_data, zip(*rows)):
+            values.extend(column)
+        self.row_count += len(rows)
+
+    def _parse(self):
+        try:
+            while self._state != 'end':
+                self._step()
+        except _NeedMoreData:
+            if self._eof:
+                raise ValueError('Unexpected end of response')
+
+        if self._pos > COMPACT_SIZE:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+
+    def _step(self):
+        state = self._state
+
+        if state == 'start':
+            self._expect('{')
+            self._state = 'key'
+
+        elif state == 'key':
+            self._skip_ws()
+            char = self._buf[self._pos]
+            if char == '}':
+                self._pos += 1
+                self._state = 'end'
+                return
+            if char == ',':
+                self._pos += 1
+                return
+            self._key = self._decode_value()
+            self._state = 'colon'
+
+        elif state == 'colon':
+            self._expect(':')
+            self._state = 'value'
+
+        elif state == 'value':
+            self._skip_ws()
+            if self._key == 'data' and self._buf[self._pos] == '[':
+                self._pos += 1
+                self._state = 'rows'
+            else:
+                self.result[self._key] = self._decode_value()
+                self._state = 'key'
+
+        elif state == 'rows':
+            self._parse_rows()
+
+    def _parse_rows(self):
+        # hot loop: decode all complete rows which are in buffer
+        buf = self._buf
+        pos = self._pos
+        size = len(buf)
+        raw_decode = self._decoder.raw_decode
+        ws_match = WHITESPACE.match
+        rows = []
+        try:
+            while True:
+                pos = ws_match(buf, pos).end()
+                if pos >= size:
+                    break
+                char = buf[pos]
+                if char == ',':
+                    pos += 1
+                    continue
+                if char == ']':
+                    pos += 1
+                    self._state = 'key'
+                    break
+                try:
+                    row, end = raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if self._eof:
+                        raise
+                    break
+                if end == size and not self._eof:
+                    break
+                rows.append(row)
+                pos = end
+        finally:
+            self._pos = pos
+            self._add_rows(rows)
+
+        if self._state == 'rows':
+            # don't let buffer grow on long lists of rows
+            if self._pos > 0:
+                self._buf = self._buf[self._pos:]
+                self._pos = 0
+            raise _NeedMoreData
+
+
+def decode_sql_response_stream(chunks: Iterable[bytes]) -> dict:
+    """
+    Decode /api/sql/query response from iterable of bytes chunks, see :class:`SqlResponseStreamDecoder`
+    """
+    decoder = SqlResponseStreamDecoder()
+    for chunk in chunks:
+        decoder.feed(chunk)
+    return decoder.close()
+
+
+# binary columnar formats of query results, name -> content type
+RESULT_FORMATS = {
+    'arrow': 'application/vnd.apache.arrow.stream',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+JSON_CONTENT_TYPE = 'application/json'
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError('pyarrow is required for binary results, install it: pip install mindsdb_sdk[arrow]')
+    return pyarrow
+
+
+def _decode_arrow_stream(content: bytes):
+    pa = _import_pyarrow()
+    # buffer is not copied, arrays of table refer to the body of response
+    with pa.ipc.open_stream(pa.py_buffer(content)) as reader:
+        return reader.read_all()
+
+
+def _decode_parquet(content: bytes):
+    pa = _import_pyarrow()
+    import pyarrow.parquet as pq
+
+    return pq.read_table(pa.BufferReader(content))
+
+
+# content type -> function to convert body of response to pyarrow.Table
+RESULT_DECODERS = {
+    RESULT_FORMATS['arrow']: _decode_arrow_stream,
+    RESULT_FORMATS['parquet']: _decode_parquet,
+}
+
+
+def register_result_decoder(content_type: str, decoder: Callable[[bytes], 'pyarrow.Table'], name: str = None):
+    """
+    Register decoder of binary query results
+
+    >>> register_result_decoder('application/x-my-format', my_decode, name='my_format')
+    >>> con = mindsdb_sdk.connect(result_format='my_format')
+
+    :param content_type: content type of response which is decoded by this decoder
+    :param decoder: function which gets body of response and returns pyarrow.Table
+    :param name: name of format to use in `result_format` param, optional
+    """
+    RESULT_DECODERS[content_type] = decoder
+    if name is not None:
+        RESULT_FORMATS[name] = content_type
+
+
+def get_result_decoder(content_type: str) -> Callable:
+    """
+    Returns decoder for content type of response or None if it is not a registered binary format
+    """
+    if not content_type:
+        return None
+    # 'application/vnd.apache.arrow.stream; charset=...'
+    content_type = content_type.split(';')[0].strip().lower()
+    return RESULT_DECODERS.get(content_type)
+
+
+def accept_header(result_format: str) -> str:
+    """
+    Value of Accept header to request result in binary format. JSON is accepted too, in case server doesn't support it
+    """
+    if result_format not in RESULT_FORMATS:
+        raise ValueError(f'Unknown result format: {result_format}, expected one of: {list(RESULT_FORMATS)}')
+    return f'{RESULT_FORMATS[result_format]}, {JSON_CONTENT_TYPE};q=0.5'
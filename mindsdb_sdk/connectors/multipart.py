@@ -0,0 +1,107 @@
+import os
+import uuid
+from typing import Iterator, Union
+
+# size of blocks to read uploaded file
+UPLOAD_BLOCK_SIZE = 1 << 20
+
+CRLF = b'\r\n'
+
+
+def _field_header(boundary: bytes, name: str, filename: str = None) -> bytes:
+    disposition = f'form-data; name="{name}"'
+    if filename is not None:
+        disposition += f'; filename="{filename}"'
+        content_type = b'Content-Type: application/octet-stream\r\n'
+    else:
+        content_type = b''
+    return (
+        b'--' + boundary + CRLF
+        + f'Content-Disposition: {disposition}'.encode('utf-8') + CRLF
+        + content_type + CRLF
+    )
+
+
+def _source_size(source) -> int:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return len(source)
+    if hasattr(source, 'fileno') and hasattr(source, 'tell'):
+        try:
+            return os.fstat(source.fileno()).st_size - source.tell()
+        except (OSError, ValueError):
+            return None
+    return None
+
+
+def _iter_source(source, block_size: int) -> Iterator[bytes]:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield bytes(source)
+    elif hasattr(source, 'read'):
+        # file object
+        while True:
+            block = source.read(block_size)
+            if not block:
+                break
+            yield block
+    else:
+        # iterable of blocks
+        for block in source:
+            if isinstance(block, str):
+                block = block.encode('utf-8')
+            yield block
+
+
+class MultipartEncoder:
+    """
+    Encodes multipart/form-data body by blocks, content of files is not loaded into memory.
+
+    Content of file can be bytes, binary file object (it is read by blocks) or iterable of bytes blocks.
+    Encoder is passed to requests as `data`: if size of all files is known, Content-Length is sent,
+    otherwise body is sent using chunked transfer encoding.
+
+    >>> with open('big.csv', 'rb') as fd:
+    ...     encoder = MultipartEncoder({'name': 'big'}, {'file': ('big.csv', fd)})
+    ...     session.put(url, data=encoder, headers={'Content-Type': encoder.content_type})
+
+    Encoder can be iterated once.
+    """
+
+    def __init__(self, fields: dict, files: dict, block_size: int = UPLOAD_BLOCK_SIZE):
+        """
+        :param fields: form fields, name -> str value
+        :param files: form files, name -> (filename, content)
+        :param block_size: size of blocks to read file objects
+        """
+        self.boundary = uuid.uuid4().hex.encode('ascii')
+        self.block_size = block_size
+
+        # parts of body: bytes or content of file
+        self._parts = []
+        for name, value in fields.items():
+            self._parts.append(_field_header(self.boundary, name) + str(value).encode('utf-8') + CRLF)
+        for name, (filename, content) in files.items():
+            self._parts.append(_field_header(self.boundary, name, filename))
+            self._parts.append(content)
+            self._parts.append(CRLF)
+        self._parts.append(b'--' + self.boundary + b'--' + CRLF)
+
+        # requests uses `len` attribute as Content-Length, None means chunked transfer encoding
+        self.len = self._size()
+
+    @property
+    def content_type(self) -> str:
+        return 'multipart/form-data; boundary=' + self.boundary.decode('ascii')
+
+    def _size(self) -> Union[int, None]:
+        size = 0
+        for part in self._parts:
+            part_size = _source_size(part)
+            if part_size is None:
+                return None
+            size += part_size
+        return size
+
+    def __iter__(self) -> Iterator[bytes]:
+        for part in self._parts:
+            yield from _iter_source(part, self.block_size)
+
@@ -0,0 +1,214 @@
+"""
+Upload of big files by parts.
+
+Protocol:
+    - POST /api/files/{name}/parts - start upload, json: {original_file_name, size, part_size}, response: {upload_id}.
+      404, 405 or 501 response means that server doesn't support upload by parts
+    - PUT /api/files/{name}/parts/{upload_id}/{part} - upload part (numbered from 0), body is content of part
+    - GET /api/files/{name}/parts/{upload_id} - status of upload, response: {parts: [numbers of received parts]}
+    - POST /api/files/{name}/parts/{upload_id}/complete - assemble file from parts, json: {parts: count of parts}
+
+Numbers of acknowledged parts are saved in local manifest after every part,
+interrupted upload can be continued from the first not acknowledged part.
+"""
+import hashlib
+import json
+import os
+from typing import Callable
+
+import requests
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+DEFAULT_PART_SIZE = 64 * 2 ** 20
+
+DEFAULT_MANIFEST_DIR = os.path.join(os.path.expanduser('~'), '.mindsdb_sdk', 'uploads')
+
+RETRY_MAX_WAIT = 30
+
+# responses of server which doesn't support upload by parts
+NOT_SUPPORTED_STATUSES = (404, 405, 501)
+
+
+class PartsUploadNotSupported(Exception):
+    pass
+
+
+def _is_transient(error: BaseException) -> bool:
+    # error which can disappear after retry
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code >= 500
+    return False
+
+
+def _check_response(response: requests.Response):
+    if 400 <= response.status_code < 600:
+        raise requests.HTTPError(f'{response.reason}: {response.text}', response=response)
+
+
+class UploadManifest:
+    """
+    Local state of upload of file by parts, stored as json file.
+    Manifest is identified by url of server, name of uploaded file and path, size and modification time of local file.
+    """
+
+    def __init__(self, manifest_dir: str, url: str, name: str, file_path: str, part_size: int):
+        stat = os.stat(file_path)
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        self.part_size = part_size
+
+        key = json.dumps([url, name, os.path.abspath(file_path), self.size, self.mtime, part_size])
+        self.path = os.path.join(manifest_dir, hashlib.sha256(key.encode()).hexdigest() + '.json')
+
+        self.upload_id = None
+        self.parts = set()
+
+    @property
+    def parts_count(self) -> int:
+        return max(1, -(-self.size // self.part_size))
+
+    def load(self) -> bool:
+        """
+        :return: True if manifest of previous upload exists
+        """
+        try:
+            with open(self.path) as fd:
+                data = json.load(fd)
+        except (FileNotFoundError, ValueError):
+            return False
+        self.upload_id = data['upload_id']
+        self.parts = set(data['parts'])
+        return True
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as fd:
+            json.dump({
+                'upload_id': self.upload_id,
+                'size': self.size,
+                'part_size': self.part_size,
+                'parts': sorted(self.parts),
+            }, fd)
+        # manifest is not corrupted if process is killed during writing
+        os.replace(tmp_path, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class PartsUploader:
+    """
+    Uploads file by parts, every part is retried with exponential backoff on connection errors and 5xx responses.
+    """
+
+    def __init__(self, session: requests.Session, url: str, part_size: int = None, retries: int = 5,
+                 manifest_dir: str = None, on_progress: Callable[[int, int], None] = None):
+        """
+        :param session: http session
+        :param url: url of server
+        :param part_size: size of part in bytes
+        :param retries: count of retries of every request
+        :param manifest_dir: directory to keep manifests of uploads
+        :param on_progress: function which is called with (uploaded bytes, size of file) after every part
+        """
+        self.session = session
+        self.url = url
+        self.part_size = part_size or DEFAULT_PART_SIZE
+        self.retries = retries
+        self.manifest_dir = manifest_dir or DEFAULT_MANIFEST_DIR
+        self.on_progress = on_progress
+
+    def _retry(self, fnc: Callable, *args):
+        for attempt in Retrying(
+            retry=retry_if_exception(_is_transient),
+            wait=wait_random_exponential(multiplier=0.5, max=RETRY_MAX_WAIT),
+            stop=stop_after_attempt(self.retries + 1),
+            reraise=True
+        ):
+            with attempt:
+                return fnc(*args)
+
+    def _start(self, name: str, file_name: str, manifest: UploadManifest) -> str:
+        r = self.session.post(
+            self.url + f'/api/files/{name}/parts',
+            json={'original_file_name': file_name, 'size': manifest.size, 'part_size': manifest.part_size}
+        )
+        if r.status_code in NOT_SUPPORTED_STATUSES:
+            raise PartsUploadNotSupported()
+        _check_response(r)
+        return r.json()['upload_id']
+
+    def _received_parts(self, name: str, upload_id: str) -> set:
+        # parts received by server, None if upload isn't found
+        r = self.session.get(self.url + f'/api/files/{name}/parts/{upload_id}')
+        if r.status_code == 404:
+            return None
+        _check_response(r)
+        return set(r.json().get('parts', []))
+
+    def _upload_part(self, name: str, upload_id: str, num: int, data: bytes, size: int):
+        start = num * self.part_size
+        r = self.session.put(
+            self.url + f'/api/files/{name}/parts/{upload_id}/{num}',
+            data=data,
+            headers={
+                'Content-Type': 'application/octet-stream',
+                'Content-Range': f'bytes {start}-{start + len(data) - 1}/{size}',
+            }
+        )
+        _check_response(r)
+
+    def _complete(self, name: str, upload_id: str, parts_count: int):
+        r = self.session.post(
+            self.url + f'/api/files/{name}/parts/{upload_id}/complete',
+            json={'parts': parts_count}
+        )
+        _check_response(r)
+
+    def upload(self, name: str, file_name: str, file_path: str, resume: bool = False):
+        """
+        Uploads file by parts
+
+        :param name: name of file in mindsdb
+        :param file_name: original name of file
+        :param file_path: path to local file
+        :param resume: continue previous upload of the same file if it was interrupted
+        :raises PartsUploadNotSupported: server doesn't support upload by parts
+        """
+        manifest = UploadManifest(self.manifest_dir, self.url, name, file_path, self.part_size)
+
+        if resume and manifest.load():
+            received = self._retry(self._received_parts, name, manifest.upload_id)
+            if received is None:
+                # upload is expired on server
+                manifest.upload_id = None
+                manifest.parts = set()
+            else:
+                manifest.parts &= received
+
+        if manifest.upload_id is None:
+            manifest.upload_id = self._retry(self._start, name, file_name, manifest)
+            manifest.save()
+
+        uploaded = sum(min(self.part_size, manifest.size - num * self.part_size) for num in manifest.parts)
+        with open(file_path, 'rb') as fd:
+            for num in range(manifest.parts_count):
+                if num in manifest.parts:
+                    continue
+                fd.seek(num * self.part_size)
+                data = fd.read(self.part_size)
+
+                self._retry(self._upload_part, name, manifest.upload_id, num, data, manifest.size)
+
+                manifest.parts.add(num)
+                manifest.save()
+                uploaded += len(data)
+                if self.on_progress is not None:
+                    self.on_progress(uploaded, manifest.size)
+
+        self._retry(self._complete, name, manifest.upload_id, manifest.parts_count)
+        manifest.remove()
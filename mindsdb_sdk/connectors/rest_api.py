@@ -1,5 +1,5 @@
 from functools import wraps
-from typing import List, Union
+from typing import Iterable, List, Union
 import io
 import json
 
@@ -8,8 +8,34 @@ import pandas as pd
 import validators
 
 from mindsdb_sdk import __about__
+from mindsdb_sdk.connectors.decoders import (
+    SqlResponseStreamDecoder, RESULT_FORMATS, get_result_decoder, accept_header
+)
+from mindsdb_sdk.connectors.multipart import MultipartEncoder
+from mindsdb_sdk.connectors.parts_upload import PartsUploader, PartsUploadNotSupported
+from mindsdb_sdk.utils.dataframe import build_dataframe, arrow_to_dataframe, dataframe_to_arrow
+from mindsdb_sdk.utils.cache import ResultCache
+from mindsdb_sdk.utils.upload import (
+    DEFAULT_UPLOAD_FORMATS, UPLOAD_FORMATS, check_upload_format, choose_upload_format, encode_dataframe
+)
 from sseclient import SSEClient
 
+# size of chunks to read streamed response
+STREAM_CHUNK_SIZE = 1 << 16
+
+# dataframes which take more memory are uploaded as stream of csv blocks
+STREAM_UPLOAD_MIN_SIZE = 1 << 24
+
+# formats of input of model for predict
+PREDICT_FORMATS = ('records', 'split', 'arrow')
+
+# response to predict in columnar format which means that server doesn't support the format
+PREDICT_UNSUPPORTED_STATUS = 415
+
+# content type of input in split format: it is json, but server which doesn't support split format
+# rejects it with 415 (unsupported media type) instead of validation error of json payload
+PREDICT_SPLIT_CONTENT_TYPE = 'application/vnd.mindsdb.split'
+
 
 def _try_relogin(fnc):
     @wraps(fnc)
@@ -36,9 +62,105 @@ def _raise_for_status(response):
         raise requests.HTTPError(f'{response.reason}: {response.text}', response=response)
 
 
+def _sql_response_to_df(data: dict, lowercase_columns: bool = False, dtype_backend: str = None,
+                        categorical_threshold: float = None):
+    # converts decoded response of /api/sql/query to dataframe
+    if data['type'] == 'table':
+        columns = data['column_names']
+        if lowercase_columns:
+            columns = [i.lower() for i in columns]
+        return build_dataframe(
+            columns,
+            rows=data.get('data'),
+            # response was decoded by columns
+            columns_data=data.get('columns_data'),
+            # types of columns if server provides them
+            column_types=data.get('column_types'),
+            dtype_backend=dtype_backend,
+            categorical_threshold=categorical_threshold,
+        )
+    if data['type'] == 'error':
+        raise RuntimeError(data['error_message'])
+    return None
+
+
+def _check_output_format(format: str) -> str:
+    if format is None:
+        return 'pandas'
+    if format not in ('pandas', 'arrow'):
+        raise ValueError(f'Unknown format: {format}, expected "pandas" or "arrow"')
+    return format
+
+
+def _df_to_output(df, format: str):
+    # result decoded from json to requested output format
+    if df is None or format == 'pandas':
+        return df
+    return dataframe_to_arrow(df)
+
+
+def _arrow_to_output(table, format: str, lowercase_columns: bool = False, dtype_backend: str = None):
+    # result decoded from binary format to requested output format
+    if lowercase_columns:
+        table = table.rename_columns([name.lower() for name in table.column_names])
+    if format == 'arrow':
+        return table
+    return arrow_to_dataframe(table, dtype_backend)
+
+
+def _check_predict_format(predict_format: str) -> str:
+    if predict_format not in (None,) + PREDICT_FORMATS:
+        raise ValueError(f'Unknown predict format: {predict_format}, available formats: {", ".join(PREDICT_FORMATS)}')
+    return predict_format
+
+
+def _predict_request(data: pd.DataFrame, params: dict, predict_format: str) -> dict:
+    # arguments of http request to send input of model in columnar format
+    if predict_format == 'arrow':
+        import pyarrow as pa
+
+        sink = io.BytesIO()
+        table = dataframe_to_arrow(data)
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return {
+            'data': sink.getvalue(),
+            'params': {'params': json.dumps(params)},
+            'headers': {
+                'Content-Type': RESULT_FORMATS['arrow'],
+                'Accept': accept_header('arrow'),
+            },
+        }
+
+    data = data.to_dict('split', index=False)
+    payload = {
+        'columns': data['columns'],
+        'rows': data['data'],
+        'params': params,
+        'response_format': 'split',
+    }
+    return {
+        'data': json.dumps(payload, default=str),
+        'headers': {'Content-Type': PREDICT_SPLIT_CONTENT_TYPE},
+    }
+
+
+def _predict_response_to_df(content_type: str, body: bytes, dtype_backend: str = None) -> pd.DataFrame:
+    decoder = get_result_decoder(content_type)
+    if decoder is not None:
+        return arrow_to_dataframe(decoder(body), dtype_backend)
+
+    data = json.loads(body)
+    if isinstance(data, dict) and 'columns' in data:
+        # split format
+        return pd.DataFrame(data['data'], columns=data['columns'])
+    return pd.DataFrame(data)
+
+
 class RestAPI:
     def __init__(self, url=None, login=None, password=None, api_key=None, is_managed=False,
-                 cookies=None, headers=None):
+                 cookies=None, headers=None, stream_results=False, dtype_backend=None, categorical_threshold=None,
+                 result_format=None, upload_formats=None, predict_format=None):
 
         self.url = url
         self.username = login
@@ -46,6 +168,39 @@ class RestAPI:
         self.api_key = api_key
         self.is_managed = is_managed
         self.session = requests.Session()
+        self._pool_size = requests.adapters.DEFAULT_POOLSIZE
+
+        # decode results of sql queries while they are downloaded
+        self.stream_results = stream_results
+
+        # options of conversion of query results to dataframes, see utils.dataframe.build_dataframe
+        self.dtype_backend = dtype_backend
+        self.categorical_threshold = categorical_threshold
+
+        # binary format of query results to request from server: 'arrow' or 'parquet', json is used if None
+        self.result_format = result_format
+
+        # format of input of model for predict: 'records' (default), 'split' or 'arrow'
+        self.predict_format = _check_predict_format(predict_format)
+        # it is reset if server doesn't support columnar formats
+        self._predict_formats_supported = True
+
+        # formats of files which are accepted by server, to choose format of uploaded dataframes
+        if upload_formats is None:
+            upload_formats = DEFAULT_UPLOAD_FORMATS
+        self.upload_formats = [check_upload_format(file_format) for file_format in upload_formats]
+
+        # disabled by default, see enable_result_cache
+        self.result_cache = None
+
+        # cache of indexes of collections (databases, projects, models, ...), see Server.enable_metadata_cache
+        self.metadata_cache = None
+
+        # cache of predictions of models, see Server.enable_prediction_cache
+        self.prediction_cache = None
+
+        # cache of results of search in knowledge bases, see Server.enable_search_cache
+        self.search_cache = None
 
         if cookies is not None:
             self.session.cookies.update(cookies)
@@ -60,6 +215,25 @@ class RestAPI:
         if login is not None:
             self.login()
 
+    def set_pool_size(self, size: int):
+        """
+        Allow to keep up to `size` connections to server, for requests which are sent concurrently from threads.
+        By default, requests keeps 10 connections per host.
+
+        Adapters of the session are replaced, so the bigger pool is used by all objects of this connection
+        until it is closed. Pool is never shrunk.
+        """
+        if size <= self._pool_size:
+            return
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._pool_size = size
+
+    def __deepcopy__(self, memo):
+        # connection (with session and caches) is shared between copies of objects
+        return self
+
     def login(self):
         managed_endpoint = '/api/login'
         cloud_endpoint = '/cloud/login'
@@ -88,28 +262,99 @@ class RestAPI:
             if isinstance(resp_json, dict) and "token" in resp_json:
                 self.session.headers['Authorization'] = f'Bearer {resp_json["token"]}'
 
-    @_try_relogin
-    def sql_query(self, sql, database=None, lowercase_columns=False):
-
+    def sql_query(self, sql, database=None, lowercase_columns=False, stream=None, format=None, cache=False):
+        """
+        Execute sql query and return result as dataframe
+
+        :param sql: query
+        :param database: database to execute query in, optional
+        :param lowercase_columns: convert column names to lower case
+        :param stream: decode response by chunks while it is downloaded, default is RestAPI.stream_results.
+           It reduces peak memory usage for big results
+        :param format: type of result: 'pandas' (default) - dataframe, 'arrow' - pyarrow.Table
+        :param cache: use result cache if it is enabled, see :meth:`enable_result_cache`
+        :return: dataframe (or pyarrow.Table) or None if query doesn't return a table
+        """
         if database is None:
             # it means the database is included in query
             database = 'mindsdb'
+
+        result_cache = self.result_cache
+        if result_cache is None:
+            return self._sql_query(sql, database, lowercase_columns, stream, format)
+
+        if not cache or not result_cache.is_cacheable(sql):
+            try:
+                return self._sql_query(sql, database, lowercase_columns, stream, format)
+            finally:
+                # query could change data
+                result_cache.on_query(sql)
+
+        options = (database, format or 'pandas', lowercase_columns)
+        result = result_cache.get_result(sql, *options)
+        if result is None:
+            result = self._sql_query(sql, database, lowercase_columns, stream, format)
+            result_cache.set_result(sql, *options, result=result)
+        return result
+
+    def enable_result_cache(self, ttl: float = 60, max_size: int = 100 * 2 ** 20) -> ResultCache:
+        """
+        Enable cache of results of queries
+
+        :param ttl: time to live of results in seconds
+        :param max_size: max total size of cached results in bytes, least recently used results are evicted
+        :return: cache object
+        """
+        self.result_cache = ResultCache(ttl=ttl, max_size=max_size)
+        return self.result_cache
+
+    def disable_result_cache(self):
+        self.result_cache = None
+
+    @_try_relogin
+    def _sql_query(self, sql, database, lowercase_columns=False, stream=None, format=None):
+        if stream is None:
+            stream = self.stream_results
+        format = _check_output_format(format)
+
+        result_format = self.result_format
+        if result_format is None and format == 'arrow':
+            result_format = 'arrow'
+
         url = self.url + '/api/sql/query'
-        r = self.session.post(url, json={
+        payload = {
             'query': sql,
             'context': {'db': database}
-        })
-        _raise_for_status(r)
+        }
+        if result_format not in (None, 'json'):
+            r = self.session.post(url, json=payload, headers={'Accept': accept_header(result_format)})
+            _raise_for_status(r)
+
+            decoder = get_result_decoder(r.headers.get('Content-Type'))
+            if decoder is not None:
+                return _arrow_to_output(decoder(r.content), format, lowercase_columns, self.dtype_backend)
+            # server doesn't support binary format and responded with json
 
-        data = r.json()
-        if data['type'] == 'table':
-            columns = data['column_names']
-            if lowercase_columns:
-                columns = [i.lower() for i in columns]
-            return pd.DataFrame(data['data'], columns=columns)
-        if data['type'] == 'error':
-            raise RuntimeError(data['error_message'])
-        return None
+            df = _sql_response_to_df(r.json(), lowercase_columns, self.dtype_backend, self.categorical_threshold)
+            return _df_to_output(df, format)
+
+        if not stream:
+            r = self.session.post(url, json=payload)
+            _raise_for_status(r)
+
+            df = _sql_response_to_df(r.json(), lowercase_columns, self.dtype_backend, self.categorical_threshold)
+            return _df_to_output(df, format)
+
+        with self.session.post(url, json=payload, stream=True) as r:
+            _raise_for_status(r)
+
+            decoder = SqlResponseStreamDecoder()
+            for chunk in r.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                decoder.feed(chunk)
+            data = decoder.close()
+
+        df = _sql_response_to_df(data, lowercase_columns, self.dtype_backend, self.categorical_threshold)
+        return _df_to_output(df, format)
 
     @_try_relogin
     def projects(self):
@@ -122,15 +367,23 @@ class RestAPI:
 
     @_try_relogin
     def model_predict(self, project, model, data, params=None, version=None):
-        data = data.to_dict('records')
-
         if version is not None:
             model = f'{model}.{version}'
         if params is None:
             params = {}
         url = self.url + f'/api/projects/{project}/models/{model}/predict'
+
+        predict_format = self.predict_format
+        if predict_format not in (None, 'records') and self._predict_formats_supported:
+            r = self.session.post(url, **_predict_request(data, params, predict_format))
+            if r.status_code != PREDICT_UNSUPPORTED_STATUS:
+                _raise_for_status(r)
+                return _predict_response_to_df(r.headers.get('Content-Type'), r.content, self.dtype_backend)
+            # server supports only records, don't try other formats anymore
+            self._predict_formats_supported = False
+
         r = self.session.post(url, json={
-            'data': data,
+            'data': data.to_dict('records'),
             'params': params
         })
         _raise_for_status(r)
@@ -149,15 +402,14 @@ class RestAPI:
         return pd.DataFrame(r.json())
 
     @staticmethod
-    def read_file_as_bytes(file_path: str):
+    def open_file(file_path: str):
         """
-        Read and return content of a file in bytes, given its path.
+        Open file for reading in binary mode, given its path.
         :param file_path: Path of the file to read.
-        :return: File content in bytes.
+        :return: File object.
         """
         try:
-            with open(file_path, 'rb+') as file:
-                return file.read()
+            return open(file_path, 'rb')
         except FileNotFoundError:
             raise Exception(f'File {file_path} does not exist.')
         except PermissionError:
@@ -165,6 +417,19 @@ class RestAPI:
         except Exception as e:
             raise Exception(f'Unknown error occurred when reading file {file_path} - {str(e)}')
 
+    @staticmethod
+    def read_file_as_bytes(file_path: str):
+        """
+        Read and return content of a file in bytes, given its path.
+        :param file_path: Path of the file to read.
+        :return: File content in bytes.
+        """
+        with RestAPI.open_file(file_path) as file:
+            try:
+                return file.read()
+            except Exception as e:
+                raise Exception(f'Unknown error occurred when reading file {file_path} - {str(e)}')
+
     @staticmethod
     def read_dataframe_as_csv(data: pd.DataFrame):
         """
@@ -174,8 +439,7 @@ class RestAPI:
         """
         fd = io.BytesIO()
         data.to_csv(fd, index=False)
-        fd.seek(0)
-        return fd.read()
+        return fd.getvalue()
 
     @staticmethod
     def read_file_as_webpage(url: str):
@@ -187,56 +451,119 @@ class RestAPI:
         data = requests.get(url)
         return data.content
 
-    def upload_data(self, file_name: str, data: bytes):
+    def upload_data(self, file_name: str, data: Union[bytes, io.IOBase, Iterable[bytes]]):
         """
         Upload binary data to MindsDB.
         :param file_name: Name of the file.
-        :param data: Binary data to upload.
+        :param data: Binary data to upload: bytes, binary file object or iterable of bytes blocks.
+           File object and iterable are streamed to server by blocks
         """
         # remove suffix from file if present
         name = file_name.split('.')[0]
 
         url = self.url + f'/api/files/{name}'
-        r = self.session.put(
-            url,
-            data={
-                'original_file_name':file_name,
-                'name':name,
-                'source_type':'file',
-            },
-            files={
-                'file': (file_name, data)
-
-            }
-        )
+        fields = {
+            'original_file_name': file_name,
+            'name': name,
+            'source_type': 'file',
+        }
+        if isinstance(data, bytes):
+            r = self.session.put(
+                url,
+                data=fields,
+                files={
+                    'file': (file_name, data)
+                }
+            )
+        else:
+            encoder = MultipartEncoder(fields, {'file': (file_name, data)})
+            r = self.session.put(url, data=encoder, headers={'Content-Type': encoder.content_type})
         _raise_for_status(r)
+        if self.result_cache is not None:
+            self.result_cache.on_change(name)
+
+    def _encode_dataframe(self, name: str, data: pd.DataFrame, file_format: str = None) -> tuple:
+        # returns name of file and its content: bytes or iterator of blocks
+        if file_format is None:
+            file_format = choose_upload_format(data, self.upload_formats)
+        check_upload_format(file_format)
+
+        if file_format != 'csv':
+            # server recognizes format by extension
+            name = f'{name}.{UPLOAD_FORMATS[file_format]}'
+
+        if data.memory_usage(index=False, deep=True).sum() < STREAM_UPLOAD_MIN_SIZE:
+            # small dataframe is sent with known content length
+            if file_format == 'csv':
+                return name, self.read_dataframe_as_csv(data)
+            return name, b''.join(encode_dataframe(data, file_format))
+        return name, encode_dataframe(data, file_format)
 
     @_try_relogin
-    def upload_file(self, name: str, data: Union[pd.DataFrame, str]):
+    def upload_file(self, name: str, data: Union[pd.DataFrame, str], file_format: str = None,
+                    part_size: int = None, resume: bool = False):
         """
         Upload a file or a DataFrame to MindsDB.
+
+        Files and big DataFrames are streamed by blocks: memory usage doesn't depend on size of uploaded data.
+
+        Local file can be uploaded by parts, every part is retried on connection errors.
+        If upload was interrupted, it can be continued from the last uploaded part using `resume=True`.
+        If server doesn't support upload by parts, file is uploaded with single request.
+
+        >>> api.upload_file('big.csv', '/data/big.csv', part_size=64 * 2**20)
+        >>> # after failure
+        >>> api.upload_file('big.csv', '/data/big.csv', part_size=64 * 2**20, resume=True)
+
         :param name: Name of the file or DataFrame.
         :param data: DataFrame data or file path.
+        :param file_format: format to upload DataFrame: 'csv', 'csv.gz', 'csv.zst', 'parquet' or 'arrow'.
+           By default, it is chosen by size of DataFrame and formats supported by server, see `upload_formats`
+        :param part_size: upload file by parts of this size in bytes, optional
+        :param resume: continue interrupted upload of file by parts
         """
         if isinstance(data, pd.DataFrame):
-            data_in_bytes = self.read_dataframe_as_csv(data)
+            self.upload_data(*self._encode_dataframe(name, data, file_format))
         elif validators.url(data):
-            data_in_bytes = self.read_file_as_webpage(data)
+            self.upload_data(name, self.read_file_as_webpage(data))
         else:
-            data_in_bytes = self.read_file_as_bytes(data)
-
-        self.upload_data(name, data_in_bytes)
+            if part_size is not None or resume:
+                try:
+                    self.upload_parts(name, data, part_size=part_size, resume=resume)
+                    return
+                except PartsUploadNotSupported:
+                    # upload file with single request
+                    pass
+            with self.open_file(data) as file:
+                self.upload_data(name, file)
+
+    def upload_parts(self, file_name: str, file_path: str, part_size: int = None, resume: bool = False):
+        """
+        Upload local file by parts, see :class:`~mindsdb_sdk.connectors.parts_upload.PartsUploader`
+        :param file_name: Name of the file.
+        :param file_path: Path to local file.
+        :param part_size: Size of part in bytes.
+        :param resume: Continue interrupted upload.
+        """
+        name = file_name.split('.')[0]
+        uploader = PartsUploader(self.session, self.url, part_size=part_size)
+        uploader.upload(name, file_name, file_path, resume=resume)
+        if self.result_cache is not None:
+            self.result_cache.on_change(name)
 
     @_try_relogin
-    def get_file_metadata(self, name: str) -> dict:
-        # No endpoint currently to get single file.
+    def list_files(self) -> List[dict]:
         url = self.url + f'/api/files/'
         r = self.session.get(url)
         _raise_for_status(r)
-        all_file_metadata = r.json()
-        for metadata in all_file_metadata:
+        return r.json()
+
+    def get_file_metadata(self, name: str) -> dict:
+        # No endpoint currently to get single file.
+        for metadata in self.list_files():
             if metadata.get('name', None) == name:
                 return metadata
+        r = requests.Response()
         r.status_code = 404
         raise requests.HTTPError(f'Not found: No file named {name} found', response=r)
 
@@ -392,6 +719,10 @@ class RestAPI:
             }
         )
         _raise_for_status(r)
+        if self.result_cache is not None:
+            self.result_cache.on_change(knowledge_base_name)
+        if self.search_cache is not None:
+            self.search_cache.invalidate_kb(project, knowledge_base_name)
 
         return r.json()
 
@@ -411,6 +742,8 @@ class RestAPI:
     def delete_knowledge_base(self, project: str, knowledge_base_name):
         r = self.session.delete(self.url + f'/api/projects/{project}/knowledge_bases/{knowledge_base_name}')
         _raise_for_status(r)
+        if self.search_cache is not None:
+            self.search_cache.invalidate_kb(project, knowledge_base_name)
 
     @_try_relogin
     def create_knowledge_base(self, project: str, data):
@@ -421,6 +754,10 @@ class RestAPI:
             }
         )
         _raise_for_status(r)
+        if self.result_cache is not None:
+            self.result_cache.on_change(data['name'])
+        if self.search_cache is not None:
+            self.search_cache.invalidate_kb(project, data['name'])
 
         return r.json()
 
@@ -1,9 +1,10 @@
 from typing import Dict, List, Union
 
 from mindsdb_sql_parser.ast.mindsdb import AlterDatabase, CreateDatabase
-from mindsdb_sql_parser.ast import DropDatabase, Identifier
+from mindsdb_sql_parser.ast import DropDatabase, Identifier, Select
 
 from mindsdb_sdk.utils.objects_collection import CollectionBase
+from mindsdb_sdk.utils.sql import dict_to_binary_op
 from .tree import TreeNode
 
 from .query import Query
@@ -28,6 +29,8 @@ class Database:
 
     """
 
+    _tables_class = Tables
+
     def __init__(self, server, name: str, engine: str = None, params: Dict = None):
         self.server = server
         self.name = name
@@ -35,7 +38,7 @@ class Database:
         self.api = server.api
         self.params = params
 
-        self.tables = Tables(self, self.api)
+        self.tables = self._tables_class(self, self.api)
 
         # old api
         self.get_table = self.tables.get
@@ -110,17 +113,36 @@ class Databases(CollectionBase):
 
     """
 
+    _database_class = Database
+
     def __init__(self, server, api):
         self.api = api
         self.server = server
 
     def _list_databases(self) -> Dict[str, Database]:
-        data = self.api.sql_query(
-            "select NAME, ENGINE, CONNECTION_DATA from information_schema.databases where TYPE='data'"
+        return self._metadata_index(self._load_databases)
+
+    def _load_databases(self) -> Dict[str, Database]:
+        data = self.api.sql_query(self._list_sql())
+        return self._databases_from_df(data)
+
+    @staticmethod
+    def _list_sql(name: str = None) -> str:
+        if name is None:
+            return "select NAME, ENGINE, CONNECTION_DATA from information_schema.databases where TYPE='data'"
+
+        # lookup of one database
+        ast_query = Select(
+            targets=[Identifier('NAME'), Identifier('ENGINE'), Identifier('CONNECTION_DATA')],
+            from_table=Identifier(parts=['information_schema', 'databases']),
+            where=dict_to_binary_op({'TYPE': 'data', 'NAME': name})
         )
+        return ast_query.to_string()
+
+    def _databases_from_df(self, data) -> Dict[str, Database]:
         name_to_db = {}
         for _, row in data.iterrows():
-            name_to_db[row["NAME"]] = Database(
+            name_to_db[row["NAME"]] = self._database_class(
                 self.server, row["NAME"], engine=row["ENGINE"], params=row["CONNECTION_DATA"]
             )
         return name_to_db
@@ -154,7 +176,8 @@ class Databases(CollectionBase):
             parameters=connection_args,
         )
         self.api.sql_query(ast_query.to_string())
-        return Database(self.server, name, engine=engine, params=connection_args)
+        self._invalidate_metadata()
+        return self._database_class(self.server, name, engine=engine, params=connection_args)
 
     def drop(self, name: str):
         """
@@ -164,6 +187,7 @@ class Databases(CollectionBase):
         """
         ast_query = DropDatabase(name=Identifier(name))
         self.api.sql_query(ast_query.to_string())
+        self._invalidate_metadata()
 
     def get(self, name: str) -> Database:
         """
@@ -172,7 +196,10 @@ class Databases(CollectionBase):
         :param name: name of integration
         :return: Database object
         """
-        databases = self._list_databases()
+        if self._metadata_cache() is not None:
+            databases = self._list_databases()
+        else:
+            databases = self._databases_from_df(self.api.sql_query(self._list_sql(name)))
         if name not in databases:
             raise AttributeError(f"Database '{name}' doesn't exist")
         return databases[name]
@@ -185,10 +212,15 @@ class Databases(CollectionBase):
         :param connection_args: new connection parameters
         :return: updated Database object
         """
+        self.api.sql_query(self._update_sql(name, connection_args))
+        self._invalidate_metadata()
+        return self.get(name)
+
+    @staticmethod
+    def _update_sql(name: str, connection_args: Dict) -> str:
         ast_query = AlterDatabase(
             name=Identifier(name),
             altered_params={
                 "parameters": connection_args},
         )
-        self.api.sql_query(ast_query.to_string())
-        return self.get(name)
+        return ast_query.to_string()
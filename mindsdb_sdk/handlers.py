@@ -1,10 +1,11 @@
 from dataclasses import dataclass
 import dataclasses
-from typing import List
+from typing import Dict, List
 
 from mindsdb_sql_parser.ast import Show, Identifier, BinaryOperation, Constant
 
 from mindsdb_sdk.utils.objects_collection import CollectionBase
+from mindsdb_sdk.utils.sql import add_condition
 
 
 @dataclass(init=False)
@@ -42,18 +43,41 @@ class Handlers(CollectionBase):
         :return: list of handlers
         """
 
+        return list(self._list_handlers().values())
+
+    def _list_handlers(self) -> Dict[str, Handler]:
+        return self._metadata_index(self._load_handlers)
+
+    def _load_handlers(self) -> Dict[str, Handler]:
+        df = self.api.sql_query(self._list_sql())
+        return self._index_handlers(self._handlers_from_df(df))
+
+    @staticmethod
+    def _index_handlers(handlers: List[Handler]) -> Dict[str, Handler]:
+        return {item.name: item for item in handlers}
+
+    def _metadata_key(self) -> tuple:
+        return (self.__class__.__name__, self.type)
+
+    def _list_sql(self, name: str = None) -> str:
+        where = BinaryOperation(
+            op='=',
+            args=[
+                Identifier('type'),
+                Constant(self.type)
+            ]
+        )
+        if name is not None:
+            # lookup of one handler
+            where = add_condition(where, BinaryOperation(op='=', args=[Identifier('name'), Constant(name)]))
         ast_query = Show(
             category='HANDLERS',
-            where=BinaryOperation(
-                op='=',
-                args=[
-                    Identifier('type'),
-                    Constant(self.type)
-                ]
-            )
+            where=where
         )
+        return ast_query.to_string()
 
-        df = self.api.sql_query(ast_query.to_string())
+    @staticmethod
+    def _handlers_from_df(df) -> List[Handler]:
         # columns to lower case
         cols_map = {i: i.lower() for i in df.columns}
         df = df.rename(columns=cols_map)
@@ -71,10 +95,13 @@ class Handlers(CollectionBase):
         :return: handler object
         """
         name = name.lower()
-        for item in self.list():
-            if item.name == name:
-                return item
-        raise AttributeError(f"Handler doesn't exist: {name}")
+        if self._metadata_cache() is not None:
+            handlers = self._list_handlers()
+        else:
+            handlers = self._index_handlers(self._handlers_from_df(self.api.sql_query(self._list_sql(name))))
+        if name not in handlers:
+            raise AttributeError(f"Handler doesn't exist: {name}")
+        return handlers[name]
 
 
 class MLHandlers(Handlers):
@@ -1,14 +1,20 @@
 import copy
 import json
-from typing import Union, List, Iterable
+import os
+import time
+from typing import Callable, Iterable, Iterator, List, Tuple, Union
 
 import pandas as pd
 
-from mindsdb_sql_parser.ast import Identifier, Star, Select, BinaryOperation, Constant, Insert
+from mindsdb_sql_parser.ast import Identifier, Star, Select, BinaryOperation, Constant, Insert, Union as UnionQuery
+from mindsdb_sql_parser.ast import Delete, Tuple as TupleNode
 
-from mindsdb_sdk.utils.sql import dict_to_binary_op, query_to_native_query
+from mindsdb_sdk.utils.sql import add_condition, dict_to_binary_op, filters_to_binary_op, query_to_native_query
 from mindsdb_sdk.utils.objects_collection import CollectionBase
 from mindsdb_sdk.utils.context import is_saving
+from mindsdb_sdk.utils.batch import AdaptiveChunkSize, BatchReport, BatchError, process_chunks
+from mindsdb_sdk.utils.dataframe import read_file_blocks
+from mindsdb_sdk.utils.sync import SyncManifest, content_hashes, manifest_path as default_manifest_path
 
 from .models import Model
 from .tables import Table
@@ -17,6 +23,12 @@ from .databases import Database
 
 MAX_INSERT_SIZE = 1000
 
+# default limit of size of json payload of one chunk for chunked insert
+INSERT_CHUNK_BYTES = 8 * 2 ** 20
+
+# rows of dataframe are converted to records by blocks of this size
+INSERT_BLOCK_ROWS = 10000
+
 
 def split_data(data: Union[pd.DataFrame, list], partition_size: int) -> Iterable:
     """
@@ -77,6 +89,9 @@ class KnowledgeBase(Query):
         # query behavior
         self._query = None
         self._limit = None
+        self._filters = None
+        self._columns = None
+        self._relevance_threshold = None
 
         self._update_query()
 
@@ -86,7 +101,8 @@ class KnowledgeBase(Query):
     def __repr__(self):
         return f'{self.__class__.__name__}({self.project.name}.{self.name})'
 
-    def find(self, query: str, limit: int = 10):
+    def find(self, query: str, limit: int = 10, filters: dict = None, columns: List[str] = None,
+             relevance_threshold: float = None):
         """
 
         Query data from knowledge base.
@@ -97,48 +113,249 @@ class KnowledgeBase(Query):
         >>> # fetch dataframe to client
         >>> print(query.fetch())
 
+        Results can be filtered by metadata columns on server side:
+
+        >>> query = my_kb.find(
+        ...     'dogs',
+        ...     filters={'author': 'bob', 'tenant': ['a', 'b'], 'date': {'>=': '2024-01-01', '<': '2025-01-01'}},
+        ...     columns=['id', 'chunk_content', 'relevance'],
+        ...     relevance_threshold=0.5
+        ... )
+
         :param query: text query
         :param limit: count of rows in result, default 10
+        :param filters: conditions for metadata columns, see :func:`~mindsdb_sdk.utils.sql.filters_to_binary_op`:
+           value for '=', list for 'IN', dict of operators for ranges
+        :param columns: columns to return, optional. Default: all columns
+        :param relevance_threshold: return only results with relevance not less than this value, optional
         :return: Query object
         """
+        self._check_filters(filters)
 
         kb = copy.deepcopy(self)
         kb._query = query
         kb._limit = limit
+        kb._filters = filters
+        kb._columns = columns
+        kb._relevance_threshold = relevance_threshold
         kb._update_query()
 
         return kb
 
-    def _update_query(self):
+    def _search_cache(self):
+        return getattr(self.api, 'search_cache', None)
+
+    def _search_key(self, query: str, limit: int = None, filters: dict = None, columns: List[str] = None,
+                    relevance_threshold: float = None) -> tuple:
+        return self._search_cache().search_key(
+            self.project.name, self.name, query, limit, filters, columns, relevance_threshold
+        )
+
+    def fetch(self, stream: bool = None, format: str = 'pandas', cache: bool = True) -> pd.DataFrame:
+        """
+        Executes query of knowledge base and returns result.
+        If search cache is enabled (see :meth:`~mindsdb_sdk.server.Server.enable_search_cache`),
+        result of `find` is taken from it
+
+        :param stream: decode result while it is downloaded, see :meth:`~mindsdb_sdk.query.Query.fetch`
+        :param format: 'pandas' (default) or 'arrow'
+        :param cache: use result cache and search cache if they are enabled
+        :return: dataframe or pyarrow.Table with result
+        """
+        search_cache = self._search_cache()
+        if search_cache is None or not cache or self._query is None or format not in (None, 'pandas'):
+            return super().fetch(stream=stream, format=format, cache=cache)
+
+        key = self._search_key(self._query, self._limit, self._filters, self._columns, self._relevance_threshold)
+        df = search_cache.get_result(key)
+        if df is None:
+            df = super().fetch(stream=stream, format=format, cache=cache)
+            search_cache.set_result(key, df)
+        return df
+
+    def find_many(
+        self,
+        queries: List[str],
+        limit: int = 10,
+        max_workers: int = 4,
+        batch_size: int = None,
+        retries: int = 0,
+        on_progress: Callable[[BatchReport], None] = None,
+        filters: dict = None,
+        columns: List[str] = None,
+        relevance_threshold: float = None,
+    ) -> pd.DataFrame:
+        """
+        Query knowledge base with many text queries at once.
+
+        Results of all queries are returned in one dataframe, `query_index` column contains number of query
+        in the list of queries. Rows are ordered by query_index.
+
+        >>> df = my_kb.find_many(['dogs', 'cats', 'birds'], limit=5, max_workers=8)
+        >>> df[df['query_index'] == 1]  # results for 'cats'
+
+        By default, every query is sent as separate request, up to max_workers requests at the same time.
+        With batch_size, queries are combined into one statement with UNION ALL, batch_size queries in statement.
+        It reduces count of requests if server supports union of knowledge base queries:
 
+        >>> df = my_kb.find_many(queries, limit=5, batch_size=100)
+
+        Latency of requests is available in BatchReport which is passed to on_progress:
+
+        >>> def show_progress(report):
+        ...     print(f'p50: {report.p50:.3f}s, p95: {report.p95:.3f}s')
+        >>> df = my_kb.find_many(queries, on_progress=show_progress)
+
+        :param queries: list of text queries
+        :param limit: count of rows in result of every query, default 10
+        :param max_workers: count of requests which are executed at the same time
+        :param batch_size: count of queries combined in one statement, optional
+        :param retries: count of retries of failed request
+        :param on_progress: function which is called with BatchReport after every request
+        :param filters: conditions for metadata columns, the same for all queries, see `find`
+        :param columns: columns to return, optional. Default: all columns
+        :param relevance_threshold: return only results with relevance not less than this value, optional
+        :return: dataframe with results of all queries and query_index column
+        """
+        self._check_filters(filters)
+        if batch_size is not None and batch_size <= 0:
+            raise ValueError('batch_size must be positive')
+        queries = list(queries)
+
+        search_cache = self._search_cache()
+
+        def search(indexes):
+            if batch_size is None:
+                query = queries[indexes[0]]
+                select = self._search_select(query, limit, filters, columns, relevance_threshold)
+                df = None
+                if search_cache is not None:
+                    key = self._search_key(query, limit, filters, columns, relevance_threshold)
+                    df = search_cache.get_result(key)
+                if df is None:
+                    df = self.api.sql_query(select.to_string(), self.database, cache=True)
+                    if search_cache is not None:
+                        search_cache.set_result(key, df)
+                df['query_index'] = indexes[0]
+                return df
+            sql = self._union_search_sql(queries, indexes, limit, filters, columns, relevance_threshold)
+            return self.api.sql_query(sql, self.database, cache=True)
+
+        if max_workers > 1:
+            self.api.set_pool_size(max_workers)
+
+        report = process_chunks(
+            search,
+            self._search_batches(queries, batch_size),
+            max_workers=max_workers,
+            retries=retries,
+            on_progress=on_progress,
+            keep_results=True,
+        )
+        return self._search_results(report)
+
+    @staticmethod
+    def _search_batches(queries: List[str], batch_size: int = None) -> Iterator[Tuple[List[int], int]]:
+        # yields (indexes of queries, count of queries)
+        step = batch_size or 1
+        for start in range(0, len(queries), step):
+            yield list(range(start, min(start + step, len(queries)))), min(step, len(queries) - start)
+
+    def _union_search_sql(self, queries: List[str], indexes: List[int], limit: int = None, filters: dict = None,
+                          columns: List[str] = None, relevance_threshold: float = None) -> str:
+        ast_query = None
+        for i in indexes:
+            select = self._search_select(queries[i], limit, filters, columns, relevance_threshold)
+            select.targets.append(Constant(i, alias=Identifier('query_index')))
+            select.parentheses = True
+            if ast_query is None:
+                ast_query = select
+            else:
+                ast_query = UnionQuery(left=ast_query, right=select, unique=False)
+        return ast_query.to_string()
+
+    @staticmethod
+    def _search_results(report: BatchReport) -> pd.DataFrame:
+        if report.failed:
+            num = report.resume_from
+            raise BatchError(f'Search of batch {num} failed: {report.failed[num]}', report)
+
+        results = [report.results[num] for num in sorted(report.results)]
+        if not results:
+            return pd.DataFrame(columns=['query_index'])
+        df = pd.concat(results, ignore_index=True)
+        # rows of one statement with union can come in any order
+        return df.sort_values('query_index', kind='stable', ignore_index=True)
+
+    def _check_filters(self, filters: dict):
+        # filters can be applied only to known columns, if metadata columns of knowledge base are defined
+        if not filters or not self.metadata_columns:
+            return
+        allowed = set(self.metadata_columns)
+        if self.id_column is not None:
+            allowed.add(self.id_column)
+        unknown = [name for name in filters if name not in allowed]
+        if unknown:
+            raise ValueError(f'Unknown columns in filters: {unknown}, metadata columns: {self.metadata_columns}')
+
+    def _search_select(self, query: str = None, limit: int = None, filters: dict = None,
+                       columns: List[str] = None, relevance_threshold: float = None) -> Select:
+        targets = [Star()]
+        if columns:
+            targets = [Identifier(col) for col in columns]
         ast_query = Select(
-            targets=[Star()],
+            targets=targets,
             from_table=self.table_name
         )
-        if self._query is not None:
-            ast_query.where = BinaryOperation(op='=', args=[
+        where = None
+        if query is not None:
+            where = BinaryOperation(op='=', args=[
                 Identifier('content'),
-                Constant(self._query)
+                Constant(query)
             ])
+        if filters:
+            where = add_condition(where, filters_to_binary_op(filters))
+        if relevance_threshold is not None:
+            where = add_condition(where, BinaryOperation(op='>=', args=[
+                Identifier('relevance'),
+                Constant(relevance_threshold)
+            ]))
+        ast_query.where = where
+        if limit is not None:
+            ast_query.limit = Constant(limit)
+        return ast_query
+
+    def _build_select(self) -> Select:
+        return self._search_select(self._query, filters=self._filters, columns=self._columns,
+                                   relevance_threshold=self._relevance_threshold)
+
+    def _update_query(self):
+        ast_query = self._build_select()
 
         if self._limit is not None:
             ast_query.limit = Constant(self._limit)
         self.sql = ast_query.to_string()
 
+    def _get_batch_select(self):
+        return self._build_select(), None, self._limit
+
     def insert_files(self, file_paths: List[str], params: dict = None):
         """
         Insert data from file to knowledge base
         """
-        data = {'files': file_paths}
-        if params:
-            data['params'] = params
-
         self.api.insert_into_knowledge_base(
             self.project.name,
             self.name,
-            data=data
+            data=self._files_data(file_paths, params)
         )
 
+    @staticmethod
+    def _files_data(file_paths: List[str], params: dict = None) -> dict:
+        data = {'files': file_paths}
+        if params:
+            data['params'] = params
+        return data
+
     def insert_webpages(self, urls: List[str], crawl_depth: int = 1,
                         filters: List[str] = None, limit=None, params: dict = None):
         """
@@ -150,6 +367,15 @@ class KnowledgeBase(Query):
         :param limit: max count of pages to crawl
         :param params: Runtime parameters for KB
         """
+        self.api.insert_into_knowledge_base(
+            self.project.name,
+            self.name,
+            data=self._webpages_data(urls, crawl_depth=crawl_depth, filters=filters, limit=limit, params=params)
+        )
+
+    @staticmethod
+    def _webpages_data(urls: List[str], crawl_depth: int = 1,
+                       filters: List[str] = None, limit=None, params: dict = None) -> dict:
         data={
             'urls': urls,
             'crawl_depth': crawl_depth,
@@ -158,13 +384,20 @@ class KnowledgeBase(Query):
         }
         if params:
             data['params'] = params
-        self.api.insert_into_knowledge_base(
-            self.project.name,
-            self.name,
-            data=data
-        )
+        return data
 
-    def insert(self, data: Union[pd.DataFrame, Query, dict, list], params: dict = None):
+    def insert(
+        self,
+        data: Union[pd.DataFrame, Query, dict, list],
+        params: dict = None,
+        chunk_size: int = None,
+        max_chunk_bytes: int = None,
+        max_workers: int = 1,
+        retries: int = 0,
+        target_latency: float = None,
+        on_progress: Callable[[BatchReport], None] = None,
+        resume: BatchReport = None,
+    ):
         """
         Insert data to knowledge base
 
@@ -177,31 +410,313 @@ class KnowledgeBase(Query):
         - it will be replaced
         - `id` column can be defined by id_column param, see create knowledge base
 
+        Big data is sent by chunks of MAX_INSERT_SIZE rows one after another.
+        If any of chunk parameters is passed, chunks are limited by size of json payload (`max_chunk_bytes`)
+        and several chunks can be sent at the same time:
+
+        >>> report = my_kb.insert(df, max_chunk_bytes=4 * 2**20, max_workers=4, retries=3)
+        >>> report.rows, report.throughput, report.p95
+
+        With `target_latency` count of rows in chunk is adjusted to keep time of processing of chunk near to it.
+
+        If chunk failed BatchError is raised, chunks which were not inserted can be sent again:
+
+        >>> try:
+        ...     my_kb.insert(df, max_workers=4)
+        ... except BatchError as e:
+        ...     my_kb.insert(df, max_workers=4, resume=e.report)
+
         :param data: Dataframe or Query object or dict.
         :param params: Runtime parameters for KB
+        :param chunk_size: max count of rows in chunk, default MAX_INSERT_SIZE.
+           It is initial size of chunk if target_latency is used
+        :param max_chunk_bytes: max size of json payload of chunk, default INSERT_CHUNK_BYTES
+        :param max_workers: count of chunks which are sent at the same time
+        :param retries: count of retries of failed chunk
+        :param target_latency: desired time of insert of one chunk in seconds, enables adaptive size of chunks
+        :param on_progress: function which is called with BatchReport after every chunk
+        :param resume: report of previous failed insert, completed chunks are skipped.
+           Data and chunk parameters have to be the same as in previous insert
+        :return: BatchReport if data was inserted by chunk parameters
         """
 
         if isinstance(data, Query):
             # for back compatibility
             return self.insert_query(data)
 
+        data = self._insert_data(data)
+
+        chunked = (
+            chunk_size is not None or max_chunk_bytes is not None or max_workers > 1 or retries > 0
+            or target_latency is not None or on_progress is not None or resume is not None
+        )
+        if not chunked:
+            if isinstance(data, list) and len(data) <= MAX_INSERT_SIZE:
+                return self._insert_rows(data, params)
+            for chunk, _ in self._insert_chunks(self._row_blocks(data), MAX_INSERT_SIZE):
+                self._insert_rows(chunk, params)
+            return
+
+        return self._insert_batches(
+            self._row_blocks(data, with_sizes=True),
+            params=params,
+            chunk_size=chunk_size,
+            max_chunk_bytes=max_chunk_bytes,
+            max_workers=max_workers,
+            retries=retries,
+            target_latency=target_latency,
+            on_progress=on_progress,
+            resume=resume,
+        )
+
+    @staticmethod
+    def _insert_data(data: Union[pd.DataFrame, dict, list]) -> Union[pd.DataFrame, list]:
         if isinstance(data, dict):
             data = [data]
-        elif isinstance(data, pd.DataFrame):
-            for df in split_data(data, MAX_INSERT_SIZE):
-                data = df.to_dict('records')
-                self.insert(data, params=params)
-            return
-        elif not isinstance(data, list):
+        elif not isinstance(data, (pd.DataFrame, list)):
             raise ValueError("Unknown data type, accepted types: DataFrame, Query, dict, list")
+        return data
+
+    def insert_stream(
+        self,
+        source: Union[str, os.PathLike, Iterable[Union[dict, pd.DataFrame]]],
+        params: dict = None,
+        file_format: str = None,
+        block_rows: int = INSERT_BLOCK_ROWS,
+        chunk_size: int = None,
+        max_chunk_bytes: int = None,
+        max_workers: int = 1,
+        retries: int = 0,
+        target_latency: float = None,
+        on_progress: Callable[[BatchReport], None] = None,
+        resume: BatchReport = None,
+    ) -> BatchReport:
+        """
+        Insert data to knowledge base from stream of rows, without loading all data into memory.
+
+        Source is read lazily: next rows are read only when previous chunks are sent
+        (not more than 2 * max_workers chunks are waiting to be sent).
+
+        >>> # generator of dicts
+        >>> my_kb.insert_stream({'id': i, 'content': text} for i, text in enumerate(texts))
+        >>> # reader of dataframes
+        >>> my_kb.insert_stream(pd.read_csv('docs.csv', chunksize=10000), max_workers=4)
+        >>> # file: csv, jsonl or parquet
+        >>> report = my_kb.insert_stream('docs.jsonl', max_workers=4)
+
+        Chunks are built and sent in the same way as in :func:`~mindsdb_sdk.knowledge_bases.KnowledgeBase.insert`
+
+        :param source: path to csv/jsonl/parquet file or iterable of dicts or dataframes
+        :param params: Runtime parameters for KB
+        :param file_format: format of file if it can't be defined by extension: 'csv', 'jsonl' or 'parquet'
+        :param block_rows: count of rows which are read from source at once
+        :param chunk_size: max count of rows in chunk, default MAX_INSERT_SIZE
+        :param max_chunk_bytes: max size of json payload of chunk, default INSERT_CHUNK_BYTES
+        :param max_workers: count of chunks which are sent at the same time
+        :param retries: count of retries of failed chunk
+        :param target_latency: desired time of insert of one chunk in seconds, enables adaptive size of chunks
+        :param on_progress: function which is called with BatchReport after every chunk
+        :param resume: report of previous failed insert, completed chunks are skipped.
+           Source has to be the same as in previous insert
+        :return: BatchReport
+        """
+        return self._insert_batches(
+            self._source_blocks(source, file_format, block_rows),
+            params=params,
+            chunk_size=chunk_size,
+            max_chunk_bytes=max_chunk_bytes,
+            max_workers=max_workers,
+            retries=retries,
+            target_latency=target_latency,
+            on_progress=on_progress,
+            resume=resume,
+        )
+
+    def _source_blocks(self, source: Union[str, os.PathLike, Iterable[Union[dict, pd.DataFrame]]],
+                       file_format: str = None, block_rows: int = INSERT_BLOCK_ROWS):
+        if block_rows <= 0:
+            raise ValueError('block_rows must be positive')
+
+        if isinstance(source, (str, os.PathLike)):
+            source = read_file_blocks(source, block_rows=block_rows, file_format=file_format)
+        elif isinstance(source, (pd.DataFrame, dict)):
+            raise ValueError('Use insert method to insert DataFrame or dict')
+        return self._stream_blocks(source, block_rows)
+
+    def sync(
+        self,
+        data: Union[pd.DataFrame, str, os.PathLike, Iterable[Union[dict, pd.DataFrame]]],
+        id_column: str = None,
+        delete_missing: bool = False,
+        manifest_path: str = None,
+        params: dict = None,
+        block_rows: int = INSERT_BLOCK_ROWS,
+        chunk_size: int = None,
+        max_chunk_bytes: int = None,
+        max_workers: int = 1,
+        retries: int = 0,
+        on_progress: Callable[[BatchReport], None] = None,
+    ) -> dict:
+        """
+        Incremental insert: only new and changed rows are sent to knowledge base.
 
-        # chunking a big input data
-        if len(data) > MAX_INSERT_SIZE:
-            for chunk in split_data(data, MAX_INSERT_SIZE):
-                self.insert(chunk, params=params)
+        Hashes of sent rows are kept in local manifest (sqlite file), rows of data are compared with it by id.
+        If insert failed, manifest is updated only with rows of chunks which were inserted:
+        the next synchronization sends only rows which failed.
+
+        >>> stats = my_kb.sync(pd.read_csv('docs.csv'), id_column='doc_id', delete_missing=True)
+        >>> stats['inserted'], stats['unchanged'], stats['deleted']
+
+        Data can be a stream, like in :func:`~mindsdb_sdk.knowledge_bases.KnowledgeBase.insert_stream`:
+
+        >>> my_kb.sync('docs.jsonl', id_column='doc_id', max_workers=4)
+
+        :param data: dataframe, path to csv/jsonl/parquet file or iterable of dicts or dataframes
+        :param id_column: column with unique id of row, default is id_column of knowledge base or 'id'
+        :param delete_missing: delete from knowledge base ids which were synced before but are absent in data
+        :param manifest_path: path to manifest file, default is file in ~/.mindsdb_sdk/sync/<project>/
+        :param params: Runtime parameters for KB
+        :param block_rows: count of rows which are read and compared with manifest at once
+        :param chunk_size: max count of rows in chunk, default MAX_INSERT_SIZE
+        :param max_chunk_bytes: max size of json payload of chunk, default INSERT_CHUNK_BYTES
+        :param max_workers: count of chunks which are sent at the same time
+        :param retries: count of retries of failed chunk
+        :param on_progress: function which is called with BatchReport after every chunk
+        :return: dict with counts of rows: inserted, unchanged, deleted and BatchReport of insert in 'report'
+        """
+        id_column, manifest_path = self._sync_options(id_column, manifest_path, block_rows)
+
+        stats = {'inserted': 0, 'unchanged': 0, 'deleted': 0}
+
+        with SyncManifest(manifest_path) as manifest:
+            try:
+                stats['report'] = self._insert_batches(
+                    self._changed_blocks(data, id_column, block_rows, manifest, stats),
+                    params=params,
+                    chunk_size=chunk_size,
+                    max_chunk_bytes=max_chunk_bytes,
+                    max_workers=max_workers,
+                    retries=retries,
+                    on_progress=on_progress,
+                    keep_ids=id_column,
+                )
+            except BatchError as e:
+                self._commit_inserted(manifest, e.report)
+                raise
+            except Exception:
+                manifest.reset()
+                raise
+
+            deleted = []
+            if delete_missing:
+                deleted = manifest.missing()
+                try:
+                    self._delete_ids(deleted)
+                except Exception:
+                    # all changed rows were inserted
+                    manifest.commit()
+                    raise
+                stats['deleted'] = len(deleted)
+
+            manifest.commit(deleted)
+        return stats
+
+    def _sync_options(self, id_column: str = None, manifest_path: str = None,
+                      block_rows: int = INSERT_BLOCK_ROWS) -> Tuple[str, str]:
+        if block_rows <= 0:
+            raise ValueError('block_rows must be positive')
+        if id_column is None:
+            id_column = self.id_column or 'id'
+        if manifest_path is None:
+            manifest_path = default_manifest_path(getattr(self.api, 'url', None), self.project.name, self.name)
+        return id_column, manifest_path
+
+    def _changed_blocks(self, data, id_column: str, block_rows: int, manifest: SyncManifest,
+                        stats: dict) -> Iterator[Tuple[List[dict], List[int]]]:
+        # rows which are not in manifest or changed, counts of rows are added to stats
+        for df in self._frame_blocks(data, block_rows):
+            if id_column not in df.columns:
+                raise ValueError(f'Column {id_column} is not found in data')
+            ids = df[id_column].astype(str).tolist()
+            mask = manifest.changed(ids, content_hashes(df))
+            df = df[mask]
+            stats['inserted'] += len(df)
+            stats['unchanged'] += len(mask) - len(df)
+            if len(df) > 0:
+                yield from self._row_blocks(df, with_sizes=True)
+
+    @staticmethod
+    def _commit_inserted(manifest: SyncManifest, report: BatchReport):
+        # keep rows of successful chunks
+        manifest.commit(ids=(
+            str(i) for num in report.completed for i in report.results[num]
+        ))
+
+    def _delete_ids(self, ids: List[str]):
+        for chunk in split_data(ids, MAX_INSERT_SIZE):
+            self.api.sql_query(self._delete_ids_sql(chunk))
+        self._invalidate_deleted(ids)
+
+    def _delete_ids_sql(self, ids: List[str]) -> str:
+        ast_query = Delete(
+            table=self.table_name,
+            where=BinaryOperation(op='in', args=[Identifier('id'), TupleNode(items=[Constant(i) for i in ids])])
+        )
+        return ast_query.to_string()
+
+    def _invalidate_deleted(self, ids: List[str]):
+        search_cache = self._search_cache()
+        if ids and search_cache is not None:
+            search_cache.invalidate_kb(self.project.name, self.name)
+
+    @staticmethod
+    def _frame_blocks(data: Union[pd.DataFrame, str, os.PathLike, Iterable[Union[dict, pd.DataFrame]]],
+                      block_rows: int) -> Iterator[pd.DataFrame]:
+        # data as dataframes with up to block_rows rows
+        if isinstance(data, pd.DataFrame):
+            yield from split_data(data, block_rows)
             return
+        if isinstance(data, (str, os.PathLike)):
+            data = read_file_blocks(data, block_rows=block_rows)
+        rows = []
+        for item in data:
+            if isinstance(item, pd.DataFrame):
+                if rows:
+                    yield pd.DataFrame(rows)
+                    rows = []
+                yield from split_data(item, block_rows)
+            elif isinstance(item, dict):
+                rows.append(item)
+                if len(rows) >= block_rows:
+                    yield pd.DataFrame(rows)
+                    rows = []
+            else:
+                raise ValueError(f'Unknown type of item in stream: {type(item).__name__}, accepted types: dict, DataFrame')
+        if rows:
+            yield pd.DataFrame(rows)
+
+    def _stream_blocks(self, source: Iterable[Union[dict, pd.DataFrame]],
+                       block_rows: int) -> Iterator[Tuple[List[dict], List[int]]]:
+        # dataframes are passed as they are, dicts are grouped to blocks
+        rows = []
+        for item in source:
+            if isinstance(item, pd.DataFrame):
+                if rows:
+                    yield from self._row_blocks(rows, with_sizes=True)
+                    rows = []
+                yield from self._row_blocks(item, with_sizes=True)
+            elif isinstance(item, dict):
+                rows.append(item)
+                if len(rows) >= block_rows:
+                    yield from self._row_blocks(rows, with_sizes=True)
+                    rows = []
+            else:
+                raise ValueError(f'Unknown type of item in stream: {type(item).__name__}, accepted types: dict, DataFrame')
+        if rows:
+            yield from self._row_blocks(rows, with_sizes=True)
 
-        data = {'rows': data}
+    def _insert_rows(self, rows: List[dict], params: dict = None):
+        data = {'rows': rows}
         if params:
             data['params'] = params
         return self.api.insert_into_knowledge_base(
@@ -210,6 +725,122 @@ class KnowledgeBase(Query):
             data=data,
         )
 
+    def _insert_batches(
+        self,
+        blocks: Iterable[Tuple[List[dict], List[int]]],
+        params: dict = None,
+        chunk_size: int = None,
+        max_chunk_bytes: int = None,
+        max_workers: int = 1,
+        retries: int = 0,
+        target_latency: float = None,
+        on_progress: Callable[[BatchReport], None] = None,
+        resume: BatchReport = None,
+        keep_ids: str = None,
+    ) -> BatchReport:
+        # keep_ids: name of id column, its values in inserted chunks are kept in results of report
+        chunk_size, max_chunk_bytes, adaptive = self._chunk_options(chunk_size, max_chunk_bytes,
+                                                                    target_latency, resume)
+
+        def insert_chunk(rows):
+            start = time.monotonic()
+            ret = self._insert_rows(rows, params)
+            if adaptive is not None:
+                adaptive.update(len(rows), time.monotonic() - start)
+            if keep_ids is not None:
+                return [row.get(keep_ids) for row in rows]
+            return ret
+
+        if max_workers > 1:
+            self.api.set_pool_size(max_workers)
+
+        skip = None
+        if resume is not None:
+            skip = resume.completed
+
+        report = process_chunks(
+            insert_chunk,
+            self._insert_chunks(blocks, chunk_size, max_chunk_bytes),
+            max_workers=max_workers,
+            retries=retries,
+            on_progress=on_progress,
+            skip=skip,
+            keep_results=keep_ids is not None,
+            report=resume,
+        )
+        return self._insert_report(report)
+
+    @staticmethod
+    def _chunk_options(chunk_size: int = None, max_chunk_bytes: int = None, target_latency: float = None,
+                       resume: BatchReport = None) -> Tuple[Union[int, AdaptiveChunkSize], int, AdaptiveChunkSize]:
+        # returns chunk size (fixed or adaptive), max size of chunk in bytes and adaptive size if it is used
+        if chunk_size is not None and chunk_size <= 0:
+            raise ValueError('chunk_size must be positive')
+        if target_latency is not None and resume is not None:
+            # chunks are different in every run with adaptive size
+            raise ValueError("resume can't be used with target_latency")
+
+        if chunk_size is None:
+            chunk_size = MAX_INSERT_SIZE
+        if max_chunk_bytes is None:
+            max_chunk_bytes = INSERT_CHUNK_BYTES
+
+        adaptive = None
+        if target_latency is not None:
+            adaptive = AdaptiveChunkSize(chunk_size, target_latency)
+            chunk_size = adaptive
+        return chunk_size, max_chunk_bytes, adaptive
+
+    @staticmethod
+    def _insert_report(report: BatchReport) -> BatchReport:
+        if report.failed:
+            num = report.resume_from
+            raise BatchError(f'Insert of chunk {num} failed: {report.failed[num]}', report)
+        return report
+
+    @staticmethod
+    def _row_blocks(data: Union[pd.DataFrame, list], with_sizes: bool = False) -> Iterator[Tuple[List[dict], List[int]]]:
+        # yields blocks of (records, sizes of records in json), sizes are None if with_sizes is False
+        for block in split_data(data, INSERT_BLOCK_ROWS):
+            if isinstance(block, pd.DataFrame):
+                rows = block.to_dict('records')
+                sizes = None
+                if with_sizes:
+                    # json lines are escaped: every row is one line.
+                    # to_json is compact, json of request has spaces after ':' and ','
+                    lines = block.to_json(orient='records', lines=True, default_handler=str)
+                    spaces = max(0, 2 * len(block.columns) - 1)
+                    sizes = [len(line.encode()) + spaces for line in lines.splitlines()]
+            else:
+                rows = block
+                sizes = None
+                if with_sizes:
+                    sizes = [len(json.dumps(row, default=str).encode()) for row in rows]
+            yield rows, sizes
+
+    @staticmethod
+    def _insert_chunks(blocks: Iterable[Tuple[List[dict], List[int]]], chunk_size: Union[int, Callable[[], int]],
+                       max_chunk_bytes: int = None) -> Iterator[Tuple[List[dict], int]]:
+        # groups rows to chunks, yields (rows, count of rows)
+        # chunk_size can be a function: it is called before every row to get actual size of chunk
+        chunk, chunk_bytes = [], 0
+        for rows, sizes in blocks:
+            if sizes is None:
+                sizes = [0] * len(rows)
+            for row, size in zip(rows, sizes):
+                limit = chunk_size() if callable(chunk_size) else chunk_size
+                if chunk and (
+                    len(chunk) >= limit
+                    or max_chunk_bytes is not None and chunk_bytes + size > max_chunk_bytes
+                ):
+                    yield chunk, len(chunk)
+                    chunk, chunk_bytes = [], 0
+                chunk.append(row)
+                # separator between rows
+                chunk_bytes += size + 2
+        if chunk:
+            yield chunk, len(chunk)
+
     def insert_query(self, data: Query, params: dict = None):
         """
         Insert data to knowledge base using query
@@ -223,28 +854,35 @@ class KnowledgeBase(Query):
         :param params: Runtime parameters for KB
         """
         if is_saving():
-            # generate insert from select query
-            if data.database is not None:
-                ast_query = Insert(
-                    table=self.table_name,
-                    from_select=query_to_native_query(data)
-                )
-                sql = ast_query.to_string()
-            else:
-                sql = f'INSERT INTO {self.table_name.to_string()} ({data.sql})'
+            return self._insert_query_sql(data)
 
-            # don't execute it right now, return query object
-            return Query(self, sql, self.database)
+        self.api.insert_into_knowledge_base(
+            self.project.name,
+            self.name,
+            data=self._query_data(data, params)
+        )
 
+    def _insert_query_sql(self, data: Query) -> Query:
+        # generate insert from select query
+        if data.database is not None:
+            ast_query = Insert(
+                table=self.table_name,
+                from_select=query_to_native_query(data)
+            )
+            sql = ast_query.to_string()
+        else:
+            sql = f'INSERT INTO {self.table_name.to_string()} ({data.sql})'
+
+        # don't execute it right now, return query object
+        return Query(self, sql, self.database)
+
+    @staticmethod
+    def _query_data(data: Query, params: dict = None) -> dict:
         # query have to be in context of mindsdb project
         data = {'query': data.sql}
         if params:
             data['params'] = params
-        self.api.insert_into_knowledge_base(
-            self.project.name,
-            self.name,
-            data=data
-        )
+        return data
 
 
 class KnowledgeBases(CollectionBase):
@@ -272,6 +910,8 @@ class KnowledgeBases(CollectionBase):
 
     """
 
+    _knowledge_base_class = KnowledgeBase
+
     def __init__(self, project, api):
         self.project = project
         self.api = api
@@ -287,7 +927,7 @@ class KnowledgeBases(CollectionBase):
         """
 
         return [
-            KnowledgeBase(self.api, self.project, item)
+            self._knowledge_base_class(self.api, self.project, item)
             for item in self.api.list_knowledge_bases(self.project.name)
         ]
 
@@ -300,7 +940,7 @@ class KnowledgeBases(CollectionBase):
         """
 
         data = self.api.get_knowledge_base(self.project.name, name)
-        return KnowledgeBase(self.api, self.project, data)
+        return self._knowledge_base_class(self.api, self.project, data)
 
     def create(
         self,
@@ -338,7 +978,23 @@ class KnowledgeBases(CollectionBase):
         :param params: other parameters to knowledge base
         :return: created KnowledgeBase object
         """
+        payload = self._create_payload(name, embedding_model, reranking_model, storage, metadata_columns,
+                                       content_columns, id_column, params)
+        self.api.create_knowledge_base(self.project.name, data=payload)
 
+        return self.get(name)
+
+    @staticmethod
+    def _create_payload(
+        name: str,
+        embedding_model: dict = None,
+        reranking_model: dict = None,
+        storage: Table = None,
+        metadata_columns: list = None,
+        content_columns: list = None,
+        id_column: str = None,
+        params: dict = None,
+    ) -> dict:
         payload = {
             'name': name,
         }
@@ -361,10 +1017,7 @@ class KnowledgeBases(CollectionBase):
                 'database': storage.db.name,
                 'table': storage.name
             }
-
-        self.api.create_knowledge_base(self.project.name, data=payload)
-
-        return self.get(name)
+        return payload
 
     def drop(self, name: str):
         """
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
-from typing import List, Union
+from typing import Dict, List, Union
 
-from mindsdb_sql_parser.ast import Show, Identifier
+from mindsdb_sql_parser.ast import Show, Identifier, BinaryOperation, Constant
 from mindsdb_sql_parser.ast.mindsdb import CreateMLEngine, DropMLEngine
 
 from mindsdb_sdk.utils.objects_collection import CollectionBase
@@ -68,9 +68,30 @@ class MLEngines(CollectionBase):
         :return: list of ml engines
         """
 
-        ast_query = Show(category='ml_engines')
+        return list(self._list_engines().values())
 
-        df = self.api.sql_query(ast_query.to_string())
+    def _list_engines(self) -> Dict[str, MLEngine]:
+        return self._metadata_index(self._load_engines)
+
+    def _load_engines(self) -> Dict[str, MLEngine]:
+        df = self.api.sql_query(self._list_sql())
+        return self._index_engines(self._engines_from_df(df))
+
+    @staticmethod
+    def _index_engines(engines: List[MLEngine]) -> Dict[str, MLEngine]:
+        return {item.name: item for item in engines}
+
+    @staticmethod
+    def _list_sql(name: str = None) -> str:
+        where = None
+        if name is not None:
+            # lookup of one engine
+            where = BinaryOperation(op='=', args=[Identifier('name'), Constant(name)])
+        ast_query = Show(category='ml_engines', where=where)
+        return ast_query.to_string()
+
+    @staticmethod
+    def _engines_from_df(df) -> List[MLEngine]:
         # columns to lower case
         cols_map = {i: i.lower() for i in df.columns}
         df = df.rename(columns=cols_map)
@@ -88,10 +109,13 @@ class MLEngines(CollectionBase):
         :return: ml engine object
         """
         name = name.lower()
-        for item in self.list():
-            if item.name == name:
-                return item
-        raise AttributeError(f"MLEngine doesn't exist {name}")
+        if self._metadata_cache() is not None:
+            engines = self._list_engines()
+        else:
+            engines = self._index_engines(self._engines_from_df(self.api.sql_query(self._list_sql(name))))
+        if name not in engines:
+            raise AttributeError(f"MLEngine doesn't exist {name}")
+        return engines[name]
 
     def create(self, name: str, handler: Union[str, Handler], connection_data: dict = None) -> MLEngine:
         """
@@ -109,6 +133,7 @@ class MLEngines(CollectionBase):
         ast_query = CreateMLEngine(Identifier(name), handler, params=connection_data)
 
         self.api.sql_query(ast_query.to_string())
+        self._invalidate_metadata()
 
         return MLEngine(name, handler, connection_data)
 
@@ -128,6 +153,7 @@ class MLEngines(CollectionBase):
             requirements = '\n'.join(requirements)
 
         self.api.upload_byom(name, code, requirements)
+        self._invalidate_metadata()
 
         return MLEngine(name, 'byom', {})
 
@@ -140,4 +166,5 @@ class MLEngines(CollectionBase):
         ast_query = DropMLEngine(Identifier(name))
 
         self.api.sql_query(ast_query.to_string())
+        self._invalidate_metadata()
 
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import random
 import time
-from typing import List, Union
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
 
 import pandas as pd
 
 from mindsdb_sql_parser.ast.mindsdb import CreatePredictor, DropPredictor
 from mindsdb_sql_parser.ast.mindsdb import RetrainPredictor, FinetunePredictor
 from mindsdb_sql_parser.ast import Identifier, Select, Star, Join, Describe, Set
+from mindsdb_sql_parser.ast import BinaryOperation, Constant, Tuple
 from mindsdb_sql_parser import parse_sql
 from mindsdb_sql_parser.exceptions import ParsingException
 
@@ -16,9 +18,42 @@ from .ml_engines import MLEngine
 from mindsdb_sdk.utils.objects_collection import CollectionBase
 from mindsdb_sdk.utils.sql import dict_to_binary_op, query_to_native_query
 from mindsdb_sdk.utils.context import is_saving
+from mindsdb_sdk.utils.batch import BatchReport, BatchError, process_chunks
 
 from .query import Query
 
+# statuses of model which is not ready yet
+TRAINING_STATUSES = ('generating', 'training')
+
+# columns of models table which are used to check status of training
+STATUS_COLUMNS = ('NAME', 'VERSION', 'ACTIVE', 'STATUS', 'ERROR')
+
+
+def _poll_delays(min_interval: float, max_interval: float, backoff: float) -> Iterator[float]:
+    # exponentially growing delays between polls, with jitter:
+    # clients which started waiting at the same time don't poll server at the same moments
+    if min_interval <= 0 or max_interval < min_interval:
+        raise ValueError('Wrong polling intervals')
+    if backoff < 1:
+        raise ValueError('backoff must be >= 1')
+    interval = min_interval
+    while True:
+        yield interval / 2 + random.uniform(0, interval / 2)
+        interval = min(interval * backoff, max_interval)
+
+
+def _match_status(model, rows: List[dict]) -> dict:
+    # find row of the model in result of status query:
+    #   the active version for Model, the exact version for ModelVersion
+    rows = [row for row in rows if row.get('name') == model.name]
+    if model.version is not None:
+        rows = [row for row in rows if row.get('version') is not None and int(row['version']) == model.version]
+    elif any('active' in row for row in rows):
+        rows = [row for row in rows if str(row.get('active')).lower() in ('1', 'true')]
+    if len(rows) == 0:
+        return None
+    return rows[0]
+
 
 class Model:
     """
@@ -115,7 +150,16 @@ class Model:
             parts.append(str(self.version))
         return Identifier(parts=parts)
 
-    def predict(self, data: Union[pd.DataFrame, Query, dict], params: dict = None) -> Union[pd.DataFrame, Query]:
+    def predict(
+        self,
+        data: Union[pd.DataFrame, Query, dict],
+        params: dict = None,
+        batch_size: int = None,
+        max_workers: int = 1,
+        retries: int = 0,
+        on_progress: Callable[[BatchReport], None] = None,
+        cache: bool = True,
+    ) -> Union[pd.DataFrame, Query]:
         """
         Make prediction using model
 
@@ -128,111 +172,208 @@ class Model:
         if data is select from join other complex query it modifies query to:
           'select from (input query) join model' and sends it over sql/query http method
 
+        Big dataframe can be sent by batches, batches are predicted concurrently.
+        Rows of result are in the same order as rows of input dataframe
+
+        If prediction cache is enabled (see :meth:`~mindsdb_sdk.server.Server.enable_prediction_cache`),
+        only rows which were not predicted recently are sent to model
+
+        >>> def show_progress(report):
+        ...     print(f'{report.rows} rows, {report.throughput:.0f} rows/s')
+        >>> result = model.predict(df, batch_size=10000, max_workers=4, retries=3, on_progress=show_progress)
+
         :param data: dataframe or Query object as input to predictor
         :param params: parameters for predictor, optional
+        :param batch_size: max count of rows of dataframe which are sent in one request, optional
+        :param max_workers: count of batches which are predicted at the same time
+        :param retries: count of retries of failed batch
+        :param on_progress: function which is called with BatchReport after every batch
+        :param cache: use prediction cache if it is enabled
         :return: dataframe with result of prediction
         """
 
         if isinstance(data, Query):
-            # create join from select if it is simple select
-            try:
-                ast_query = parse_sql(data.sql, dialect='mindsdb')
-            except ParsingException:
-                ast_query = None
-
-            # injection of join disabled yet
-            # if isinstance(ast_query, Select) and isinstance(ast_query.from_table, Identifier):
-            #     # inject aliases
-            #     if ast_query.from_table.alias is None:
-            #         alias = 't'
-            #         ast_query.from_table.alias = Identifier(alias)
-            #     else:
-            #         alias = ast_query.from_table.alias.parts[-1]
-            #
-            #     def inject_alias(node, is_table, **kwargs):
-            #         if not is_table:
-            #             if isinstance(node, Identifier):
-            #                 if node.parts[0] != alias:
-            #                     node.parts.insert(0, alias)
-            #
-            #     query_traversal(ast_query, inject_alias)
-            #
-            #     # replace table with join
-            #     model_identifier = self._get_identifier()
-            #     model_identifier.alias = Identifier('m')
-            #
-            #     ast_query.from_table = Join(
-            #         join_type='join',
-            #         left=ast_query.from_table,
-            #         right=model_identifier
-            #     )
-            #
-            #     # select only model columns
-            #     ast_query.targets = [Identifier(parts=['m', Star()])]
-            #
-
-            model_identifier = self._get_identifier()
-            model_identifier.alias = Identifier('m')
-
-            if data.database is not None or ast_query is None or not isinstance(ast_query, Select):
-                # use native query
-                native_query = query_to_native_query(data)
-                native_query.parentheses = True
-                native_query.alias = Identifier('t')
-                upper_query = Select(
-                    targets=[Identifier(parts=['m', Star()])],
-                    from_table=Join(
-                        join_type='join',
-                        left=native_query,
-                        right=model_identifier
-                    )
-                )
-            else:
-                # wrap query to subselect
-                model_identifier = self._get_identifier()
-                model_identifier.alias = Identifier('m')
-
-                ast_query.parentheses = True
-                ast_query.alias = Identifier('t')
-                upper_query = Select(
-                    targets=[Identifier(parts=['m', Star()])],
-                    from_table=Join(
-                        join_type='join',
-                        left=ast_query,
-                        right=model_identifier
-                    )
-                )
-            if params is not None:
-                upper_query.using = params
-            # execute in query's database
-            sql = upper_query.to_string()
+            sql = self._predict_sql(data, params)
             if is_saving():
                 return Query(self, sql)
 
+            # execute in query's database
             return self.project.api.sql_query(sql, database=None)
 
         elif isinstance(data, dict):
             data = pd.DataFrame([data])
-            return self.project.api.model_predict(self.project.name, self.name, data,
-                                                  params=params, version=self.version)
+            return self._model_predict(data, params, cache)
         elif isinstance(data, pd.DataFrame):
-            return self.project.api.model_predict(self.project.name, self.name, data,
-                                                  params=params, version=self.version)
+            if batch_size is not None:
+                return self._predict_batches(data, params, batch_size, max_workers, retries, on_progress, cache)
+            return self._model_predict(data, params, cache)
         else:
             raise ValueError('Unknown input')
 
-    def wait_complete(self):
+    def _prediction_cache(self):
+        return getattr(self.project.api, 'prediction_cache', None)
+
+    def _invalidate_predictions(self):
+        # model is changed
+        cache = self._prediction_cache()
+        if cache is not None:
+            cache.invalidate_model(self.project.name, self.name)
+
+    def _model_predict(self, data: pd.DataFrame, params: dict = None, cache: bool = True) -> pd.DataFrame:
+        api = self.project.api
+
+        def predict(df):
+            return api.model_predict(self.project.name, self.name, df, params=params, version=self.version)
+
+        prediction_cache = self._prediction_cache()
+        if prediction_cache is None or not cache:
+            return predict(data)
+        return prediction_cache.predict(data, predict, self.project.name, self.name, self.version, params)
+
+    @staticmethod
+    def _batches(data: pd.DataFrame, batch_size: int) -> Iterable[tuple]:
+        if batch_size <= 0:
+            raise ValueError('batch_size must be positive')
+        return (
+            (data.iloc[start: start + batch_size], min(batch_size, len(data) - start))
+            for start in range(0, len(data), batch_size)
+        )
+
+    @staticmethod
+    def _batches_result(report: BatchReport) -> Optional[pd.DataFrame]:
+        if report.failed:
+            num = report.resume_from
+            raise BatchError(f'Prediction of batch {num} failed: {report.failed[num]}', report)
+
+        if not report.results:
+            # empty dataframe
+            return None
+        # results are numbered in order of batches
+        return pd.concat([report.results[num] for num in sorted(report.results)], ignore_index=True)
+
+    def _predict_batches(self, data: pd.DataFrame, params: dict, batch_size: int, max_workers: int,
+                         retries: int, on_progress: Callable, cache: bool = True) -> pd.DataFrame:
+        batches = self._batches(data, batch_size)
+
+        api = self.project.api
+        if max_workers > 1:
+            api.set_pool_size(max_workers)
+
+        def predict_batch(batch):
+            return self._model_predict(batch, params, cache)
+
+        report = process_chunks(
+            predict_batch,
+            batches,
+            max_workers=max_workers,
+            retries=retries,
+            on_progress=on_progress,
+            keep_results=True,
+        )
+        result = self._batches_result(report)
+        if result is None:
+            return predict_batch(data)
+        return result
+
+    def _predict_sql(self, data: Query, params: dict = None) -> str:
+        # create join from select if it is simple select
+        try:
+            ast_query = parse_sql(data.sql, dialect='mindsdb')
+        except ParsingException:
+            ast_query = None
+
+        # injection of join disabled yet
+        # if isinstance(ast_query, Select) and isinstance(ast_query.from_table, Identifier):
+        #     # inject aliases
+        #     if ast_query.from_table.alias is None:
+        #         alias = 't'
+        #         ast_query.from_table.alias = Identifier(alias)
+        #     else:
+        #         alias = ast_query.from_table.alias.parts[-1]
+        #
+        #     def inject_alias(node, is_table, **kwargs):
+        #         if not is_table:
+        #             if isinstance(node, Identifier):
+        #                 if node.parts[0] != alias:
+        #                     node.parts.insert(0, alias)
+        #
+        #     query_traversal(ast_query, inject_alias)
+        #
+        #     # replace table with join
+        #     model_identifier = self._get_identifier()
+        #     model_identifier.alias = Identifier('m')
+        #
+        #     ast_query.from_table = Join(
+        #         join_type='join',
+        #         left=ast_query.from_table,
+        #         right=model_identifier
+        #     )
+        #
+        #     # select only model columns
+        #     ast_query.targets = [Identifier(parts=['m', Star()])]
+        #
+
+        model_identifier = self._get_identifier()
+        model_identifier.alias = Identifier('m')
+
+        if data.database is not None or ast_query is None or not isinstance(ast_query, Select):
+            # use native query
+            native_query = query_to_native_query(data)
+            native_query.parentheses = True
+            native_query.alias = Identifier('t')
+            upper_query = Select(
+                targets=[Identifier(parts=['m', Star()])],
+                from_table=Join(
+                    join_type='join',
+                    left=native_query,
+                    right=model_identifier
+                )
+            )
+        else:
+            # wrap query to subselect
+            model_identifier = self._get_identifier()
+            model_identifier.alias = Identifier('m')
+
+            ast_query.parentheses = True
+            ast_query.alias = Identifier('t')
+            upper_query = Select(
+                targets=[Identifier(parts=['m', Star()])],
+                from_table=Join(
+                    join_type='join',
+                    left=ast_query,
+                    right=model_identifier
+                )
+            )
+        if params is not None:
+            upper_query.using = params
+        return upper_query.to_string()
 
-        for i in range(400):
-            time.sleep(0.3)
+    def wait_complete(self, timeout: float = None, min_interval: float = 0.3, max_interval: float = 10,
+                      backoff: float = 1.5):
+        """
+        Wait until model is trained.
 
-            status = self.get_status()
-            if status in ('generating', 'training'):
-                continue
-            elif status == 'error':
-                raise RuntimeError(f'Training failed: {self.data["error"]}')
-            else:
-                break
+        Only status of model is requested from server while waiting, the delay between requests grows exponentially
+        (with random jitter) from min_interval to max_interval. Model data is refreshed when training is finished.
+
+        >>> model.wait_complete(timeout=3600)
+
+        :param timeout: maximum time of waiting in seconds, unlimited by default
+        :param min_interval: delay before the first request of status, in seconds
+        :param max_interval: maximum delay between requests of status, in seconds
+        :param backoff: multiplier of delay after every request
+        :raises RuntimeError: training failed
+        :raises TimeoutError: model isn't trained in timeout
+        """
+        for _ in self.project.models.wait_all(
+            [self], timeout=timeout, min_interval=min_interval, max_interval=max_interval, backoff=backoff
+        ):
+            pass
+
+        if self.data.get('status') == 'error':
+            raise RuntimeError(f'Training failed: {self.data.get("error")}')
+        self.refresh()
+        self._invalidate_predictions()
 
     def get_status(self) -> str:
         """
@@ -250,7 +391,14 @@ class Model:
 
         :return: model data
         """
-        model = self.project.get_model(self.name, self.version)
+        if self.version is None:
+            # actual status, not from metadata cache
+            models = self.project.list_models(name=self.name)
+            if len(models) == 0:
+                raise AttributeError("Model doesn't exist")
+            model = models[0]
+        else:
+            model = self.project.get_model(self.name, self.version)
         self.data = model.data
         return self.data
 
@@ -296,6 +444,19 @@ class Model:
                  database:str = None,
                  options:dict = None,
                  engine:str = None):
+        sql = self._retrain_sql(ast_class, query=query, database=database, options=options, engine=engine)
+
+        if is_saving():
+            return Query(self, sql)
+
+        return self._retrained_model(self.project.api.sql_query(sql))
+
+    def _retrain_sql(self,
+                     ast_class,
+                     query: Union[str, Query] = None,
+                     database: str = None,
+                     options: dict = None,
+                     engine: str = None) -> str:
         if isinstance(query, Query):
             database = query.database
             query = query.sql
@@ -316,13 +477,16 @@ class Model:
             integration_name=database,
             using=options or None,
         )
-        sql = ast_query.to_string()
+        return ast_query.to_string()
 
-        if is_saving():
-            return Query(self, sql)
-
-        data = self.project.api.sql_query(sql)
+    def _retrained_model(self, data: pd.DataFrame) -> Union[Model, ModelVersion]:
+        if isinstance(data, pd.DataFrame) and len(data) > 0:
+            # row of new version
+            data = dict(data.iloc[0])
         data = {k.lower(): v for k, v in data.items()}
+        # active version is changed
+        self.project.models._invalidate_metadata()
+        self._invalidate_predictions()
 
         # return new instance
         base_class = self.__class__
@@ -389,17 +553,22 @@ class Model:
 
         :param version: version to set active
         """
-        ast_query = Set(
-            category='active',
-            value=Identifier(parts=[self.project.name, self.name, str(version)])
-        )
-        sql = ast_query.to_string()
+        sql = self._set_active_sql(version)
         if is_saving():
             return Query(self, sql)
 
         self.project.api.sql_query(sql)
+        self.project.models._invalidate_metadata()
+        self._invalidate_predictions()
         self.refresh()
 
+    def _set_active_sql(self, version: int) -> str:
+        ast_query = Set(
+            category='active',
+            value=Identifier(parts=[self.project.name, self.name, str(version)])
+        )
+        return ast_query.to_string()
+
 
 class ModelVersion(Model):
     def __init__(self, project, data):
@@ -431,6 +600,9 @@ class Models(CollectionBase):
 
     """
 
+    _model_class = Model
+    _model_version_class = ModelVersion
+
     def __init__(self, project, api):
         self.project = project
         self.api = api
@@ -485,6 +657,26 @@ class Models(CollectionBase):
         :param timeseries_options: parameters for forecasting model
         :return: created Model object, it can be still in training state
         """
+        sql = self._create_sql(name, predict=predict, engine=engine, query=query, database=database,
+                               options=options, timeseries_options=timeseries_options, **kwargs)
+
+        if is_saving():
+            return Query(self, sql)
+
+        df = self.project.api.sql_query(sql)
+        self._invalidate_metadata()
+        return self._created_model(df)
+
+    def _create_sql(
+        self,
+        name: str,
+        predict: str = None,
+        engine: Union[str, MLEngine] = None,
+        query: Union[str, Query] = None,
+        database: str = None,
+        options: dict = None,
+        timeseries_options: dict = None, **kwargs
+    ) -> str:
         if isinstance(query, Query):
             database = query.database
             query = query.sql
@@ -537,18 +729,15 @@ class Models(CollectionBase):
             options['engine'] = engine
         ast_query.using = options
 
-        sql = ast_query.to_string()
-
-        if is_saving():
-            return Query(self, sql)
+        return ast_query.to_string()
 
-        df = self.project.api.sql_query(sql)
+    def _created_model(self, df: pd.DataFrame) -> Model:
         if len(df) > 0:
             data = dict(df.iloc[0])
             # to lowercase
             data = {k.lower(): v for k,v in data.items()}
 
-            return Model(self.project, data)
+            return self._model_class(self.project, data)
 
     def get(self, name: str, version: int = None) -> Union[Model, ModelVersion]:
         """
@@ -562,6 +751,10 @@ class Models(CollectionBase):
         """
         if version is not None:
             ret = self.list(with_versions=True, name=name, version=version)
+        elif self._metadata_cache() is not None:
+            # use index of active models
+            models = self._metadata_index(self._load_models)
+            ret = [models[name]] if name in models else []
         else:
             ret = self.list(name=name)
         if len(ret) == 0:
@@ -579,13 +772,115 @@ class Models(CollectionBase):
 
         :param name: name of the model
         """
-        ast_query = DropPredictor(name=Identifier(parts=[self.project.name, name]))
-        sql = ast_query.to_string()
+        sql = self._drop_sql(name)
         if is_saving():
             return Query(self, sql)
 
         self.project.api.sql_query(sql)
+        self._invalidate_dropped(name)
+
+    def _drop_sql(self, name: str) -> str:
+        ast_query = DropPredictor(name=Identifier(parts=[self.project.name, name]))
+        return ast_query.to_string()
 
+    def _invalidate_dropped(self, name: str):
+        self._invalidate_metadata()
+        prediction_cache = getattr(self.api, 'prediction_cache', None)
+        if prediction_cache is not None:
+            prediction_cache.invalidate_model(self.project.name, name)
+
+    def wait_all(self, models: Iterable[Model], timeout: float = None, min_interval: float = 0.3,
+                 max_interval: float = 10, backoff: float = 1.5) -> Iterator[Model]:
+        """
+        Wait for training of several models.
+
+        Statuses of all models are requested with one query, models are yielded as soon as their training is finished.
+        Status of yielded model is 'complete' or 'error', information about error is in model.data['error'].
+        The delay between queries grows exponentially, see :func:`~mindsdb_sdk.models.Model.wait_complete`
+
+        >>> for model in project.models.wait_all([model1, model2], timeout=3600):
+        ...     print(model.name, model.data['status'])
+
+        :param models: list of Model or ModelVersion objects
+        :param timeout: maximum time of waiting in seconds, unlimited by default
+        :param min_interval: delay before the first query, in seconds
+        :param max_interval: maximum delay between queries, in seconds
+        :param backoff: multiplier of delay after every query
+        :raises TimeoutError: some models aren't trained in timeout
+        :return: iterator of models in order of finishing of training
+        """
+        pending = list(models)
+        delays = _poll_delays(min_interval, max_interval, backoff)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while pending:
+            delay = next(delays)
+            if deadline is not None:
+                remains = deadline - time.monotonic()
+                if remains <= 0:
+                    names = ', '.join(model.name for model in pending)
+                    raise TimeoutError(f'Models are not trained in {timeout} seconds: {names}')
+                delay = min(delay, remains)
+            time.sleep(delay)
+
+            rows = self._fetch_statuses(pending)
+            still_pending = []
+            for model in pending:
+                if self._update_status(model, rows) in TRAINING_STATUSES:
+                    still_pending.append(model)
+                else:
+                    yield model
+            pending = still_pending
+
+    def _fetch_statuses(self, models: List[Model]) -> List[dict]:
+        # one query for models of every project
+        by_project = {}
+        for model in models:
+            by_project.setdefault(model.project.name, (model.project, set()))[1].add(model.name)
+
+        rows = []
+        for project, names in by_project.values():
+            df = project.query(self._status_sql(names)).fetch(cache=False)
+            rows.extend(self._status_rows(df, project.name))
+        return rows
+
+    @staticmethod
+    def _status_sql(names: Iterable[str]) -> str:
+        ast_query = Select(
+            targets=[Identifier(col) for col in STATUS_COLUMNS],
+            from_table=Identifier('models'),
+            where=BinaryOperation('in', args=[
+                Identifier('NAME'),
+                Tuple(items=[Constant(name) for name in sorted(names)])
+            ])
+        )
+        return ast_query.to_string()
+
+    @staticmethod
+    def _status_rows(df: pd.DataFrame, project_name: str) -> List[dict]:
+        df = df.rename(columns={col: col.lower() for col in df.columns})
+        rows = df.to_dict('records')
+        for row in rows:
+            row['project'] = project_name
+        return rows
+
+    @staticmethod
+    def _update_status(model: Model, rows: List[dict]) -> str:
+        # update status of the model from result of status query
+        rows = [row for row in rows if row['project'] == model.project.name]
+        row = _match_status(model, rows)
+        if row is None:
+            raise AttributeError(f"Model doesn't exist: {model.name}")
+        model.data['status'] = row.get('status')
+        if 'error' in row:
+            model.data['error'] = row['error']
+        return model.data['status']
+
+    def _metadata_key(self) -> tuple:
+        return (self.__class__.__name__, self.project.name)
+
+    def _load_models(self) -> Dict[str, Model]:
+        return {model.name: model for model in self.list()}
 
     def list(self, with_versions: bool = False,
                     name: str = None,
@@ -604,17 +899,20 @@ class Models(CollectionBase):
         :return: list of Model or ModelVersion objects
         """
 
-        model_class = Model
+        sql = self._list_sql(with_versions=with_versions, name=name, version=version)
+        df = self.project.query(sql).fetch(cache=False)
 
+        return self._models_from_df(df, with_versions=with_versions)
+
+    @staticmethod
+    def _list_sql(with_versions: bool = False, name: str = None, version: int = None) -> str:
         filters = {}
         if name is not None:
             filters['NAME'] = name
         if version is not None:
             filters['VERSION'] = version
 
-        if with_versions:
-            model_class = ModelVersion
-        else:
+        if not with_versions:
             filters['ACTIVE'] = '1'
 
         ast_query = Select(
@@ -622,7 +920,12 @@ class Models(CollectionBase):
             from_table=Identifier('models'),
             where=dict_to_binary_op(filters)
         )
-        df = self.project.query(ast_query.to_string()).fetch()
+        return ast_query.to_string()
+
+    def _models_from_df(self, df: pd.DataFrame, with_versions: bool = False) -> List[Union[Model, ModelVersion]]:
+        model_class = self._model_class
+        if with_versions:
+            model_class = self._model_version_class
 
         # columns to lower case
         cols_map = { i: i.lower() for i in df.columns }
@@ -2,7 +2,9 @@ from typing import  List
 
 from mindsdb_sql_parser.ast.mindsdb import CreateDatabase, DropPredictor
 from mindsdb_sql_parser.ast import DropDatabase
-from mindsdb_sql_parser.ast import Identifier
+from mindsdb_sql_parser.ast import Identifier, Select
+
+from mindsdb_sdk.utils.sql import dict_to_binary_op
 
 from mindsdb_sdk.agents import Agents
 from mindsdb_sdk.utils.objects_collection import CollectionBase
@@ -102,6 +104,10 @@ class Project:
         ast_query = DropPredictor(Identifier(parts=[name, str(version)]))
 
         self.query(ast_query.to_string()).fetch()
+        self.models._invalidate_metadata()
+        prediction_cache = getattr(self.api, 'prediction_cache', None)
+        if prediction_cache is not None:
+            prediction_cache.invalidate_model(self.name, name)
 
 
 class Projects(CollectionBase):
@@ -135,9 +141,25 @@ class Projects(CollectionBase):
         self.server = server
 
     def _list_projects(self):
-        data = self.api.sql_query("select NAME from information_schema.databases where TYPE='project'")
+        return self._metadata_index(self._load_projects)
+
+    def _load_projects(self):
+        data = self.api.sql_query(self._list_sql())
         return list(data.NAME)
 
+    @staticmethod
+    def _list_sql(name: str = None) -> str:
+        if name is None:
+            return "select NAME from information_schema.databases where TYPE='project'"
+
+        # lookup of one project
+        ast_query = Select(
+            targets=[Identifier('NAME')],
+            from_table=Identifier(parts=['information_schema', 'databases']),
+            where=dict_to_binary_op({'TYPE': 'project', 'NAME': name})
+        )
+        return ast_query.to_string()
+
     def list(self) -> List[Project]:
         """
         Show list of project on server
@@ -154,7 +176,11 @@ class Projects(CollectionBase):
         :param name: name of project
         :return: Project object
         """
-        if name not in self._list_projects():
+        if self._metadata_cache() is not None:
+            names = self._list_projects()
+        else:
+            names = list(self.api.sql_query(self._list_sql(name)).NAME)
+        if name not in names:
             raise AttributeError("Project doesn't exist")
         return Project(self.server, self.api, name)
 
@@ -166,14 +192,18 @@ class Projects(CollectionBase):
         :return: Project object
         """
 
+        self.api.sql_query(self._create_sql(name))
+        self._invalidate_metadata()
+        return Project(self.server, self.api, name)
+
+    @staticmethod
+    def _create_sql(name: str) -> str:
         ast_query = CreateDatabase(
             name=Identifier(name),
             engine='mindsdb',
             parameters={}
         )
-
-        self.api.sql_query(ast_query.to_string())
-        return Project(self.server, self.api, name)
+        return ast_query.to_string()
 
     def drop(self, name: str):
         """
@@ -183,3 +213,4 @@ class Projects(CollectionBase):
         """
         ast_query = DropDatabase(name=Identifier(name))
         self.api.sql_query(ast_query.to_string())
+        self._invalidate_metadata()
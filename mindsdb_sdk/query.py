@@ -1,5 +1,12 @@
+import copy
+from typing import Iterator
+
 import pandas as pd
 
+from mindsdb_sql_parser import parse_sql
+from mindsdb_sql_parser.ast import Select, Star, Identifier, Constant, BinaryOperation, OrderBy
+from mindsdb_sql_parser.exceptions import ParsingException
+
 
 class Query:
     def __init__(self, api, sql, database=None):
@@ -15,10 +22,119 @@ class Query:
 
         return f'{self.__class__.__name__}({sql})'
 
-    def fetch(self) -> pd.DataFrame:
+    def fetch(self, stream: bool = None, format: str = 'pandas', cache: bool = True) -> pd.DataFrame:
         """
         Executes query in mindsdb server and returns result
-        :return: dataframe with result
+
+        >>> table = query.fetch(format='arrow')
+
+        :param stream: decode result while it is downloaded to reduce memory usage, optional.
+           Default is defined by `stream_results` param of connection
+        :param format: 'pandas' (default) to return dataframe or 'arrow' to return pyarrow.Table.
+           With 'arrow' result is requested from server in Arrow IPC format (if `result_format` param of connection
+           is not set), it is decoded without conversion to python objects. If server doesn't support it, json is used
+        :param cache: use result cache if it is enabled for connection, see :meth:`Server.enable_result_cache`.
+           Set it to False to get fresh result from server
+        :return: dataframe or pyarrow.Table with result
+        """
+        return self.api.sql_query(self.sql, self.database, stream=stream, format=format, cache=cache)
+
+    def fetch_iter(self, batch_size: int = 1000, order_by: str = None) -> Iterator[pd.DataFrame]:
+        """
+        Executes query in mindsdb server by parts and yields result as dataframes with up to batch_size rows.
+        Only one batch is kept in memory of the client at the moment.
+
+        >>> for df in table.fetch_iter(batch_size=10000):
+        ...     process(df)
+
+        By default, pages are requested using LIMIT/OFFSET. The order of rows isn't guaranteed between pages,
+        to have stable pagination use `order_by` column.
+        If `order_by` is set, keyset pagination is used: 'where <order_by> > <last value> order by <order_by>'.
+        Values of this column have to be unique.
+
+        >>> for df in table.fetch_iter(batch_size=10000, order_by='id'):
+        ...     process(df)
+
+        :param batch_size: max count of rows in every batch
+        :param order_by: column to order results and to paginate by, optional
+        :return: iterator of dataframes
+        """
+        if batch_size <= 0:
+            raise ValueError('batch_size must be positive')
+
+        base_query, database, total_limit = self._get_batch_select()
+
+        fetched = 0
+        last_value = None
+        while True:
+            size = batch_size
+            if total_limit is not None:
+                size = min(size, total_limit - fetched)
+                if size <= 0:
+                    return
+
+            sql = self._batch_sql(base_query, size, fetched, order_by=order_by, last_value=last_value)
+            df = self.api.sql_query(sql, database)
+            if df is None or len(df) == 0:
+                return
+
+            yield df
+
+            fetched += len(df)
+            if len(df) < size:
+                return
+            if order_by is not None:
+                last_value = self._last_value(df, order_by)
+
+    @staticmethod
+    def _batch_sql(base_query: Select, size: int, offset: int, order_by: str = None, last_value=None) -> str:
+        # utils.sql depends on this module
+        from mindsdb_sdk.utils.sql import add_condition
+
+        ast_query = copy.deepcopy(base_query)
+        if order_by is not None:
+            ast_query.order_by = [OrderBy(Identifier(order_by))]
+            if last_value is not None:
+                condition = BinaryOperation(op='>', args=[Identifier(order_by), Constant(last_value)])
+                ast_query.where = add_condition(ast_query.where, condition)
+        elif offset > 0:
+            ast_query.offset = Constant(offset)
+        ast_query.limit = Constant(size)
+        return ast_query.to_string()
+
+    @staticmethod
+    def _last_value(df: pd.DataFrame, column: str):
+        value = df[column].iloc[-1]
+        if hasattr(value, 'item'):
+            # numpy scalar to python
+            value = value.item()
+        return value
+
+    def _get_batch_select(self):
+        """
+        Returns select to apply pagination to, database to execute it in and limit of total rows count
         """
-        return self.api.sql_query(self.sql, self.database)
+        try:
+            ast_query = parse_sql(self.sql, dialect='mindsdb')
+        except ParsingException:
+            ast_query = None
+
+        if isinstance(ast_query, Select):
+            total_limit = None
+            if isinstance(ast_query.limit, Constant) and isinstance(ast_query.limit.value, int):
+                # limit stays in subselect (it can depend on order of subselect),
+                # it is used to not request rows after the last one
+                total_limit = ast_query.limit.value
+
+            # wrap query to subselect, it is executed in the same database
+            ast_query.parentheses = True
+            ast_query.alias = Identifier('t')
+            return Select(targets=[Star()], from_table=ast_query), self.database, total_limit
+
+        if self.database is None:
+            raise ValueError(f'Unable to fetch query by batches: {self.sql}')
+
+        # use native query
+        from mindsdb_sdk.utils.sql import query_to_native_query
 
+        return query_to_native_query(self), None, None
@@ -6,6 +6,7 @@ from .ml_engines import MLEngines
 from .handlers import Handlers
 from .tree import TreeNode
 from .config import Config
+from .utils.cache import LRUCache, PredictionCache, SearchCache
 
 
 class Server(Project):
@@ -86,6 +87,147 @@ class Server(Project):
         df = self.api.objects_tree('')
         return [TreeNode.from_dict(row.to_dict()) for _, row in df.iterrows()]
 
+    def enable_result_cache(self, ttl: float = 60, max_size: int = 100 * 2 ** 20):
+        """
+        Enable client-side cache of results of queries. Results of `fetch()` of queries and tables
+        are reused if the same query was executed in the same database recently.
+
+        Cached results are invalidated:
+            - after `ttl` seconds
+            - when query which changes data (INSERT, UPDATE, DELETE, CREATE, DROP, ...) of referenced table
+              is executed using this connection. Changes made by other clients are not tracked, use ttl for them
+
+        >>> server.enable_result_cache(ttl=30, max_size=500 * 2 ** 20)
+        >>> df = project.query('select * from my_db.sales').fetch()  # request to server
+        >>> df = project.query('select * from my_db.sales').fetch()  # from cache
+        >>> df = project.query('select * from my_db.sales').fetch(cache=False)  # request to server
+        >>> server.result_cache_stats()
+        {'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'items': 1, 'size': 1024}
+
+        :param ttl: time to live of results in seconds
+        :param max_size: max total size of cached results in bytes, least recently used results are evicted
+        """
+        self.api.enable_result_cache(ttl=ttl, max_size=max_size)
+
+    def disable_result_cache(self):
+        """
+        Disable and clear cache of results of queries
+        """
+        self.api.disable_result_cache()
+
+    def result_cache_stats(self) -> dict:
+        """
+        Counters of result cache: hits, misses, hit_rate, items (count of cached results), size (bytes)
+
+        :return: dict with counters or None if cache isn't enabled
+        """
+        if self.api.result_cache is None:
+            return None
+        return self.api.result_cache.stats()
+
+    def enable_metadata_cache(self, ttl: float = 60):
+        """
+        Enable client-side cache of metadata: lists of databases, projects, models, views, ml engines and handlers.
+        `get` of collection uses cached index of objects instead of request to server.
+
+        Index of collection is invalidated:
+            - after `ttl` seconds
+            - when object is created, dropped or updated using the collection (or model is retrained)
+            - by :meth:`refresh_metadata`
+
+        Objects created by other clients are not visible until index is expired or refreshed.
+
+        >>> server.enable_metadata_cache(ttl=300)
+        >>> table = server.databases.my_db.tables.my_table  # request to server
+        >>> table = server.databases.my_db.tables.my_table  # from cache
+
+        :param ttl: time to live of metadata in seconds
+        """
+        self.api.metadata_cache = LRUCache(ttl=ttl)
+
+    def disable_metadata_cache(self):
+        """
+        Disable and clear metadata cache
+        """
+        self.api.metadata_cache = None
+
+    def refresh_metadata(self):
+        """
+        Clear metadata cache, next requests of collections will get actual data from server
+        """
+        if self.api.metadata_cache is not None:
+            self.api.metadata_cache.clear()
+
+    def enable_prediction_cache(self, ttl: float = 300, max_items: int = 100000):
+        """
+        Enable client-side cache of predictions of models made by `model.predict(dataframe or dict)`.
+        Predictions are cached by rows: only rows which are not found in cache are sent to model.
+
+        Cached predictions of model are invalidated:
+            - after `ttl` seconds
+            - when model is retrained, fine-tuned, dropped or its active version is changed using this connection
+
+        >>> server.enable_prediction_cache(ttl=600, max_items=1000000)
+        >>> model.predict({'a': 1})  # request to server
+        >>> model.predict(pd.DataFrame([{'a': 1}, {'a': 2}]))  # only second row is sent to server
+        >>> server.prediction_cache_stats()
+        {'hits': 1, 'misses': 2, 'hit_rate': 0.33, 'items': 2, 'size': 0}
+
+        :param ttl: time to live of predictions in seconds
+        :param max_items: max count of cached rows, least recently used rows are evicted
+        """
+        self.api.prediction_cache = PredictionCache(ttl=ttl, max_items=max_items)
+
+    def disable_prediction_cache(self):
+        """
+        Disable and clear cache of predictions
+        """
+        self.api.prediction_cache = None
+
+    def prediction_cache_stats(self) -> dict:
+        """
+        Counters of prediction cache (by rows): hits, misses, hit_rate, items
+
+        :return: dict with counters or None if cache isn't enabled
+        """
+        if self.api.prediction_cache is None:
+            return None
+        return self.api.prediction_cache.stats()
+
+    def enable_search_cache(self, ttl: float = 300, max_size: int = 50 * 2 ** 20):
+        """
+        Enable client-side cache of results of search in knowledge bases: `kb.find(...).fetch()` and `kb.find_many(...)`.
+        The same query (ignoring case and whitespaces) with the same limit, filters and columns is not sent to server again.
+
+        Results of knowledge base are invalidated when data is inserted into it using this connection
+        (insert, insert_stream, insert_query, insert_files, insert_webpages)
+
+        >>> server.enable_search_cache(ttl=600)
+        >>> df = kb.find('How to reset password?').fetch()
+        >>> df = kb.find('how to  reset password?').fetch()  # from cache
+        >>> server.search_cache_stats()
+
+        :param ttl: time to live of results in seconds
+        :param max_size: max total size of cached results in bytes, least recently used results are evicted
+        """
+        self.api.search_cache = SearchCache(ttl=ttl, max_size=max_size)
+
+    def disable_search_cache(self):
+        """
+        Disable and clear cache of results of search in knowledge bases
+        """
+        self.api.search_cache = None
+
+    def search_cache_stats(self) -> dict:
+        """
+        Counters of search cache: hits, misses, hit_rate, items, size (bytes)
+
+        :return: dict with counters or None if cache isn't enabled
+        """
+        if self.api.search_cache is None:
+            return None
+        return self.api.search_cache.stats()
+
     def __repr__(self):
         return f'{self.__class__.__name__}({self.api.url})'
 
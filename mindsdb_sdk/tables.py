@@ -1,18 +1,21 @@
 import copy
-from typing import Union
-from typing import List
+from typing import Callable, Iterator, List, Tuple, Union
 
 import pandas as pd
 
 from mindsdb_sql_parser.ast import DropTables, CreateTable
 from mindsdb_sql_parser.ast import Select, Star, Identifier, Constant, Delete, Insert, Update, Last, BinaryOperation
 
-from mindsdb_sdk.utils.sql import dict_to_binary_op, add_condition, query_to_native_query
+from mindsdb_sdk.utils.sql import dict_to_binary_op, add_condition, query_to_native_query, render_values
 from mindsdb_sdk.utils.objects_collection import CollectionBase
 from mindsdb_sdk.utils.context import is_saving
+from mindsdb_sdk.utils.batch import BatchReport, BatchError, process_chunks
 
 from .query import Query
 
+# count of rows of dataframe which are rendered to sql at once, if insert is chunked only by size
+INSERT_RENDER_BLOCK_SIZE = 10000
+
 
 class Table(Query):
     def __init__(self, db, name):
@@ -92,39 +95,32 @@ class Table(Query):
         query._update_query()
         return query
 
-    def _update_query(self):
+    def _build_select(self) -> Select:
         where = dict_to_binary_op(self._filters)
         if self._track_column is not None:
             condition = BinaryOperation(op='>', args=[Identifier(self._track_column), Last()])
             where = add_condition(where, condition)
 
-        ast_query = Select(
+        return Select(
             targets=[Star()],
             from_table=self.table_name,
             where=where
         )
+
+    def _update_query(self):
+        ast_query = self._build_select()
         if self._limit is not None:
             ast_query.limit = Constant(self._limit)
         self.sql = ast_query.to_string()
 
-    def insert(self, query: Union[pd.DataFrame, Query]):
-        """
-        Insert data from query of dataframe
-        :param query: dataframe of
-        :return:
-        """
+    def _get_batch_select(self):
+        # table is queried directly, without subselect
+        return self._build_select(), None, self._limit
 
+    def _insert_sql(self, query: Union[pd.DataFrame, Query]) -> str:
         if isinstance(query, pd.DataFrame):
             # insert data
-            data_split = query.to_dict('split')
-
-            ast_query = Insert(
-                table=self.table_name,
-                columns=data_split['columns'],
-                values=data_split['data']
-            )
-
-            sql = ast_query.to_string()
+            return self._insert_header(query) + ', '.join(render_values(query))
 
         elif isinstance(query, Query):
             # insert from select
@@ -135,57 +131,140 @@ class Table(Query):
                     table=self.table_name,
                     from_select=query_to_native_query(query)
                 )
-                sql = ast_query.to_string()
+                return ast_query.to_string()
             else:
-                sql = f'INSERT INTO {self.table_name.to_string()} ({query.sql})',
+                return f'INSERT INTO {self.table_name.to_string()} ({query.sql})'
         else:
             raise ValueError(f'Invalid query type: {query}')
 
-        if is_saving():
-            return Query(self, sql)
+    def _insert_header(self, df: pd.DataFrame) -> str:
+        # "INSERT INTO db.table(col1, col2) VALUES ", values are rendered separately by render_values
+        return Insert(table=self.table_name, columns=list(df.columns)).to_string() + 'VALUES '
 
-        self.api.sql_query(sql)
+    def _insert_chunks(self, df: pd.DataFrame, chunk_size: int = None,
+                       max_chunk_bytes: int = None) -> Iterator[Tuple[str, int]]:
+        """
+        Splits dataframe to INSERT statements by count of rows and by size of statement.
+        Every statement is the same as `_insert_sql` renders for its part of dataframe.
 
-    def delete(self, **kwargs):
+        :return: iterator of (sql, count of rows)
         """
-        Deletes record from table using filters
+        header = self._insert_header(df)
+        header_size = len(header.encode('utf-8'))
+
+        # render rows by blocks to not keep the whole rendered dataframe in memory
+        block_size = chunk_size or INSERT_RENDER_BLOCK_SIZE
+
+        rows, size = [], header_size
+        for start in range(0, len(df), block_size):
+            for row in render_values(df.iloc[start: start + block_size]):
+                row_size = len(row) if row.isascii() else len(row.encode('utf-8'))
+                if rows and (
+                    (chunk_size is not None and len(rows) >= chunk_size)
+                    or (max_chunk_bytes is not None and size + row_size + 2 > max_chunk_bytes)
+                ):
+                    yield header + ', '.join(rows), len(rows)
+                    rows, size = [], header_size
+                rows.append(row)
+                # with separator
+                size += row_size + 2
+        if rows:
+            yield header + ', '.join(rows), len(rows)
+
+    def insert(
+        self,
+        query: Union[pd.DataFrame, Query],
+        chunk_size: int = None,
+        max_chunk_bytes: int = None,
+        max_workers: int = 1,
+        retries: int = 0,
+        on_progress: Callable[[BatchReport], None] = None,
+        resume: BatchReport = None,
+    ) -> BatchReport:
+        """
+        Insert data from query of dataframe
 
-        >>> table.delete(a=1, b=2)
+        Big dataframe can be inserted by chunks: every chunk is sent as separate INSERT statement.
+        Chunk is limited by count of rows (`chunk_size`) and by size of sql statement (`max_chunk_bytes`).
 
-        :param kwargs: filter
+        >>> report = table.insert(df, chunk_size=10000, max_chunk_bytes=8 * 2**20, max_workers=4)
+        >>> report.rows, report.throughput
+
+        If chunk failed BatchError is raised, chunks which were not inserted can be sent again:
+
+        >>> try:
+        ...     table.insert(df, chunk_size=10000)
+        ... except BatchError as e:
+        ...     table.insert(df, chunk_size=10000, resume=e.report)
+
+        :param query: dataframe or Query object
+        :param chunk_size: max count of rows in one INSERT statement, optional
+        :param max_chunk_bytes: max size of INSERT statement in bytes, optional
+        :param max_workers: count of INSERT statements which are executed concurrently
+        :param retries: count of retries of failed chunk
+        :param on_progress: function which is called with BatchReport after every chunk
+        :param resume: report of previous failed insert, completed chunks are skipped.
+           Dataframe and chunk parameters have to be the same as in previous insert
+        :return: BatchReport if dataframe was inserted by chunks
         """
+        chunked = chunk_size is not None or max_chunk_bytes is not None
+        if not isinstance(query, pd.DataFrame) or not chunked or is_saving():
+            sql = self._insert_sql(query)
+
+            if is_saving():
+                return Query(self, sql)
+
+            self.api.sql_query(sql)
+            return
+
+        if chunk_size is not None and chunk_size <= 0:
+            raise ValueError('chunk_size must be positive')
+
+        if max_workers > 1:
+            self.api.set_pool_size(max_workers)
+
+        skip = None
+        if resume is not None:
+            skip = resume.completed
+
+        report = process_chunks(
+            self.api.sql_query,
+            self._insert_chunks(query, chunk_size=chunk_size, max_chunk_bytes=max_chunk_bytes),
+            max_workers=max_workers,
+            retries=retries,
+            on_progress=on_progress,
+            skip=skip,
+            report=resume,
+        )
+        if report.failed:
+            num = report.resume_from
+            raise BatchError(f'Insert of chunk {num} failed: {report.failed[num]}', report)
+        return report
 
+    def _delete_sql(self, filters: dict) -> str:
         ast_query = Delete(
             table=self.table_name,
-            where=dict_to_binary_op(kwargs)
+            where=dict_to_binary_op(filters)
         )
-        sql = ast_query.to_string()
+        return ast_query.to_string()
 
-        if is_saving():
-            return Query(self, sql)
-
-        self.api.sql_query(sql)
+    def delete(self, **kwargs):
+        """
+        Deletes record from table using filters
 
-    def update(self, values: Union[dict, Query], on: list = None, filters: dict = None):
-        '''
-        Update table by condition of from other table.
+        >>> table.delete(a=1, b=2)
 
-        If 'values' is a dict:
-          it will be an update by condition
-          'filters' is required
-          used command: update table set a=1 where x=1
+        :param kwargs: filter
+        """
 
-        If 'values' is a Query:
-          it will be an update from select
-          'on' is required
-          used command: update table on a,b from (query)
+        sql = self._delete_sql(kwargs)
 
-        :param values: input for update, can be dict or query
-        :param on: list of column to map subselect to table ['a', 'b', ...]
-        :param filters: dict to filter updated rows, {'column': 'value', ...}
+        if is_saving():
+            return Query(self, sql)
 
-        '''
+        self.api.sql_query(sql)
 
+    def _update_sql(self, values: Union[dict, Query], on: list = None, filters: dict = None) -> str:
         if isinstance(values, Query):
             # is update from select
             if on is None:
@@ -198,10 +277,10 @@ class Table(Query):
                     keys=[Identifier(col) for col in on],
                     from_select=query_to_native_query(values)
                 )
-                sql = ast_query.to_string()
+                return ast_query.to_string()
             else:
                 map_cols = ', '.join(on)
-                sql = f'UPDATE {self.table_name.to_string()} ON {map_cols} FROM ({values.sql})'
+                return f'UPDATE {self.table_name.to_string()} ON {map_cols} FROM ({values.sql})'
 
         elif isinstance(values, dict):
             # is regular update
@@ -219,10 +298,32 @@ class Table(Query):
                 where=dict_to_binary_op(filters)
             )
 
-            sql = ast_query.to_string()
+            return ast_query.to_string()
         else:
             raise NotImplementedError
 
+    def update(self, values: Union[dict, Query], on: list = None, filters: dict = None):
+        '''
+        Update table by condition of from other table.
+
+        If 'values' is a dict:
+          it will be an update by condition
+          'filters' is required
+          used command: update table set a=1 where x=1
+
+        If 'values' is a Query:
+          it will be an update from select
+          'on' is required
+          used command: update table on a,b from (query)
+
+        :param values: input for update, can be dict or query
+        :param on: list of column to map subselect to table ['a', 'b', ...]
+        :param filters: dict to filter updated rows, {'column': 'value', ...}
+
+        '''
+
+        sql = self._update_sql(values, on=on, filters=filters)
+
         if is_saving():
             return Query(self, sql)
 
@@ -265,13 +366,24 @@ class Tables(CollectionBase):
     >>> db.tables.drop('table2')
     """
 
+    _table_class = Table
+
     def __init__(self, database, api):
         self.database = database
         self.api = api
 
     def _list_tables(self):
-        df = self.database.query('show tables').fetch()
+        return self._metadata_index(self._load_tables)
 
+    def _load_tables(self):
+        df = self.database.query('show tables').fetch(cache=False)
+        return self._names_from_df(df)
+
+    def _metadata_key(self) -> tuple:
+        return (self.__class__.__name__, self.database.name)
+
+    @staticmethod
+    def _names_from_df(df: pd.DataFrame) -> List[str]:
         # first column
         return list(df[df.columns[0]])
 
@@ -281,7 +393,7 @@ class Tables(CollectionBase):
 
         :return: list of Table objects
         """
-        return [Table(self.database, name) for name in self._list_tables()]
+        return [self._table_class(self.database, name) for name in self._list_tables()]
 
     def get(self, name: str) -> Table:
         """
@@ -291,9 +403,10 @@ class Tables(CollectionBase):
         :return: Table object
         """
 
-        return Table(self.database, name)
+        return self._table_class(self.database, name)
 
-    def create(self, name: str, query: Union[pd.DataFrame, Query], replace: bool = False) -> Union[Table, Query]:
+    def create(self, name: str, query: Union[pd.DataFrame, Query], replace: bool = False,
+               file_format: str = None) -> Union[Table, Query]:
         """
         Create new table and return it.
 
@@ -305,21 +418,40 @@ class Tables(CollectionBase):
 
         'select ...' is extracted from input Query
 
+        Dataframe can be uploaded to `files` database. By default, format of uploaded file is chosen automatically:
+        small dataframes are uploaded as csv, big ones in binary format (parquet) which keeps dtypes of columns
+
+        >>> files.tables.create('sales', df)
+        >>> files.tables.create('sales', df, file_format='csv.gz')
+
         :param name: name of table
         :param query: Query object
         :param replace: if true,
+        :param file_format: format to upload dataframe: 'csv', 'csv.gz', 'csv.zst', 'parquet' or 'arrow', optional
         :return: Table object
         """
 
         if isinstance(query, pd.DataFrame) and self.database.name == 'files':
             # now it is only possible for file uploading
-            self.api.upload_file(name, query)
+            self.api.upload_file(name, query, file_format=file_format)
+            self._invalidate_metadata()
 
-            return Table(self.database, name)
+            return self._table_class(self.database, name)
 
         if not isinstance(query, Query):
             raise NotImplementedError
 
+        sql = self._create_sql(name, query, replace=replace)
+
+        if is_saving():
+            return Query(self, sql)
+
+        self.api.sql_query(sql)
+        self._invalidate_metadata()
+
+        return self._table_class(self.database, name)
+
+    def _create_sql(self, name: str, query: Query, replace: bool = False) -> str:
         # # query can be in different database: wrap to NativeQuery
         # ast_query = CreateTable(
         #     name=Identifier(name),
@@ -344,20 +476,21 @@ class Tables(CollectionBase):
                 is_replace=replace,
                 from_select=query_to_native_query(query)
             )
-            sql = ast_query.to_string()
-        else:
-            replace_str = ''
-            if replace:
-                replace_str = ' or replace'
+            return ast_query.to_string()
 
-            sql = f'create{replace_str} table {table.to_string()} ({query.sql})'
+        replace_str = ''
+        if replace:
+            replace_str = ' or replace'
 
-        if is_saving():
-            return Query(self, sql)
+        return f'create{replace_str} table {table.to_string()} ({query.sql})'
 
-        self.api.sql_query(sql)
+    def _drop_sql(self, name: str) -> str:
+        table = Identifier(parts=[self.database.name, name])
 
-        return Table(self.database, name)
+        ast_query = DropTables(
+            tables=[table]
+        )
+        return ast_query.to_string()
 
     def drop(self, name: str):
         """
@@ -365,14 +498,9 @@ class Tables(CollectionBase):
 
         :param name: name of table
         """
-        table = Identifier(parts=[self.database.name, name])
-
-        ast_query = DropTables(
-            tables=[table]
-        )
-        sql = ast_query.to_string()
+        sql = self._drop_sql(name)
 
         if is_saving():
             return Query(self, sql)
         self.api.sql_query(sql)
-
+        self._invalidate_metadata()
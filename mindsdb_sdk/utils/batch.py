@@ -0,0 +1,367 @@
+import asyncio
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Awaitable, Callable, Iterable, Tuple, Any
+
+from tenacity import AsyncRetrying, Retrying, wait_random_exponential, stop_after_attempt
+
+DEFAULT_RETRY_MAX_WAIT = 10
+
+
+class BatchReport:
+    """
+    Progress and result of processing of data by chunks
+
+    - completed: set of numbers of processed chunks
+    - failed: dict with number of chunk -> exception
+    - rows: count of processed rows
+    - latencies: time of processing of every chunk in seconds
+    - resume_from: number of the first failed chunk, None if there are no failures
+    """
+
+    def __init__(self):
+        self.completed = set()
+        self.failed = {}
+        self.rows = 0
+        self.latencies = []
+        self.results = {}
+
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (
+            f'{self.__class__.__name__}(completed={len(self.completed)}, failed={len(self.failed)}, '
+            f'rows={self.rows}, elapsed={self.elapsed:.2f}s)'
+        )
+
+    def _add_result(self, num: int, rows: int, latency: float, result=None, keep_result: bool = False):
+        with self._lock:
+            self.completed.add(num)
+            self.failed.pop(num, None)
+            self.rows += rows
+            self.latencies.append(latency)
+            if keep_result:
+                self.results[num] = result
+
+    def _add_error(self, num: int, error: Exception):
+        with self._lock:
+            self.failed[num] = error
+
+    @property
+    def resume_from(self) -> int:
+        if not self.failed:
+            return None
+        return min(self.failed)
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """
+        Processed rows per second
+        """
+        elapsed = self.elapsed
+        if elapsed == 0:
+            return 0.0
+        return self.rows / elapsed
+
+    def percentile(self, q: float) -> float:
+        """
+        Latency of chunk processing
+
+        :param q: percentile, from 0 to 100
+        :return: seconds
+        """
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        pos = min(len(latencies) - 1, max(0, round(q / 100 * (len(latencies) - 1))))
+        return latencies[pos]
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(50)
+
+    @property
+    def p95(self) -> float:
+        return self.percentile(95)
+
+
+class BatchError(RuntimeError):
+    """
+    Processing of some chunks failed. Report of processing is in `report` attribute,
+    it can be used to resume processing
+    """
+
+    def __init__(self, message: str, report: BatchReport):
+        super().__init__(message)
+        self.report = report
+
+
+class AdaptiveChunkSize:
+    """
+    Count of rows in chunk which is adjusted by observed latency of processing:
+    chunk size grows when chunks are processed faster than target latency and shrinks when slower.
+    Size is changed not more than twice at a time to smooth random spikes of latency
+    """
+
+    def __init__(self, initial: int, target_latency: float, min_size: int = 1, max_size: int = None):
+        """
+        :param initial: initial count of rows in chunk
+        :param target_latency: desired time of processing of chunk, in seconds
+        :param min_size: minimal count of rows in chunk
+        :param max_size: maximal count of rows in chunk, optional
+        """
+        if target_latency <= 0:
+            raise ValueError('target_latency must be positive')
+        self.target_latency = target_latency
+        self.min_size = min_size
+        self.max_size = max_size
+        self.size = self._clip(initial)
+        self._lock = threading.Lock()
+
+    def __call__(self) -> int:
+        return self.size
+
+    def _clip(self, size: int) -> int:
+        size = max(self.min_size, size)
+        if self.max_size is not None:
+            size = min(self.max_size, size)
+        return size
+
+    def update(self, rows: int, latency: float):
+        """
+        Use latency of processed chunk to adjust size of next chunks
+
+        :param rows: count of rows in processed chunk
+        :param latency: time of processing in seconds
+        """
+        if rows <= 0:
+            return
+        with self._lock:
+            if latency <= 0:
+                size = self.size * 2
+            else:
+                size = rows * self.target_latency / latency
+                size = min(self.size * 2, max(self.size / 2, size))
+            self.size = self._clip(int(size))
+
+
+class RateLimiter:
+    """
+    Limits rate of calls from many threads: calls are spaced evenly, not more than `rate` calls per second
+    """
+
+    def __init__(self, rate: float):
+        """
+        :param rate: max count of calls per second
+        """
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.interval = 1 / rate
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """
+        Blocks until next call is allowed
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+    async def wait_async(self):
+        """
+        Waits without blocking of event loop until next call is allowed
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+def _call_with_retries(func: Callable, chunk, retries: int):
+    if retries <= 0:
+        return func(chunk)
+    for attempt in Retrying(
+        wait=wait_random_exponential(multiplier=0.5, max=DEFAULT_RETRY_MAX_WAIT),
+        stop=stop_after_attempt(retries + 1),
+        reraise=True
+    ):
+        with attempt:
+            return func(chunk)
+
+
+async def _call_with_retries_async(func: Callable[[Any], Awaitable], chunk, retries: int):
+    if retries <= 0:
+        return await func(chunk)
+    async for attempt in AsyncRetrying(
+        wait=wait_random_exponential(multiplier=0.5, max=DEFAULT_RETRY_MAX_WAIT),
+        stop=stop_after_attempt(retries + 1),
+        reraise=True
+    ):
+        with attempt:
+            return await func(chunk)
+
+
+def process_chunks(
+    func: Callable,
+    chunks: Iterable[Tuple[Any, int]],
+    max_workers: int = 1,
+    retries: int = 0,
+    on_progress: Callable[[BatchReport], None] = None,
+    skip: Iterable[int] = None,
+    stop_on_error: bool = True,
+    keep_results: bool = False,
+    report: BatchReport = None,
+) -> BatchReport:
+    """
+    Calls function for every chunk of data. Chunks are numbered in order of iteration.
+
+    Chunks are consumed from iterator lazily: not more than 2 * max_workers chunks are in memory at the same time.
+
+    :param func: function to call with chunk
+    :param chunks: iterable of (chunk, count of rows in chunk)
+    :param max_workers: count of chunks processed at the same time
+    :param retries: count of retries of failed chunk, with exponential backoff
+    :param on_progress: function which is called with report after processing of every chunk.
+       If it raises exception, next chunks are not started and exception is raised after processing of started chunks
+    :param skip: numbers of chunks to skip (for example, completed chunks from previous report)
+    :param stop_on_error: don't start processing of next chunks after failure
+    :param keep_results: save results of function in report.results (number of chunk -> result)
+    :param report: report to continue, optional
+    :return: report
+    """
+    if max_workers < 1:
+        raise ValueError('max_workers must be positive')
+
+    if report is None:
+        report = BatchReport()
+    skip = set(skip or ())
+
+    # failures of previous run (if report is continued) don't stop processing: failed chunks are sent again
+    stopped = threading.Event()
+    progress_errors = []
+
+    def process(num, chunk, rows):
+        start = time.monotonic()
+        try:
+            result = _call_with_retries(func, chunk, retries)
+        except Exception as e:
+            report._add_error(num, e)
+            if stop_on_error:
+                stopped.set()
+        else:
+            report._add_result(num, rows, time.monotonic() - start, result, keep_results)
+        if on_progress is not None:
+            try:
+                on_progress(report)
+            except Exception as e:
+                # raised in the calling thread, the same way with any count of workers
+                progress_errors.append(e)
+                stopped.set()
+
+    numbered_chunks = (
+        (num, chunk, rows)
+        for num, (chunk, rows) in enumerate(chunks)
+        if num not in skip
+    )
+
+    if max_workers == 1:
+        for num, chunk, rows in numbered_chunks:
+            process(num, chunk, rows)
+            if stopped.is_set():
+                break
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            in_flight = set()
+            for num, chunk, rows in numbered_chunks:
+                if stopped.is_set():
+                    break
+                if len(in_flight) >= max_workers * 2:
+                    # wait before taking next chunk from iterator
+                    _, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                in_flight.add(executor.submit(process, num, chunk, rows))
+            wait(in_flight)
+
+    if progress_errors:
+        raise progress_errors[0]
+
+    report.finished_at = time.monotonic()
+    return report
+
+
+async def process_chunks_async(
+    func: Callable[[Any], Awaitable],
+    chunks: Iterable[Tuple[Any, int]],
+    max_workers: int = 1,
+    retries: int = 0,
+    on_progress: Callable[[BatchReport], None] = None,
+    skip: Iterable[int] = None,
+    stop_on_error: bool = True,
+    keep_results: bool = False,
+    report: BatchReport = None,
+) -> BatchReport:
+    """
+    The same as :func:`process_chunks` for async client: `func` is coroutine function,
+    up to max_workers chunks are processed concurrently in the current event loop.
+    """
+    if max_workers < 1:
+        raise ValueError('max_workers must be positive')
+
+    if report is None:
+        report = BatchReport()
+    skip = set(skip or ())
+
+    stopped = False
+    progress_errors = []
+
+    async def process(num, chunk, rows):
+        nonlocal stopped
+        start = time.monotonic()
+        try:
+            result = await _call_with_retries_async(func, chunk, retries)
+        except Exception as e:
+            report._add_error(num, e)
+            if stop_on_error:
+                stopped = True
+        else:
+            report._add_result(num, rows, time.monotonic() - start, result, keep_results)
+        if on_progress is not None:
+            try:
+                on_progress(report)
+            except Exception as e:
+                progress_errors.append(e)
+                stopped = True
+
+    in_flight = set()
+    for num, (chunk, rows) in enumerate(chunks):
+        if stopped:
+            break
+        if num in skip:
+            continue
+        if len(in_flight) >= max_workers:
+            # wait before taking next chunk from iterator
+            _, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            if stopped:
+                break
+        in_flight.add(asyncio.ensure_future(process(num, chunk, rows)))
+    if in_flight:
+        await asyncio.wait(in_flight)
+
+    if progress_errors:
+        raise progress_errors[0]
+
+    report.finished_at = time.monotonic()
+    return report
@@ -0,0 +1,340 @@
+import hashlib
+import json
+import re
+import sys
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable
+
+import pandas as pd
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with time to live of items and limit of total size of items.
+
+    Items can be marked by tags to invalidate all items with the tag at once.
+    """
+
+    def __init__(self, ttl: float = None, max_size: int = None, max_items: int = None,
+                 sizeof: Callable = sys.getsizeof):
+        """
+        :param ttl: time to live of item in seconds, optional
+        :param max_size: max total size of items in bytes, optional
+        :param max_items: max count of items, optional
+        :param sizeof: function to estimate size of item in bytes
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.max_items = max_items
+        self.sizeof = sizeof
+
+        # key -> (value, expire time, size, tags)
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item[1] is not None and item[1] < time.monotonic():
+                # expired
+                self._remove(key)
+                item = None
+
+            if item is None:
+                self.misses += 1
+                return default
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key: Hashable, value, tags: Iterable[str] = None):
+        size = self.sizeof(value)
+        if self.max_size is not None and size > self.max_size:
+            # doesn't fit into cache
+            return
+
+        expire = None
+        if self.ttl is not None:
+            expire = time.monotonic() + self.ttl
+
+        with self._lock:
+            if key in self._items:
+                self._remove(key)
+            self._items[key] = (value, expire, size, frozenset(tags or ()))
+            self._size += size
+
+            # evict least recently used
+            while (
+                (self.max_size is not None and self._size > self.max_size)
+                or (self.max_items is not None and len(self._items) > self.max_items)
+            ):
+                self._remove(next(iter(self._items)))
+
+    def _remove(self, key):
+        item = self._items.pop(key)
+        self._size -= item[2]
+
+    def remove(self, key: Hashable):
+        with self._lock:
+            if key in self._items:
+                self._remove(key)
+
+    def invalidate(self, tag: str) -> int:
+        """
+        Remove items marked by tag
+
+        :param tag: tag
+        :return: count of removed items
+        """
+        with self._lock:
+            keys = [key for key, item in self._items.items() if tag in item[3]]
+            for key in keys:
+                self._remove(key)
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        """
+        :return: dict with counters of hits and misses, count of items and their total size
+        """
+        requests_count = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests_count if requests_count else 0.0,
+            'items': len(self._items),
+            'size': self._size,
+        }
+
+
+# tables which are used in query
+TABLE_REFERENCE = re.compile(r'\b(?:from|join)\s+([`"\w.]+)', re.IGNORECASE)
+
+# query doesn't change data
+READ_QUERY = re.compile(r'^\s*\(*\s*(?:select|show|describe|explain|with)\b', re.IGNORECASE)
+
+# object which is changed by query
+WRITE_TARGET = re.compile(
+    r'^\s*(?:insert\s+into|update|delete\s+from|retrain|finetune|alter\s+\w+'
+    r'|create\s+(?:or\s+replace\s+)?\w+(?:\s+if\s+not\s+exists)?'
+    r'|drop\s+\w+(?:\s+if\s+exists)?)'
+    r'\s+([`"\w.]+)',
+    re.IGNORECASE
+)
+
+
+def _identifier_parts(identifier: str) -> list:
+    return [part.strip('`"').lower() for part in identifier.split('.')]
+
+
+def _result_size(result) -> int:
+    if isinstance(result, pd.DataFrame):
+        return int(result.memory_usage(index=True, deep=True).sum())
+    if hasattr(result, 'nbytes'):
+        # pyarrow.Table
+        return result.nbytes
+    return sys.getsizeof(result)
+
+
+class ResultCache(LRUCache):
+    """
+    Cache of results of queries. Key of cache is (normalized query, database and format of result).
+
+    Results are invalidated by time and when query which changes data is executed using the same connection,
+    in this case results of all queries which reference changed table are removed from cache.
+    If changed table can't be recognized the cache is cleared.
+    """
+
+    def __init__(self, ttl: float = 60, max_size: int = 100 * 2 ** 20):
+        super().__init__(ttl=ttl, max_size=max_size, sizeof=_result_size)
+
+    @staticmethod
+    def normalize_sql(sql: str) -> str:
+        return ' '.join(sql.split()).rstrip(';').strip()
+
+    def get_result(self, sql: str, database: str, *options):
+        result = self.get((self.normalize_sql(sql), database, *options))
+        if isinstance(result, pd.DataFrame):
+            # don't let to modify cached result
+            result = result.copy()
+        return result
+
+    def set_result(self, sql: str, database: str, *options, result):
+        if result is None:
+            return
+        tags = set()
+        for identifier in TABLE_REFERENCE.findall(sql):
+            tags.update(_identifier_parts(identifier))
+        if isinstance(result, pd.DataFrame):
+            result = result.copy()
+        self.set((self.normalize_sql(sql), database, *options), result, tags=tags)
+
+    @staticmethod
+    def is_cacheable(sql: str) -> bool:
+        # only results of queries which don't change data can be cached
+        return READ_QUERY.match(sql) is not None
+
+    def on_query(self, sql: str):
+        """
+        Invalidates results which can be changed by query
+        """
+        if self.is_cacheable(sql):
+            return
+        match = WRITE_TARGET.match(sql)
+        if match is None:
+            self.clear()
+            return
+        # name of object without database/project
+        name = _identifier_parts(match.group(1))[-1]
+        self.invalidate(name)
+
+    def on_change(self, name: str):
+        """
+        Invalidates results which reference table (or other object) with this name
+        """
+        self.invalidate(name.lower())
+
+
+class SearchCache(LRUCache):
+    """
+    Cache of results of search in knowledge bases. Key of cache is (project, knowledge base, normalized text query,
+    limit, filters, columns, relevance threshold). Case of text query and whitespaces in it are ignored.
+
+    Results of knowledge base are invalidated when data is inserted into it using the same connection.
+    """
+
+    def __init__(self, ttl: float = 300, max_size: int = 50 * 2 ** 20):
+        super().__init__(ttl=ttl, max_size=max_size, sizeof=_result_size)
+
+    @staticmethod
+    def kb_tag(project: str, knowledge_base: str) -> str:
+        return f'{project}.{knowledge_base}'.lower()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return ' '.join(str(query).lower().split())
+
+    def search_key(self, project: str, knowledge_base: str, query: str, limit: int = None, filters: dict = None,
+                   columns: list = None, relevance_threshold: float = None) -> tuple:
+        return (
+            self.kb_tag(project, knowledge_base),
+            self.normalize_query(query),
+            limit,
+            json.dumps(filters, sort_keys=True, default=str),
+            tuple(columns or ()),
+            relevance_threshold,
+        )
+
+    def get_result(self, key: tuple) -> pd.DataFrame:
+        result = self.get(key)
+        if result is not None:
+            # don't let to modify cached result
+            result = result.copy()
+        return result
+
+    def set_result(self, key: tuple, result: pd.DataFrame):
+        if result is None:
+            return
+        # the first item of key is tag of knowledge base
+        self.set(key, result.copy(), tags=[key[0]])
+
+    def invalidate_kb(self, project: str, knowledge_base: str) -> int:
+        return self.invalidate(self.kb_tag(project, knowledge_base))
+
+
+def _row_hashes(df: pd.DataFrame) -> list:
+    try:
+        return pd.util.hash_pandas_object(df, index=False).tolist()
+    except TypeError:
+        # unhashable values (lists, dicts)
+        return [
+            hashlib.sha256(json.dumps(row, sort_keys=True, default=str).encode()).hexdigest()
+            for row in df.to_dict('records')
+        ]
+
+
+class PredictionCache(LRUCache):
+    """
+    Cache of predictions of models. Key of cache is (project, model, version, parameters of prediction, input row),
+    value is row of prediction.
+
+    Only rows which are not found in cache are sent to model, predictions of all versions of model are invalidated
+    when model is retrained, fine-tuned, dropped or its active version is changed using this connection.
+    """
+
+    def __init__(self, ttl: float = 300, max_items: int = 100000):
+        # size of items is not tracked, cache is limited by count of rows
+        super().__init__(ttl=ttl, max_items=max_items, sizeof=lambda value: 0)
+
+    @staticmethod
+    def model_tag(project: str, model: str) -> str:
+        return f'{project}.{model}'.lower()
+
+    def invalidate_model(self, project: str, model: str) -> int:
+        return self.invalidate(self.model_tag(project, model))
+
+    def predict(self, df: pd.DataFrame, predict: Callable[[pd.DataFrame], pd.DataFrame],
+                project: str, model: str, version: int = None, params: dict = None) -> pd.DataFrame:
+        """
+        Returns predictions for rows of dataframe, rows which are not cached are predicted using `predict` function
+
+        :param df: input of model
+        :param predict: function to get predictions for dataframe
+        :param project: name of project
+        :param model: name of model
+        :param version: version of model
+        :param params: parameters of prediction
+        :return: dataframe with predictions, in the same order as input rows
+        """
+        if len(df) == 0:
+            return predict(df)
+
+        prefix = (
+            project, model, version,
+            json.dumps(params or {}, sort_keys=True, default=str),
+            tuple(df.columns)
+        )
+        keys = [prefix + (row_hash,) for row_hash in _row_hashes(df)]
+        rows = [self.get(key) for key in keys]
+
+        # key -> position of the first row with the key, to send every missed row once
+        missed = {}
+        for position, (key, row) in enumerate(zip(keys, rows)):
+            if row is None and key not in missed:
+                missed[key] = position
+
+        if not missed:
+            return pd.DataFrame(rows, columns=list(rows[0].keys()))
+
+        result = predict(df.iloc[list(missed.values())])
+        if len(result) != len(missed):
+            # model doesn't return one row per input row (for example, forecast), predictions can't be cached
+            if len(missed) == len(df):
+                return result
+            return predict(df)
+
+        tags = [self.model_tag(project, model)]
+        predicted = dict(zip(missed, result.to_dict('records')))
+        for key, row in predicted.items():
+            self.set(key, row, tags=tags)
+
+        if len(missed) == len(df):
+            # all rows were predicted
+            return result
+
+        rows = [predicted[key] if row is None else row for key, row in zip(keys, rows)]
+        return pd.DataFrame(rows, columns=list(result.columns))
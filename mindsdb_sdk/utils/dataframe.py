@@ -0,0 +1,229 @@
+import os
+from typing import Iterator, List, Union
+
+import numpy as np
+import pandas as pd
+
+
+DTYPE_BACKENDS = ('numpy', 'numpy_nullable')
+
+# formats of files which can be read by blocks, by extension
+FILE_FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet'}
+
+# type names which can be returned by server, mapped to kind of column
+TYPE_KINDS = {
+    'int': 'int', 'integer': 'int', 'bigint': 'int', 'smallint': 'int', 'tinyint': 'int', 'long': 'int',
+    'float': 'float', 'double': 'float', 'real': 'float', 'decimal': 'float', 'numeric': 'float',
+    'bool': 'bool', 'boolean': 'bool',
+    'str': 'str', 'string': 'str', 'text': 'str', 'varchar': 'str', 'char': 'str',
+    'date': 'datetime', 'datetime': 'datetime', 'timestamp': 'datetime',
+}
+
+NUMPY_DTYPES = {'int': 'int64', 'float': 'float64', 'bool': 'bool', 'str': 'str'}
+NULLABLE_DTYPES = {'int': 'Int64', 'float': 'Float64', 'bool': 'boolean', 'str': 'string'}
+
+
+def _type_kind(type_name) -> str:
+    if not isinstance(type_name, str):
+        return None
+    # 'varchar(255)' -> 'varchar'
+    type_name = type_name.lower().split('(')[0].strip()
+    return TYPE_KINDS.get(type_name)
+
+
+def _transpose(rows: list, columns_count: int) -> List[np.ndarray]:
+    # single pass in numpy instead of python loop over rows, cells are kept as is (including lists and dicts)
+    data = np.empty((len(rows), columns_count), dtype=object)
+    try:
+        data[:] = rows
+    except ValueError:
+        # rows with different length
+        data = np.array([list(row) + [None] * (columns_count - len(row)) for row in rows], dtype=object)
+        data = data.reshape(len(rows), columns_count)
+    return [data[:, i] for i in range(columns_count)]
+
+
+def _to_object_array(values) -> np.ndarray:
+    if isinstance(values, np.ndarray):
+        return values
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = values
+    return arr
+
+
+def _convert_column(values: np.ndarray, kind: str = None, dtype_backend: str = 'numpy') -> pd.Series:
+    if kind == 'datetime':
+        try:
+            return pd.to_datetime(pd.Series(values))
+        except (ValueError, TypeError):
+            # keep values as they are
+            kind = None
+
+    if kind in ('int', 'bool') and dtype_backend == 'numpy' and pd.isna(values).any():
+        # numpy dtypes can't keep nulls, infer type from values
+        kind = None
+
+    if kind == 'str' and dtype_backend == 'numpy' and pd.isna(values).any():
+        # astype('str') converts nulls to 'None' strings in pandas < 3, convert only not null values
+        series = pd.Series(values, dtype=object)
+        not_null = series.notna()
+        series[not_null] = series[not_null].astype(str)
+        series[~not_null] = None
+        return series.infer_objects()
+
+    if kind is not None:
+        dtypes = NULLABLE_DTYPES if dtype_backend == 'numpy_nullable' else NUMPY_DTYPES
+        try:
+            return pd.Series(values).astype(dtypes[kind])
+        except (ValueError, TypeError):
+            # for example: int column with nulls can't be converted to numpy int64
+            pass
+
+    if dtype_backend == 'numpy_nullable':
+        return pd.Series(pd.array(values))
+    return pd.Series(values).infer_objects()
+
+
+def _to_categorical(values: np.ndarray, threshold: float) -> pd.Series:
+    # returns None if values are not low-cardinality strings
+    if len(values) == 0 or pd.api.types.infer_dtype(values, skipna=True) != 'string':
+        return None
+    categorical = pd.Categorical(values)
+    if len(categorical.categories) > threshold * len(values):
+        return None
+    return pd.Series(categorical)
+
+
+def build_dataframe(
+    column_names: list,
+    rows: list = None,
+    columns_data: list = None,
+    column_types: list = None,
+    dtype_backend: str = None,
+    categorical_threshold: float = None
+) -> pd.DataFrame:
+    """
+    Builds dataframe from result of query. Data is processed by columns: dtype is inferred for every column separately
+
+    :param column_names: names of columns
+    :param rows: data as list of rows
+    :param columns_data: data as list of columns, alternative to rows
+    :param column_types: types of columns provided by server, optional. Used instead of inference if type is known
+    :param dtype_backend: 'numpy' (default) or 'numpy_nullable': use pandas nullable dtypes (Int64, Float64, boolean, string).
+        Numeric columns with nulls are kept as Int64/Float64 instead of conversion to float64 or object
+    :param categorical_threshold: convert string columns to categorical
+       if ratio of unique values to rows count is not bigger than this value, optional
+    :return: dataframe
+    """
+    if dtype_backend is None:
+        dtype_backend = 'numpy'
+    if dtype_backend not in DTYPE_BACKENDS:
+        raise ValueError(f'Unknown dtype_backend: {dtype_backend}, expected one of: {DTYPE_BACKENDS}')
+
+    columns_count = len(column_names)
+    if columns_data is None:
+        rows = rows or []
+        if column_types is None and dtype_backend == 'numpy' and categorical_threshold is None:
+            # pandas transposes rows and infers types of columns in the same way
+            return pd.DataFrame(rows, columns=column_names)
+        columns_data = _transpose(rows, columns_count)
+
+    if column_types is None:
+        column_types = [None] * columns_count
+
+    columns = {}
+    for i, values in enumerate(columns_data):
+        values = _to_object_array(values)
+        kind = _type_kind(column_types[i])
+
+        column = None
+        if categorical_threshold is not None and kind in (None, 'str'):
+            column = _to_categorical(values, categorical_threshold)
+        if column is None:
+            column = _convert_column(values, kind, dtype_backend)
+        columns[i] = column
+
+    # column names can be not unique, set them after creation
+    df = pd.DataFrame(columns, columns=range(columns_count))
+    df.columns = column_names
+    return df
+
+
+def arrow_to_dataframe(table, dtype_backend: str = None) -> pd.DataFrame:
+    """
+    Converts pyarrow.Table to dataframe. Dictionary-encoded columns of table become categoricals
+
+    :param table: pyarrow.Table
+    :param dtype_backend: 'numpy' (default) or 'numpy_nullable', see :func:`build_dataframe`
+    :return: dataframe
+    """
+    if dtype_backend == 'numpy_nullable':
+        import pyarrow as pa
+
+        nullable_types = {
+            pa.int8(): pd.Int8Dtype(), pa.int16(): pd.Int16Dtype(),
+            pa.int32(): pd.Int32Dtype(), pa.int64(): pd.Int64Dtype(),
+            pa.uint8(): pd.UInt8Dtype(), pa.uint16(): pd.UInt16Dtype(),
+            pa.uint32(): pd.UInt32Dtype(), pa.uint64(): pd.UInt64Dtype(),
+            pa.float32(): pd.Float32Dtype(), pa.float64(): pd.Float64Dtype(),
+            pa.bool_(): pd.BooleanDtype(),
+            pa.string(): pd.StringDtype(), pa.large_string(): pd.StringDtype(),
+        }
+        return table.to_pandas(types_mapper=nullable_types.get)
+    return table.to_pandas()
+
+
+def dataframe_to_arrow(df: pd.DataFrame):
+    """
+    Converts dataframe to pyarrow.Table, index is not stored
+    """
+    import pyarrow as pa
+
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def iter_csv(df: pd.DataFrame, block_rows: int = 10000) -> Iterator[bytes]:
+    """
+    Encodes dataframe to csv by blocks of rows. Joined blocks are the same as df.to_csv(index=False).
+
+    :param df: dataframe
+    :param block_rows: count of rows in block
+    :return: iterator of encoded blocks
+    """
+    if len(df) == 0:
+        yield df.to_csv(index=False).encode('utf-8')
+        return
+    for start in range(0, len(df), block_rows):
+        block = df.iloc[start: start + block_rows]
+        yield block.to_csv(index=False, header=start == 0).encode('utf-8')
+
+
+def read_file_blocks(path: Union[str, os.PathLike], block_rows: int = 10000,
+                     file_format: str = None) -> Iterator[pd.DataFrame]:
+    """
+    Reads file by blocks of rows, not more than one block is in memory at the same time
+
+    :param path: path to csv, jsonl or parquet file
+    :param block_rows: count of rows in block
+    :param file_format: 'csv', 'jsonl' or 'parquet', by default it is defined by extension of file
+    :return: iterator of dataframes
+    """
+    if file_format is None:
+        ext = os.path.splitext(str(path))[1].lower()
+        file_format = FILE_FORMATS.get(ext)
+        if file_format is None:
+            raise ValueError(f'Unknown format of file: {path}, expected one of: {list(FILE_FORMATS)}')
+
+    if file_format == 'csv':
+        with pd.read_csv(path, chunksize=block_rows) as reader:
+            yield from reader
+    elif file_format == 'jsonl':
+        with pd.read_json(path, lines=True, chunksize=block_rows) as reader:
+            yield from reader
+    elif file_format == 'parquet':
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=block_rows):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f'Unknown file format: {file_format}, expected one of: {sorted(set(FILE_FORMATS.values()))}')
@@ -1,8 +1,43 @@
 import re
-from typing import Iterable
+from typing import Callable, Iterable
 
 
 class CollectionBase:
+    """
+    Base class of collections of objects.
+
+    Collection can keep index of its objects (name -> object) in metadata cache of connection
+    to not request list of objects from server on every `get`. Cache is disabled by default,
+    see :meth:`~mindsdb_sdk.server.Server.enable_metadata_cache`
+    """
+
+    def _metadata_key(self) -> tuple:
+        # key of index of the collection in metadata cache
+        return (self.__class__.__name__,)
+
+    def _metadata_cache(self):
+        return getattr(self.api, 'metadata_cache', None)
+
+    def _metadata_index(self, load: Callable):
+        """
+        Returns index of objects from metadata cache or loads it using `load` function
+        """
+        cache = self._metadata_cache()
+        if cache is None:
+            return load()
+
+        key = self._metadata_key()
+        index = cache.get(key)
+        if index is None:
+            index = load()
+            cache.set(key, index)
+        return index
+
+    def _invalidate_metadata(self):
+        # objects of collection were changed
+        cache = self._metadata_cache()
+        if cache is not None:
+            cache.remove(self._metadata_key())
 
     def __dir__(self) -> Iterable[str]:
         internal_methods = ['create', 'drop', 'get', 'list']
@@ -1,4 +1,9 @@
-from mindsdb_sql_parser.ast import BinaryOperation, Identifier, Constant, Select, Star, NativeQuery
+from typing import List
+
+import numpy as np
+import pandas as pd
+from mindsdb_sql_parser.ast import BinaryOperation, Identifier, Constant, Select, Star, NativeQuery, Insert
+from mindsdb_sql_parser.ast import NullConstant, Tuple
 from mindsdb_sdk.query import Query
 
 
@@ -12,6 +17,50 @@ def dict_to_binary_op(filters):
     return where
 
 
+# operators which can be used in filters
+FILTER_OPERATORS = ('=', '!=', '>', '>=', '<', '<=', 'in', 'not in', 'like')
+
+
+def _filter_condition(name: str, op: str, value) -> BinaryOperation:
+    op = op.lower()
+    if op not in FILTER_OPERATORS:
+        raise ValueError(f'Unknown operator in filter of {name}: {op}, expected one of: {FILTER_OPERATORS}')
+    if op in ('in', 'not in'):
+        if not isinstance(value, (list, tuple, set)):
+            raise ValueError(f'Value of "{op}" filter of {name} has to be list')
+        return BinaryOperation(op, args=[Identifier(name), Tuple(items=[Constant(v) for v in value])])
+    if value is None and op in ('=', '!='):
+        return BinaryOperation('is' if op == '=' else 'is not', args=[Identifier(name), NullConstant()])
+    return BinaryOperation(op, args=[Identifier(name), Constant(value)])
+
+
+def filters_to_binary_op(filters: dict):
+    """
+    Converts filters to condition of WHERE clause, conditions are joined by AND:
+
+    - scalar value: column = value (column IS NULL for None)
+    - list, tuple or set: column IN (values)
+    - dict of operators and values: {'>=': 1, '<': 10} -> column >= 1 AND column < 10
+
+    >>> filters_to_binary_op({'author': 'bob', 'tenant': ['a', 'b'], 'year': {'>=': 2020, '<': 2024}})
+
+    :param filters: dict with column -> value
+    :return: BinaryOperation or None if filters are empty
+    """
+    where = None
+    for name, value in filters.items():
+        if isinstance(value, dict):
+            if len(value) == 0:
+                raise ValueError(f'Empty filter of {name}')
+            for op, op_value in value.items():
+                where = add_condition(where, _filter_condition(name, op, op_value))
+        elif isinstance(value, (list, tuple, set)):
+            where = add_condition(where, _filter_condition(name, 'in', value))
+        else:
+            where = add_condition(where, _filter_condition(name, '=', value))
+    return where
+
+
 def add_condition(where, condition):
     if where is None:
         return condition
@@ -29,4 +78,63 @@ def query_to_native_query(query: Query):
             integration=Identifier(query.database),
             query=query.sql
         )
-    )
\ No newline at end of file
+    )
+
+# types of values which are rendered by repr in the same way as Insert.to_value does
+_REPR_TYPES = frozenset([str, int, float, bool, type(None)])
+
+
+def _render_datetimes(column: pd.Series) -> list:
+    # the same as repr of Timestamp: "Timestamp('2020-01-01 00:00:00')"
+    rendered = ("Timestamp('" + column.dt.strftime('%Y-%m-%d %H:%M:%S') + "')").tolist()
+
+    # values which can't be rendered by strftime: NaT, with fractions of second, with year of not 4 digits
+    other = (
+        column.isna()
+        | (column.dt.microsecond != 0)
+        | (column.dt.nanosecond != 0)
+        | (column.dt.year < 1000)
+        | (column.dt.year > 9999)
+    ).to_numpy()
+    if other.any():
+        for i in np.flatnonzero(other):
+            rendered[i] = repr(column.iloc[i])
+    return rendered
+
+
+def _render_column(column: pd.Series) -> list:
+    dtype = column.dtype
+    if isinstance(dtype, np.dtype):
+        if dtype.kind in 'iufb':
+            # numpy numbers: tolist converts them to python numbers as to_dict does
+            return list(map(repr, column.tolist()))
+        if dtype.kind == 'M':
+            return _render_datetimes(column)
+
+    if dtype.kind not in 'mM':
+        values = column.tolist()
+        if set(map(type, values)) <= _REPR_TYPES:
+            return list(map(repr, values))
+
+    # other types (nullable, timezone, numpy scalars inside of object column, ast nodes, ...):
+    # convert values in the same way as dataframe is converted for Insert
+    to_value = Insert(table=None).to_value
+    return [to_value(row[0]) for row in column.to_frame().to_dict('split')['data']]
+
+
+def render_values(df: pd.DataFrame) -> List[str]:
+    """
+    Renders rows of dataframe to sql tuples, the result is the same as Insert(values=...).to_string() renders:
+
+    >>> render_values(pd.DataFrame([{'a': 1, 'b': 'x'}]))
+    ["(1, 'x')"]
+
+    Values are rendered by columns, it is much faster than rendering of every value of dataframe using ast
+
+    :param df: dataframe
+    :return: list of rendered rows
+    """
+    if len(df.columns) == 0:
+        return ['()'] * len(df)
+    columns = [_render_column(df.iloc[:, i]) for i in range(len(df.columns))]
+    return ['(' + row + ')' for row in map(', '.join, zip(*columns))]
@@ -0,0 +1,187 @@
+"""
+Local manifests of data which was sent to server.
+
+Manifest of knowledge base is sqlite database with table: manifest(id, hash) - hash of content of every row
+which was sent to server. Rows of the next synchronization are compared with it: only new and changed rows
+have to be sent, ids which are in manifest but not in new data were deleted.
+
+Manifest of uploaded files is sqlite database with table: files(hash, name) - name of uploaded file by hash
+of its content, file with the same content is not uploaded again.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Iterable, List
+
+import pandas as pd
+
+from .cache import _row_hashes
+
+DEFAULT_SYNC_DIR = os.path.join(os.path.expanduser('~'), '.mindsdb_sdk', 'sync')
+
+
+def manifest_path(url: str, project: str, knowledge_base: str, sync_dir: str = None) -> str:
+    """
+    Default path of manifest of knowledge base
+
+    :param url: url of server
+    :param project: name of project
+    :param knowledge_base: name of knowledge base
+    :param sync_dir: directory of manifests, default DEFAULT_SYNC_DIR
+    :return: path to sqlite file
+    """
+    key = hashlib.sha256(json.dumps([url, project, knowledge_base]).encode()).hexdigest()[:16]
+    return os.path.join(sync_dir or DEFAULT_SYNC_DIR, project, f'{knowledge_base}-{key}.sqlite')
+
+
+def files_manifest_path(url: str, sync_dir: str = None) -> str:
+    """
+    Default path of manifest of files uploaded to server
+
+    :param url: url of server
+    :param sync_dir: directory of manifests, default DEFAULT_SYNC_DIR
+    :return: path to sqlite file
+    """
+    key = hashlib.sha256(json.dumps([url]).encode()).hexdigest()[:16]
+    return os.path.join(sync_dir or DEFAULT_SYNC_DIR, f'files-{key}.sqlite')
+
+
+def content_hashes(df: pd.DataFrame) -> List[str]:
+    """
+    Hashes of rows of dataframe, computed by columns. Order of columns doesn't change hash
+
+    :param df: dataframe
+    :return: list of hashes as strings
+    """
+    df = df[sorted(df.columns, key=str)]
+    return [str(value) for value in _row_hashes(df)]
+
+
+class SyncManifest:
+    """
+    Hashes of rows which were sent to knowledge base.
+
+    Changes are accumulated during synchronization and saved to manifest by `commit`,
+    if synchronization failed only changes of rows which were inserted are saved.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('CREATE TABLE IF NOT EXISTS manifest (id TEXT PRIMARY KEY, hash TEXT NOT NULL)')
+        # state of current synchronization
+        self.conn.execute('CREATE TEMP TABLE pending (id TEXT PRIMARY KEY, hash TEXT NOT NULL)')
+        self.conn.execute('CREATE TEMP TABLE seen (id TEXT PRIMARY KEY)')
+        self.conn.execute('CREATE TEMP TABLE block (pos INTEGER, id TEXT, hash TEXT)')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute('SELECT count(*) FROM manifest').fetchone()[0]
+
+    def changed(self, ids: List[str], hashes: List[str]) -> List[bool]:
+        """
+        Compares rows with manifest, changed rows are added to pending changes
+
+        :param ids: ids of rows
+        :param hashes: hashes of rows
+        :return: mask of rows which are new or changed
+        """
+        conn = self.conn
+        conn.execute('DELETE FROM block')
+        conn.executemany('INSERT INTO block VALUES (?, ?, ?)', zip(range(len(ids)), ids, hashes))
+        conn.execute('INSERT OR IGNORE INTO seen SELECT id FROM block')
+        positions = {
+            pos for pos, in conn.execute(
+                'SELECT b.pos FROM block b LEFT JOIN manifest m ON m.id = b.id '
+                'WHERE m.hash IS NULL OR m.hash != b.hash'
+            )
+        }
+        conn.execute(
+            'INSERT OR REPLACE INTO pending SELECT b.id, b.hash FROM block b LEFT JOIN manifest m ON m.id = b.id '
+            'WHERE m.hash IS NULL OR m.hash != b.hash ORDER BY b.pos'
+        )
+        return [pos in positions for pos in range(len(ids))]
+
+    def missing(self) -> List[str]:
+        """
+        :return: ids which are in manifest but were not passed to `changed` in current synchronization
+        """
+        return [
+            row[0] for row in self.conn.execute(
+                'SELECT id FROM manifest WHERE id NOT IN (SELECT id FROM seen) ORDER BY id'
+            )
+        ]
+
+    def commit(self, deleted: List[str] = None, ids: Iterable[str] = None):
+        """
+        Save pending changes to manifest
+
+        :param deleted: ids which were deleted from knowledge base
+        :param ids: save only pending changes of these ids, other pending changes are discarded
+        """
+        conn = self.conn
+        with conn:
+            if ids is None:
+                conn.execute('INSERT OR REPLACE INTO manifest SELECT id, hash FROM pending')
+            else:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO manifest SELECT id, hash FROM pending WHERE id = ?',
+                    [(i,) for i in ids]
+                )
+            if deleted:
+                conn.executemany('DELETE FROM manifest WHERE id = ?', [(i,) for i in deleted])
+        self.reset()
+
+    def reset(self):
+        """
+        Discard pending changes
+        """
+        self.conn.execute('DELETE FROM pending')
+        self.conn.execute('DELETE FROM seen')
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class FilesManifest:
+    """
+    Names of files uploaded to server by hashes of their content
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('CREATE TABLE IF NOT EXISTS files (hash TEXT PRIMARY KEY, name TEXT NOT NULL)')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get(self, content_hash: str) -> str:
+        """
+        :return: name of uploaded file with this content, None if it wasn't uploaded
+        """
+        row = self.conn.execute('SELECT name FROM files WHERE hash = ?', (content_hash,)).fetchone()
+        return None if row is None else row[0]
+
+    def add(self, content_hash: str, name: str):
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO files VALUES (?, ?)', (content_hash, name))
+
+    def close(self):
+        self.conn.close()
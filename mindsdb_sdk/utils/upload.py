@@ -0,0 +1,148 @@
+import io
+import zlib
+from typing import Iterable, Iterator
+
+import pandas as pd
+
+from mindsdb_sdk.utils.dataframe import iter_csv
+
+# format -> extension of uploaded file, server recognizes type of file by extension
+UPLOAD_FORMATS = {
+    'csv': 'csv',
+    'csv.gz': 'csv.gz',
+    'csv.zst': 'csv.zst',
+    'parquet': 'parquet',
+    'arrow': 'arrow',
+}
+
+# formats which are accepted by files database of mindsdb server
+DEFAULT_UPLOAD_FORMATS = ('csv', 'parquet')
+
+# order of formats for automatic choice
+AUTO_FORMATS = ('parquet', 'csv.zst', 'csv.gz', 'arrow')
+
+# smaller dataframes are always uploaded as csv
+AUTO_FORMAT_MIN_SIZE = 1 << 20
+
+# count of rows which are encoded at once
+ENCODE_BLOCK_ROWS = 100000
+
+
+def _is_available(file_format: str) -> bool:
+    # optional dependency of format is installed
+    module = {'parquet': 'pyarrow', 'arrow': 'pyarrow', 'csv.zst': 'zstandard'}.get(file_format)
+    if module is None:
+        return True
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+def choose_upload_format(df: pd.DataFrame, formats: Iterable[str] = DEFAULT_UPLOAD_FORMATS) -> str:
+    """
+    Chooses format to upload dataframe: csv for small dataframes,
+    otherwise the first format from AUTO_FORMATS which is supported by server and can be encoded
+
+    :param df: dataframe
+    :param formats: formats supported by server
+    :return: name of format
+    """
+    if df.memory_usage(index=False, deep=True).sum() < AUTO_FORMAT_MIN_SIZE:
+        return 'csv'
+    for file_format in AUTO_FORMATS:
+        if file_format in formats and _is_available(file_format):
+            return file_format
+    return 'csv'
+
+
+def check_upload_format(file_format: str) -> str:
+    if file_format not in UPLOAD_FORMATS:
+        raise ValueError(f'Unknown upload format: {file_format}, available formats: {", ".join(UPLOAD_FORMATS)}')
+    return file_format
+
+
+class _BlockSink(io.RawIOBase):
+    # collects blocks written by pyarrow writers
+    def __init__(self):
+        super().__init__()
+        self._blocks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data) -> int:
+        self._blocks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def take(self) -> bytes:
+        data = b''.join(self._blocks)
+        self._blocks = []
+        return data
+
+
+def _iter_arrow(df: pd.DataFrame, file_format: str, block_rows: int) -> Iterator[bytes]:
+    import pyarrow as pa
+
+    # schema is inferred from all rows, to be the same for all blocks
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    sink = _BlockSink()
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(sink, schema, compression='zstd')
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    with writer:
+        for start in range(0, len(df), block_rows):
+            block = pa.Table.from_pandas(df.iloc[start: start + block_rows], schema=schema, preserve_index=False)
+            writer.write_table(block)
+            data = sink.take()
+            if data:
+                yield data
+    yield sink.take()
+
+
+def _iter_compressed(blocks: Iterable[bytes], compressor) -> Iterator[bytes]:
+    for block in blocks:
+        data = compressor.compress(block)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def encode_dataframe(df: pd.DataFrame, file_format: str, block_rows: int = ENCODE_BLOCK_ROWS) -> Iterator[bytes]:
+    """
+    Encodes dataframe to file of format by blocks of rows
+
+    - csv: plain csv
+    - csv.gz, csv.zst: compressed csv
+    - parquet: parquet file with zstd compression of columns, dtypes of columns are kept
+    - arrow: arrow ipc stream, dtypes of columns are kept
+
+    :param df: dataframe
+    :param file_format: name of format
+    :param block_rows: count of rows which are encoded at once
+    :return: iterator of bytes blocks
+    """
+    check_upload_format(file_format)
+
+    if file_format in ('parquet', 'arrow'):
+        return _iter_arrow(df, file_format, block_rows)
+
+    blocks = iter_csv(df, block_rows=block_rows)
+    if file_format == 'csv.gz':
+        # gzip container
+        return _iter_compressed(blocks, zlib.compressobj(wbits=31))
+    if file_format == 'csv.zst':
+        import zstandard
+
+        return _iter_compressed(blocks, zstandard.ZstdCompressor().compressobj())
+    return blocks
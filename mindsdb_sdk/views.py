@@ -2,7 +2,9 @@ from typing import List, Union
 
 from mindsdb_sql_parser.ast.mindsdb import CreateView
 from mindsdb_sql_parser.ast import DropView
-from mindsdb_sql_parser.ast import Identifier
+from mindsdb_sql_parser.ast import Identifier, Select
+
+from mindsdb_sdk.utils.sql import dict_to_binary_op
 
 from mindsdb_sdk.utils.objects_collection import CollectionBase
 
@@ -76,7 +78,34 @@ class Views(CollectionBase):
 
     # The same as table
     def _list_views(self):
+        return self._metadata_index(self._load_views)
+
+    def _load_views(self):
         df = self.api.objects_tree(self.project.name)
+        return self._names_from_tree(df)
+
+    def _metadata_key(self) -> tuple:
+        return (self.__class__.__name__, self.project.name)
+
+    @staticmethod
+    def _get_sql(project_name: str, name: str) -> str:
+        # lookup of one view, it doesn't list all objects of project
+        ast_query = Select(
+            targets=[Identifier('TABLE_NAME')],
+            from_table=Identifier(parts=['information_schema', 'tables']),
+            where=dict_to_binary_op({'TABLE_SCHEMA': project_name, 'TABLE_NAME': name, 'TABLE_TYPE': 'VIEW'})
+        )
+        return ast_query.to_string()
+
+    @staticmethod
+    def _names_from_df(df) -> List[str]:
+        if df is None or len(df) == 0:
+            return []
+        # first column
+        return list(df[df.columns[0]])
+
+    @staticmethod
+    def _names_from_tree(df) -> List[str]:
         df = df[df.type == 'view']
 
         return list(df['name'])
@@ -98,6 +127,12 @@ class Views(CollectionBase):
         :param database: datasource of the view (where input sql will be executed)
         :return: View object
         """
+        self.project.query(self._create_sql(name, sql, database)).fetch()
+        self._invalidate_metadata()
+        return View(self.project, name)
+
+    @staticmethod
+    def _create_sql(name: str, sql: Union[str, Query], database: str = None) -> str:
         if isinstance(sql, Query):
             database = sql.database
             sql = sql.sql
@@ -111,9 +146,7 @@ class Views(CollectionBase):
             query_str=sql,
             from_table=database
         )
-
-        self.project.query(ast_query.to_string()).fetch()
-        return View(self.project, name)
+        return ast_query.to_string()
 
     def drop(self, name: str):
         """
@@ -125,6 +158,7 @@ class Views(CollectionBase):
         ast_query = DropView(names=[Identifier(name)])
 
         self.project.query(ast_query.to_string()).fetch()
+        self._invalidate_metadata()
 
     def get(self, name: str) -> View:
         """
@@ -134,6 +168,10 @@ class Views(CollectionBase):
         :return: View object
         """
 
-        if name not in self._list_views():
+        if self._metadata_cache() is not None:
+            names = self._list_views()
+        else:
+            names = self._names_from_df(self.api.sql_query(self._get_sql(self.project.name, name)))
+        if name not in names:
             raise AttributeError("View doesn't exist")
         return View(self.project, name)
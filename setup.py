@@ -26,7 +26,16 @@ setup(
     extras_require={
         'dev': [
             'pytest',
-        ]
+        ],
+        'async': [
+            'aiohttp',
+        ],
+        'arrow': [
+            'pyarrow',
+        ],
+        'zstd': [
+            'zstandard',
+        ],
     },
     classifiers=[
         "Programming Language :: Python :: 3",
@@ -0,0 +1,40 @@
+from unittest.mock import Mock
+
+import pandas as pd
+
+
+def json_response(data) -> Mock:
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = data
+    return response
+
+
+def ok_response() -> Mock:
+    return json_response({'type': 'ok'})
+
+
+def table_response(columns, rows) -> Mock:
+    return json_response({'type': 'table', 'column_names': columns, 'data': rows})
+
+
+def response_mock(mock, data):
+    if isinstance(data, pd.DataFrame):
+        # to sql/query format (mostly used)
+        pd_data = data.to_dict('split')
+        data = {
+            'type': 'table',
+            'column_names': pd_data['columns'],
+            'data': pd_data['data']
+        }
+
+    def side_effect(*args, **kwargs):
+        return json_response(data)
+    mock.side_effect = side_effect
+
+
+def sql_calls(mock_post) -> list:
+    """
+    Queries which were sent to /api/sql/query
+    """
+    return [call[1]['json']['query'] for call in mock_post.call_args_list if 'json' in call[1]]
@@ -0,0 +1,66 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+HTTP_METHODS = ('GET', 'POST', 'PUT', 'DELETE')
+
+
+class LocalServer:
+    """
+    Local http server for tests, it is running in background thread inside of `with` block.
+    Requests are handled by methods of subclass: do_GET, do_POST, do_PUT, do_DELETE,
+    they receive request handler (BaseHTTPRequestHandler) as argument
+    """
+
+    protocol_version = 'HTTP/1.0'
+
+    def __init__(self):
+        test_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = test_server.protocol_version
+
+            def log_message(self, *args):
+                pass
+
+        for method in HTTP_METHODS:
+            callback = getattr(self, f'do_{method}', None)
+            if callback is not None:
+                setattr(Handler, f'do_{method}', lambda handler, callback=callback: callback(handler))
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def read_body(request: BaseHTTPRequestHandler) -> bytes:
+    """
+    Read body of request, sent with content length or by chunks
+    """
+    if request.headers.get('Transfer-Encoding') != 'chunked':
+        return request.rfile.read(int(request.headers.get('Content-Length', 0)))
+
+    body = b''
+    while True:
+        size = int(request.rfile.readline().strip(), 16)
+        chunk = request.rfile.read(size + 2)[:-2]
+        if size == 0:
+            return body
+        body += chunk
+
+
+def respond(request: BaseHTTPRequestHandler, body=b'', status=200, content_type='application/json'):
+    if isinstance(body, str):
+        body = body.encode()
+    request.send_response(status)
+    request.send_header('Content-Type', content_type)
+    request.send_header('Content-Length', str(len(body)))
+    request.end_headers()
+    request.wfile.write(body)
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+import pandas as pd
+
+pa = pytest.importorskip('pyarrow')
+import pyarrow.parquet as pq
+
+import mindsdb_sdk
+from mindsdb_sdk.connectors.decoders import RESULT_FORMATS
+from tests.local_server import LocalServer, read_body, respond
+
+
+DATA = pd.DataFrame({
+    'ID': [1, 2, 3],
+    'Name': ['a', None, 'c'],
+    'Value': [1.5, 2.5, None],
+})
+
+
+def arrow_body(df):
+    sink = pa.BufferOutputStream()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def parquet_body(df):
+    sink = pa.BufferOutputStream()
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), sink)
+    return sink.getvalue().to_pybytes()
+
+
+class StandInServer(LocalServer):
+    """
+    Local http server with /api/sql/query endpoint, responds in format which is requested by Accept header.
+    If binary formats are not supported, it always responds with json
+    """
+
+    def __init__(self, binary=True):
+        super().__init__()
+        self.binary = binary
+        self.accept_headers = []
+
+    def do_POST(self, request):
+        body = json.loads(read_body(request))
+        accept = request.headers.get('Accept', '')
+        self.accept_headers.append(accept)
+
+        if body['query'] == 'error':
+            respond(request, json.dumps({'type': 'error', 'error_message': 'wrong'}))
+        elif self.binary and RESULT_FORMATS['arrow'] in accept:
+            respond(request, arrow_body(DATA), content_type=RESULT_FORMATS['arrow'])
+        elif self.binary and RESULT_FORMATS['parquet'] in accept:
+            respond(request, parquet_body(DATA), content_type=RESULT_FORMATS['parquet'])
+        else:
+            data = DATA.astype(object).where(DATA.notna(), None).to_dict('split')
+            response = {'type': 'table', 'column_names': data['columns'], 'data': data['data']}
+            respond(request, json.dumps(response))
+
+
+@pytest.mark.parametrize('binary', [True, False])
+def test_fetch_arrow(binary):
+    with StandInServer(binary=binary) as stand_in:
+        server = mindsdb_sdk.connect(stand_in.url)
+
+        table = server.query('select * from t').fetch(format='arrow')
+        assert isinstance(table, pa.Table)
+        assert table.column_names == ['ID', 'Name', 'Value']
+        assert table.column('ID').to_pylist() == [1, 2, 3]
+        assert table.column('Name').to_pylist() == ['a', None, 'c']
+        assert RESULT_FORMATS['arrow'] in stand_in.accept_headers[-1]
+
+        # dataframe is returned by default, binary format is not requested
+        df = server.query('select * from t').fetch()
+        assert isinstance(df, pd.DataFrame)
+        assert RESULT_FORMATS['arrow'] not in stand_in.accept_headers[-1]
+
+        with pytest.raises(RuntimeError):
+            server.query('error').fetch(format='arrow')
+
+
+@pytest.mark.parametrize('result_format', ['arrow', 'parquet'])
+def test_result_format(result_format):
+    with StandInServer() as stand_in:
+        server = mindsdb_sdk.connect(stand_in.url, result_format=result_format)
+
+        df = server.query('select * from t').fetch()
+        assert RESULT_FORMATS[result_format] in stand_in.accept_headers[-1]
+        assert list(df['ID']) == [1, 2, 3]
+        assert df['Name'][0] == 'a'
+        assert pd.isna(df['Value'][2])
+
+        # names of columns are converted for collections
+        names = server.api.sql_query('select * from t', lowercase_columns=True).columns
+        assert list(names) == ['id', 'name', 'value']
+
+        with pytest.raises(ValueError):
+            server.query('select * from t').fetch(format='xml')
@@ -0,0 +1,471 @@
+import asyncio
+import json
+import re
+import time
+
+import pytest
+import pandas as pd
+import requests
+
+aiohttp = pytest.importorskip('aiohttp')
+from aiohttp import web
+
+import mindsdb_sdk
+from mindsdb_sdk.connectors.decoders import RESULT_FORMATS
+from mindsdb_sdk.connectors.rest_api import PREDICT_SPLIT_CONTENT_TYPE
+from mindsdb_sdk.utils.batch import BatchError, BatchReport
+
+
+def table_response(df):
+    data = df.to_dict('split')
+    return {'type': 'table', 'column_names': data['columns'], 'data': data['data']}
+
+
+class FakeServer:
+    """
+    Stand-in for mindsdb http api, records received sql queries
+    """
+
+    def __init__(self):
+        self.queries = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # requests to rest api: (method, path, json body)
+        self.requests = []
+        self.files = []
+        self.uploaded_names = []
+        # name of file -> size of uploaded content
+        self.uploaded_sizes = {}
+        # content types of input of predict
+        self.predict_types = []
+        # rows with these ids are not inserted to knowledge base
+        self.fail_ids = set()
+
+        app = web.Application()
+        app.router.add_post('/api/sql/query', self.sql_query)
+        app.router.add_post('/api/projects/{project}/models/{model}/predict', self.predict)
+        app.router.add_get('/api/projects/{project}/agents/{agent}', self.agent)
+        app.router.add_post('/api/projects/{project}/agents/{agent}/completions', self.completion)
+        app.router.add_post('/api/projects/{project}/agents/{agent}/completions/stream', self.completion_stream)
+        app.router.add_get('/api/status', self.status)
+        app.router.add_post('/api/projects/{project}/agents', self.agent_change)
+        app.router.add_put('/api/projects/{project}/agents/{agent}', self.agent_change)
+        app.router.add_get('/api/projects/{project}/knowledge_bases/{kb}', self.knowledge_base)
+        app.router.add_post('/api/projects/{project}/knowledge_bases', self.record)
+        app.router.add_put('/api/projects/{project}/knowledge_bases/{kb}', self.kb_insert)
+        app.router.add_get('/api/files/', self.list_files)
+        app.router.add_put('/api/files/{name}', self.upload_file)
+        self.app = app
+
+    async def __aenter__(self):
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f'http://127.0.0.1:{port}'
+        return self
+
+    async def __aexit__(self, *args):
+        await self.runner.cleanup()
+
+    async def status(self, request):
+        return web.json_response({'mindsdb_version': '1.0'})
+
+    async def sql_query(self, request):
+        body = await request.json()
+        sql = body['query']
+        self.queries.append((sql, body['context']['db']))
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.05)
+        self.in_flight -= 1
+
+        if sql.startswith(('CREATE MODEL', 'RETRAIN', 'FINETUNE')):
+            df = pd.DataFrame([{'NAME': 'm2', 'VERSION': 2, 'STATUS': 'generating'}])
+        elif 'information_schema.databases' in sql:
+            df = pd.DataFrame([{'NAME': 'db1', 'ENGINE': 'postgres', 'CONNECTION_DATA': {}}])
+        elif 'FROM models' in sql:
+            df = pd.DataFrame([{'NAME': 'm1', 'VERSION': 1, 'STATUS': 'complete'}])
+        elif 'AS query_index' in sql:
+            # search of batch of queries in knowledge base, rows of union can come in any order
+            indexes = [int(i) for i in re.findall(r'(\d+) AS query_index', sql)]
+            df = pd.DataFrame([{'content': f'doc {i}', 'query_index': i} for i in reversed(indexes)])
+        elif sql.startswith('error'):
+            return web.json_response({'type': 'error', 'error_message': 'wrong query'})
+        else:
+            df = pd.DataFrame([{'x': 1}, {'x': 2}])
+        return web.json_response(table_response(df))
+
+    async def predict(self, request):
+        self.predict_types.append(request.content_type)
+        if request.content_type == RESULT_FORMATS['arrow']:
+            # server doesn't support arrow
+            return web.json_response({}, status=415)
+        if request.content_type == PREDICT_SPLIT_CONTENT_TYPE:
+            body = json.loads(await request.text())
+            a = body['columns'].index('a')
+            return web.json_response({'columns': ['y'], 'data': [[row[a] * 2] for row in body['rows']]})
+        body = await request.json()
+        return web.json_response([{'y': row['a'] * 2} for row in body['data']])
+
+    async def agent(self, request):
+        return web.json_response({
+            'name': request.match_info['agent'],
+            'created_at': None,
+            'updated_at': None,
+        })
+
+    async def completion(self, request):
+        body = await request.json()
+        if body['messages'][0].get('question') == 'fail':
+            return web.json_response({'detail': 'agent failed'}, status=500)
+        return web.json_response({'message': {'content': f'answer: {len(body["messages"])}'}})
+
+    async def record(self, request):
+        body = await request.json()
+        self.requests.append((request.method, request.path, body))
+        return web.json_response({})
+
+    async def agent_change(self, request):
+        body = await request.json()
+        self.requests.append((request.method, request.path, body))
+        return web.json_response(dict(body['agent'], created_at=None, updated_at=None))
+
+    async def knowledge_base(self, request):
+        return web.json_response({'name': request.match_info['kb'], 'id_column': 'id'})
+
+    async def kb_insert(self, request):
+        body = await request.json()
+        rows = body['knowledge_base'].get('rows', [])
+        if any(row['id'] in self.fail_ids for row in rows):
+            return web.json_response({'detail': 'fail'}, status=500)
+        self.requests.append((request.method, request.path, body))
+        return web.json_response({})
+
+    def kb_rows(self) -> list:
+        # ids of rows inserted to knowledge base since the previous call
+        rows = [
+            row['id']
+            for method, path, body in self.requests if path.endswith('/knowledge_bases/kb1')
+            for row in body['knowledge_base'].get('rows', [])
+        ]
+        self.requests.clear()
+        return rows
+
+    async def list_files(self, request):
+        return web.json_response([{'name': name} for name in self.files])
+
+    async def upload_file(self, request):
+        form = await request.post()
+        self.files.append(request.match_info['name'])
+        self.uploaded_names.append(form['original_file_name'])
+        self.uploaded_sizes[request.match_info['name']] = len(form['file'].file.read())
+        return web.json_response({})
+
+    async def completion_stream(self, request):
+        resp = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+        await resp.prepare(request)
+        for i in range(3):
+            await resp.write(f'data: {json.dumps({"chunk": i})}\n\n'.encode())
+        await resp.write_eof()
+        return resp
+
+
+def test_async_flow():
+
+    async def main():
+        async with FakeServer() as fake:
+            async with await mindsdb_sdk.connect_async(fake.url) as server:
+
+                assert (await server.status())['mindsdb_version'] == '1.0'
+
+                # databases and tables
+                db = await server.databases.get('db1')
+                assert db.name == 'db1'
+
+                table = await db.tables.get('t1')
+                df = await table.filter(a=1).limit(2).fetch()
+                assert list(df['x']) == [1, 2]
+                assert fake.queries[-1] == ('SELECT * FROM db1.t1 WHERE a = 1 LIMIT 2', 'mindsdb')
+
+                await table.insert(pd.DataFrame([{'a': 1}]))
+                assert fake.queries[-1][0] == 'INSERT INTO db1.t1(a) VALUES (1)'
+
+                # many queries in flight at the same time
+                queries = [db.query(f'select {i}') for i in range(20)]
+                results = await asyncio.gather(*[q.fetch() for q in queries])
+                assert len(results) == 20
+                assert fake.max_in_flight > 1
+
+                with pytest.raises(RuntimeError):
+                    await server.query('error').fetch()
+
+                # models
+                model = await server.models.get('m1')
+                pred = await model.predict(pd.DataFrame([{'a': 1}, {'a': 2}]))
+                assert list(pred['y']) == [2, 4]
+                assert await model.get_status() == 'complete'
+
+                # agents
+                agent = await server.agents.get('agent1')
+                completion = await agent.completion([{'question': 'hi', 'answer': None}])
+                assert completion.content == 'answer: 1'
+
+                chunks = [chunk async for chunk in agent.completion_stream([])]
+                assert chunks == [{'chunk': 0}, {'chunk': 1}, {'chunk': 2}]
+
+                events = [event async for event in agent.completion_stream_v2([])]
+                assert [json.loads(event.data) for event in events] == [{'chunk': 0}, {'chunk': 1}, {'chunk': 2}]
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize('predict_format', ['split', 'arrow'])
+def test_async_predict(predict_format):
+    if predict_format == 'arrow':
+        pytest.importorskip('pyarrow')
+
+    async def main():
+        async with FakeServer() as fake:
+            async with await mindsdb_sdk.connect_async(fake.url, predict_format=predict_format) as server:
+                model = await server.models.get('m1')
+                reports = []
+                pred = await model.predict(
+                    pd.DataFrame([{'a': i} for i in range(5)]), batch_size=2, max_workers=2,
+                    on_progress=reports.append
+                )
+                assert list(pred['y']) == [0, 2, 4, 6, 8]
+                assert reports[-1].rows == 5
+
+        if predict_format == 'split':
+            assert fake.predict_types == [PREDICT_SPLIT_CONTENT_TYPE] * 3
+        else:
+            # every batch falls back to records, 415 is remembered for next batches
+            assert fake.predict_types[0] == RESULT_FORMATS['arrow']
+            assert fake.predict_types.count('application/json') == 3
+            assert fake.predict_types.count(RESULT_FORMATS['arrow']) <= 2
+
+    asyncio.run(main())
+
+
+def test_async_methods():
+    # methods of sync client which send requests are coroutines in async client
+
+    async def main():
+        async with FakeServer() as fake:
+            async with await mindsdb_sdk.connect_async(fake.url) as server:
+
+                # databases
+                db = await server.databases.update('db1', {'host': 'h'})
+                assert db.name == 'db1'
+                assert any(sql.startswith('ALTER DATABASE db1') for sql, _ in fake.queries)
+
+                table = await db.tables.get('t1')
+                report = await table.insert(pd.DataFrame([{'a': i} for i in range(3)]), chunk_size=1, max_workers=2)
+                assert report.rows == 3
+                inserts = sorted(sql for sql, _ in fake.queries if sql.startswith('INSERT'))
+                assert inserts == [f'INSERT INTO db1.t1(a) VALUES ({i})' for i in range(3)]
+
+                # models
+                model = await server.models.create('m2', predict='y', query=db.query('select * from t1'))
+                assert model.name == 'm2'
+                assert fake.queries[-1][0].startswith('CREATE MODEL mindsdb.m2')
+
+                model = await model.retrain()
+                assert fake.queries[-1][0] == 'RETRAIN mindsdb.m2'
+                assert model.name == 'm2'
+                await model.finetune(query='select * from t1', database='db1')
+                assert fake.queries[-1][0].startswith('FINETUNE mindsdb.m2')
+
+                model = await server.models.get('m1')
+                await model.set_active(2)
+                assert any(sql == 'SET active mindsdb.m1.`2`' for sql, _ in fake.queries)
+
+                # knowledge bases
+                kb = await server.knowledge_bases.create('kb1', metadata_columns=['a'])
+                assert fake.requests[-1][2]['knowledge_base'] == {'name': 'kb1', 'metadata_columns': ['a']}
+                fake.requests.clear()
+
+                await kb.insert_query(db.query('select * from t1'))
+                assert fake.requests[-1][2]['knowledge_base'] == {'query': 'select * from t1'}
+                fake.requests.clear()
+
+                # agents
+                agent = await server.agents.create('agent1', model='gpt', params={'k': 1})
+                assert fake.requests[-1][0] == 'POST'
+                assert fake.requests[-1][2]['agent']['model_name'] == 'gpt'
+
+                agent.prompt_template = 'hi'
+                agent = await server.agents.update('agent1', agent)
+                assert fake.requests[-1][0] == 'PUT'
+                assert agent.prompt_template == 'hi'
+
+    asyncio.run(main())
+
+
+def test_async_add_files(tmp_path, monkeypatch):
+    # manifest of uploaded files is kept in temporary directory
+    monkeypatch.setattr('mindsdb_sdk.utils.sync.DEFAULT_SYNC_DIR', str(tmp_path))
+
+    paths = []
+    for name, content in [('a.txt', b'a'), ('b.txt', b'a'), ('c.csv', b'c' * 100000)]:
+        path = tmp_path / name
+        path.write_bytes(content)
+        paths.append(str(path))
+
+    async def main():
+        async with FakeServer() as fake:
+            async with await mindsdb_sdk.connect_async(fake.url) as server:
+                agent = await server.agents.get('agent1')
+                await agent.add_files(paths, 'docs')
+                # file with the same content is uploaded once, files are uploaded with extension
+                assert sorted(fake.files) == ['a', 'c']
+                assert sorted(fake.uploaded_names) == ['a.txt', 'c.csv']
+                assert fake.uploaded_sizes == {'a': 1, 'c': 100000}
+                assert fake.requests[-1][2]['agent']['data'] == {'tables': ['files.a', 'files.c']}
+                assert fake.requests[-1][2]['agent']['prompt_template'].endswith('docs')
+
+                # already uploaded content is found in manifest
+                agent = await server.agents.get('agent1')
+                await agent.add_file(paths[1], 'docs')
+                assert sorted(fake.files) == ['a', 'c']
+                assert fake.requests[-1][2]['agent']['data'] == {'tables': ['files.a']}
+
+    asyncio.run(main())
+
+
+def test_async_insert_stream(tmp_path):
+
+    async def main():
+        async with FakeServer() as fake:
+            async with await mindsdb_sdk.connect_async(fake.url) as server:
+                kb = await server.knowledge_bases.get('kb1')
+
+                read = []
+
+                def generate():
+                    for i in range(20):
+                        read.append(i)
+                        # source is read lazily: only a few chunks ahead of inserted ones
+                        assert len(read) - len(inserted) <= 2 * 2 + 2 * 2
+                        yield {'id': i, 'content': 'x'}
+
+                inserted = []
+                reports = []
+
+                def on_progress(report):
+                    inserted.extend(fake.kb_rows())
+                    reports.append(report)
+
+                report = await kb.insert_stream(generate(), chunk_size=2, block_rows=2, max_workers=2,
+                                                on_progress=on_progress)
+                assert report.rows == 20
+                assert sorted(inserted) == list(range(20))
+                assert len(reports) == 10
+
+                # file source, failed chunk is sent again after resume
+                path = tmp_path / 'docs.csv'
+                pd.DataFrame({'id': range(6), 'content': 'x'}).to_csv(path, index=False)
+                fake.fail_ids = {3}
+                with pytest.raises(BatchError) as e:
+                    await kb.insert_stream(str(path), chunk_size=2, block_rows=4)
+                assert fake.kb_rows() == [0, 1]
+                fake.fail_ids = set()
+                report = await kb.insert_stream(str(path), chunk_size=2, block_rows=4, resume=e.value.report)
+                assert report.completed == {0, 1, 2}
+                assert fake.kb_rows() == [2, 3, 4, 5]
+
+    asyncio.run(main())
+
+
+def test_async_find_many():
+
+    async def main():
+        async with FakeServer() as fake:
+            async with await mindsdb_sdk.connect_async(fake.url) as server:
+                kb = await server.knowledge_bases.get('kb1')
+                queries = [f'q{i}' for i in range(5)]
+
+                # query by query, concurrently
+                df = await kb.find_many(queries, limit=2, max_workers=3)
+                assert list(df['query_index']) == [0, 0, 1, 1, 2, 2, 3, 3, 4, 4]
+                assert len(fake.queries) == 5
+                assert fake.max_in_flight > 1
+
+                # batches of queries are sent in one statement with union
+                fake.queries.clear()
+                reports = []
+                df = await kb.find_many(queries, limit=2, batch_size=2, on_progress=reports.append)
+                assert len(fake.queries) == 3
+                assert list(df['query_index']) == [0, 1, 2, 3, 4]
+                assert list(df['content']) == [f'doc {i}' for i in range(5)]
+                assert reports[-1].rows == 5
+
+                with pytest.raises(ValueError):
+                    await kb.find_many(queries, batch_size=0)
+
+    asyncio.run(main())
+
+
+def test_async_kb_sync(tmp_path):
+
+    async def main():
+        async with FakeServer() as fake:
+            async with await mindsdb_sdk.connect_async(fake.url) as server:
+                kb = await server.knowledge_bases.get('kb1')
+                manifest = str(tmp_path / 'kb1.sqlite')
+                rows = [{'id': i, 'content': f'c{i}'} for i in range(4)]
+
+                # manifest keeps rows of successful chunks
+                fake.fail_ids = {2}
+                with pytest.raises(BatchError):
+                    await kb.sync(rows, manifest_path=manifest, chunk_size=2)
+                assert fake.kb_rows() == [0, 1]
+                fake.fail_ids = set()
+                stats = await kb.sync(rows, manifest_path=manifest)
+                assert (stats['inserted'], stats['unchanged']) == (2, 2)
+                assert fake.kb_rows() == [2, 3]
+
+                # changed and missing rows
+                rows = [{'id': 0, 'content': 'new'}, {'id': 1, 'content': 'c1'}, {'id': 3, 'content': 'c3'}]
+                stats = await kb.sync(rows, manifest_path=manifest, delete_missing=True)
+                assert (stats['inserted'], stats['unchanged'], stats['deleted']) == (1, 2, 1)
+                assert fake.kb_rows() == [0]
+                assert fake.queries[-1][0] == "DELETE FROM mindsdb.kb1 WHERE id IN ('2')"
+
+                # nothing is changed
+                stats = await kb.sync(rows, manifest_path=manifest, delete_missing=True)
+                assert (stats['inserted'], stats['unchanged'], stats['deleted']) == (0, 3, 0)
+                assert fake.kb_rows() == []
+
+    asyncio.run(main())
+
+
+def test_async_completion_many():
+
+    async def main():
+        async with FakeServer() as fake:
+            async with await mindsdb_sdk.connect_async(fake.url) as server:
+                agent = await server.agents.get('agent1')
+                messages_list = [[{'question': question, 'answer': None}] for question in ['q0', 'fail', 'q2']]
+
+                report = BatchReport()
+                reports = []
+                start = time.monotonic()
+                results = await agent.completion_many(
+                    messages_list, max_concurrency=2, rate_limit=20, on_progress=reports.append, report=report
+                )
+                # requests are spaced by rate limit
+                assert time.monotonic() - start >= 0.1
+
+                # failed completion is returned in place of result
+                assert results[0].content == results[2].content == 'answer: 1'
+                assert isinstance(results[1], requests.HTTPError)
+                assert report.completed == {0, 2}
+                assert list(report.failed) == [1]
+                assert len(reports) == 3
+                assert report.p95 >= report.p50
+
+    asyncio.run(main())
@@ -0,0 +1,384 @@
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+import requests
+
+import mindsdb_sdk
+from mindsdb_sdk.databases import Database
+from mindsdb_sdk.knowledge_bases import KnowledgeBase
+from mindsdb_sdk.models import Model
+from mindsdb_sdk.utils.batch import AdaptiveChunkSize, BatchError, RateLimiter, process_chunks, process_chunks_async
+
+from tests.helpers import json_response, ok_response, sql_calls, table_response
+
+
+@patch('requests.Session.post')
+def test_chunked_insert(mock_post):
+    mock_post.return_value = ok_response()
+
+    server = mindsdb_sdk.connect()
+    table = Database(server, 'db1').tables.get('t1')
+
+    df = pd.DataFrame({'s': ['a', "b'c", 'd', 'e', 'f'], 'x': [1, 2, 3, 4, 5]})
+
+    # by count of rows: every statement is the same as insert of slice of dataframe
+    report = table.insert(df, chunk_size=2)
+    assert sql_calls(mock_post) == [
+        table._insert_sql(df[i:i + 2]) for i in range(0, 5, 2)
+    ]
+    assert report.rows == 5
+    assert report.completed == {0, 1, 2}
+
+    # by size of statement
+    mock_post.reset_mock()
+    max_bytes = len(table._insert_sql(df[:2]).encode())
+    table.insert(df, max_chunk_bytes=max_bytes)
+    queries = sql_calls(mock_post)
+    assert len(queries) > 1
+    assert all(len(query.encode()) <= max_bytes for query in queries)
+    assert sum(query.count('), (') + 1 for query in queries) == 5
+
+
+@patch('requests.Session.post')
+def test_chunked_insert_resume(mock_post):
+    calls = []
+    dropped = []
+
+    def post(*args, **kwargs):
+        query = kwargs['json']['query']
+        calls.append(query)
+        if "'d'" in query and not dropped:
+            # connection is dropped once
+            dropped.append(query)
+            raise ConnectionError('dropped')
+        return ok_response()
+
+    mock_post.side_effect = post
+
+    server = mindsdb_sdk.connect()
+    table = Database(server, 'db1').tables.get('t1')
+    df = pd.DataFrame({'s': ['a', 'b', 'c', 'd', 'e'], 'x': [1, 2, 3, 4, 5]})
+
+    with pytest.raises(BatchError) as exc_info:
+        table.insert(df, chunk_size=1)
+    report = exc_info.value.report
+    assert report.completed == {0, 1, 2}
+    assert report.resume_from == 3
+
+    # only not completed chunks are sent
+    calls.clear()
+    report = table.insert(df, chunk_size=1, resume=report)
+    assert len(calls) == 2
+    assert report.failed == {}
+    assert report.rows == 5
+
+
+def test_process_chunks_concurrency():
+    active = []
+    max_active = []
+    lock = threading.Lock()
+
+    def func(chunk):
+        with lock:
+            active.append(chunk)
+            max_active.append(len(active))
+        time.sleep(0.01)
+        with lock:
+            active.remove(chunk)
+        return chunk * 2
+
+    chunks = ((i, 1) for i in range(20))
+    report = process_chunks(func, chunks, max_workers=4, keep_results=True)
+    assert max(max_active) <= 4
+    assert report.results == {i: i * 2 for i in range(20)}
+    assert report.p50 is not None
+
+
+def test_process_chunks_retries():
+    attempts = []
+
+    def func(chunk):
+        attempts.append(chunk)
+        if len(attempts) < 3:
+            raise ConnectionError()
+
+    with patch('mindsdb_sdk.utils.batch.DEFAULT_RETRY_MAX_WAIT', 0):
+        report = process_chunks(func, [(1, 1)], retries=2)
+    assert report.completed == {0}
+    assert len(attempts) == 3
+
+
+@pytest.mark.parametrize('max_workers', [1, 3])
+def test_process_chunks_progress_error(max_workers):
+    processed = []
+
+    def on_progress(report):
+        if len(report.completed) == 3:
+            raise ValueError('stop')
+
+    def func(chunk):
+        processed.append(chunk)
+        time.sleep(0.01)
+
+    async def func_async(chunk):
+        processed.append(chunk)
+        await asyncio.sleep(0.01)
+
+    # exception of progress callback is raised, next chunks are not processed
+    with pytest.raises(ValueError):
+        process_chunks(func, ((i, 1) for i in range(50)), max_workers=max_workers, on_progress=on_progress)
+    assert len(processed) < 50
+
+    processed.clear()
+    with pytest.raises(ValueError):
+        asyncio.run(process_chunks_async(
+            func_async, ((i, 1) for i in range(50)), max_workers=max_workers, on_progress=on_progress
+        ))
+    assert len(processed) < 50
+
+
+@patch('requests.Session.post')
+def test_predict_batches(mock_post):
+    attempts = {}
+
+    def post(url, json=None, **kwargs):
+        rows = json['data']
+        first = rows[0]['x']
+        attempts[first] = attempts.get(first, 0) + 1
+        if first == 20 and attempts[first] == 1:
+            # the first attempt of one batch fails
+            raise ConnectionError('dropped')
+        # later batches are answered earlier
+        time.sleep(0.002 * (10 - first // 10))
+        return json_response([{'x': row['x'], 'y': row['x'] * 2} for row in rows])
+
+    mock_post.side_effect = post
+
+    server = mindsdb_sdk.connect()
+    model = Model(server, {'name': 'm1'})
+
+    df = pd.DataFrame({'x': range(95)})
+    reports = []
+    with patch('mindsdb_sdk.utils.batch.DEFAULT_RETRY_MAX_WAIT', 0):
+        result = model.predict(df, batch_size=10, max_workers=4, retries=1, on_progress=reports.append)
+
+    assert list(result['x']) == list(range(95))
+    assert list(result['y']) == [x * 2 for x in range(95)]
+    assert mock_post.call_count == 11
+    assert reports[-1].rows == 95
+    assert reports[-1].throughput > 0
+    assert mock_post.call_args[0][0].endswith('/api/projects/mindsdb/models/m1/predict')
+
+
+@patch('requests.Session.put')
+def test_kb_chunked_insert(mock_put):
+    mock_put.return_value = ok_response()
+
+    server = mindsdb_sdk.connect()
+    kb = KnowledgeBase(server.api, server, {'name': 'kb1'})
+
+    def sent_rows():
+        return [call[1]['json']['knowledge_base']['rows'] for call in mock_put.call_args_list]
+
+    df = pd.DataFrame({'id': range(10), 'content': [f'text {i}' * (i + 1) for i in range(10)]})
+
+    # by size of payload
+    max_bytes = 200
+    report = kb.insert(df, max_chunk_bytes=max_bytes, max_workers=3)
+    chunks = sent_rows()
+    assert len(chunks) > 1
+    assert all(len(json.dumps(rows)) <= max_bytes or len(rows) == 1 for rows in chunks)
+    assert sorted(row['id'] for rows in chunks for row in rows) == list(range(10))
+    assert report.rows == 10
+
+    # failed chunk is retried after resume
+    mock_put.reset_mock()
+    mock_put.side_effect = [ok_response(), requests.ConnectionError(), ok_response(), ok_response()]
+    with pytest.raises(BatchError) as e:
+        kb.insert(df, chunk_size=4)
+    assert e.value.report.completed == {0}
+    mock_put.side_effect = None
+    report = kb.insert(df, chunk_size=4, resume=e.value.report)
+    assert report.completed == {0, 1, 2}
+    assert [row['id'] for rows in sent_rows()[2:] for row in rows] == list(range(4, 10))
+
+
+def test_adaptive_chunk_size():
+    size = AdaptiveChunkSize(100, target_latency=1)
+
+    # fast chunks: grows not more than twice
+    size.update(100, 0.1)
+    assert size() == 200
+    # slow chunks: shrinks
+    size.update(200, 4)
+    assert size() == 100
+    size.update(100, 1.25)
+    assert size() == 80
+
+    # chunks of stream are built using actual size
+    chunks = list(KnowledgeBase._insert_chunks([([{'a': i} for i in range(10)], None)], lambda: 3))
+    assert [rows for _, rows in chunks] == [3, 3, 3, 1]
+
+
+@patch('requests.Session.put')
+def test_kb_insert_stream(mock_put, tmp_path):
+    server = mindsdb_sdk.connect()
+    kb = KnowledgeBase(server.api, server, {'name': 'kb1'})
+
+    read = []
+    sent = []
+
+    def put(*args, **kwargs):
+        sent.append([row['id'] for row in kwargs['json']['knowledge_base']['rows']])
+        # source is read lazily: only a few chunks ahead of sent ones
+        assert len(read) - sum(map(len, sent)) <= 3 * 3 + 2
+        return ok_response()
+    mock_put.side_effect = put
+
+    def generate():
+        for i in range(30):
+            read.append(i)
+            yield {'id': i, 'content': f'text {i}'}
+
+    report = kb.insert_stream(generate(), chunk_size=3, block_rows=2)
+    assert report.rows == 30
+    assert sum(sent, []) == list(range(30))
+
+    # files and readers
+    df = pd.DataFrame({'id': range(7), 'content': [f'text {i}' for i in range(7)]})
+    df.to_csv(tmp_path / 'docs.csv', index=False)
+    df.to_json(tmp_path / 'docs.jsonl', orient='records', lines=True)
+    sources = [
+        str(tmp_path / 'docs.csv'),
+        tmp_path / 'docs.jsonl',
+        pd.read_csv(tmp_path / 'docs.csv', chunksize=3),
+    ]
+    for source in sources:
+        sent.clear()
+        read.clear()
+        kb.insert_stream(source, chunk_size=2, block_rows=3)
+        assert sum(sent, []) == list(range(7))
+
+    with pytest.raises(ValueError):
+        kb.insert_stream(str(tmp_path / 'docs.txt'))
+
+
+@patch('requests.Session.put')
+def test_kb_insert_stream_parquet(mock_put, tmp_path):
+    pytest.importorskip('pyarrow')
+    mock_put.return_value = ok_response()
+
+    server = mindsdb_sdk.connect()
+    kb = KnowledgeBase(server.api, server, {'name': 'kb1'})
+
+    df = pd.DataFrame({'id': range(5), 'content': [f'text {i}' for i in range(5)]})
+    df.to_parquet(tmp_path / 'docs.parquet')
+    report = kb.insert_stream(tmp_path / 'docs.parquet', block_rows=2)
+    assert report.rows == 5
+    rows = [row for call in mock_put.call_args_list for row in call[1]['json']['knowledge_base']['rows']]
+    assert [row['id'] for row in rows] == list(range(5))
+
+
+@patch('requests.Session.post')
+def test_kb_find_many(mock_post):
+    server = mindsdb_sdk.connect()
+    kb = KnowledgeBase(server.api, server, {'name': 'kb1'})
+
+    def post(*args, **kwargs):
+        sql = kwargs['json']['query']
+        time.sleep(0.01)
+        if 'UNION ALL' in sql:
+            # rows of union in reverse order
+            return table_response(['content', 'query_index'], [['doc q2', 2], ['doc q1', 1], ['doc q0', 0]])
+        query = sql.split("content = '")[1].split("'")[0]
+        return table_response(['content'], [[f'doc {query}'], [f'doc {query} 2']])
+    mock_post.side_effect = post
+
+    reports = []
+    df = kb.find_many(['q0', 'q1', 'q2'], limit=2, max_workers=3, on_progress=reports.append)
+    assert list(df['query_index']) == [0, 0, 1, 1, 2, 2]
+    assert list(df['content'][::2]) == ['doc q0', 'doc q1', 'doc q2']
+    assert reports[-1].p95 >= reports[-1].p50 > 0
+
+    queries = sql_calls(mock_post)
+    assert sorted(queries) == [kb.find(f'q{i}', limit=2).sql for i in range(3)]
+
+    # one statement with union
+    mock_post.reset_mock()
+    df = kb.find_many(['q0', 'q1', 'q2'], limit=2, batch_size=3)
+    assert list(df['query_index']) == [0, 1, 2]
+    assert sql_calls(mock_post) == [
+        "(SELECT *, 0 AS query_index FROM mindsdb.kb1 WHERE content = 'q0' LIMIT 2)\n"
+        "UNION ALL\n"
+        "(SELECT *, 1 AS query_index FROM mindsdb.kb1 WHERE content = 'q1' LIMIT 2)\n"
+        "UNION ALL\n"
+        "(SELECT *, 2 AS query_index FROM mindsdb.kb1 WHERE content = 'q2' LIMIT 2)"
+    ]
+
+
+def test_rate_limiter():
+    limiter = RateLimiter(rate=100)
+    start = time.monotonic()
+    threads = [threading.Thread(target=limiter.wait) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # calls are spaced by 10ms
+    assert time.monotonic() - start >= 0.05
+
+
+def test_process_chunks_resume_concurrent():
+    calls = []
+    fail = {3}
+
+    def func(chunk):
+        calls.append(chunk)
+        if chunk in fail:
+            raise ConnectionError()
+
+    chunks = [(i, 1) for i in range(10)]
+    report = process_chunks(func, chunks, max_workers=2)
+    assert 3 in report.failed
+    completed = set(report.completed)
+
+    fail.clear()
+    calls.clear()
+    report = process_chunks(func, chunks, max_workers=2, skip=report.completed, report=report)
+    assert sorted(calls) == sorted(set(range(10)) - completed)
+    assert report.failed == {}
+    assert report.completed == set(range(10))
+
+
+@patch('requests.Session.put')
+def test_kb_insert_resume_concurrent(mock_put):
+    failed_once = []
+
+    def put(*args, **kwargs):
+        ids = [row['id'] for row in kwargs['json']['knowledge_base']['rows']]
+        if 4 in ids and not failed_once:
+            failed_once.append(ids)
+            raise requests.ConnectionError()
+        return ok_response()
+    mock_put.side_effect = put
+
+    server = mindsdb_sdk.connect()
+    kb = KnowledgeBase(server.api, server, {'name': 'kb1'})
+    df = pd.DataFrame({'id': range(10), 'content': [f'text {i}' for i in range(10)]})
+
+    with pytest.raises(BatchError) as e:
+        kb.insert(df, chunk_size=2, max_workers=4)
+    completed = set(e.value.report.completed)
+    assert 2 not in completed
+
+    mock_put.reset_mock()
+    report = kb.insert(df, chunk_size=2, max_workers=4, resume=e.value.report)
+    assert report.completed == set(range(5))
+    assert report.failed == {}
+    sent = sorted(row['id'] for call in mock_put.call_args_list for row in call[1]['json']['knowledge_base']['rows'])
+    assert sent == sorted(i for num in set(range(5)) - completed for i in (2 * num, 2 * num + 1))
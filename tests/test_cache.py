@@ -0,0 +1,213 @@
+from unittest.mock import patch
+
+import pandas as pd
+
+import mindsdb_sdk
+from mindsdb_sdk.databases import Database
+from mindsdb_sdk.knowledge_bases import KnowledgeBase
+from mindsdb_sdk.models import Model
+from mindsdb_sdk.utils.cache import LRUCache
+
+from tests.helpers import json_response, response_mock, sql_calls, table_response
+
+
+@patch('requests.Session.post')
+def test_result_cache(mock_post):
+    server = mindsdb_sdk.connect()
+    server.enable_result_cache(ttl=60)
+
+    response_mock(mock_post, pd.DataFrame([{'a': 1}, {'a': 2}]))
+
+    df = server.query('select * from db1.t1').fetch()
+    # the same query after normalization
+    df2 = server.query(' select *  from db1.t1; ').fetch()
+    assert df.equals(df2)
+    assert len(sql_calls(mock_post)) == 1
+
+    # cached result can't be changed
+    df2['a'] = 0
+    assert list(server.query('select * from db1.t1').fetch()['a']) == [1, 2]
+
+    # other database
+    db1 = Database(server, 'db1')
+    db1.query('select * from db1.t1').fetch()
+    assert len(sql_calls(mock_post)) == 2
+
+    # bypass
+    server.query('select * from db1.t1').fetch(cache=False)
+    assert len(sql_calls(mock_post)) == 3
+
+    stats = server.result_cache_stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 2
+    assert stats['items'] == 2
+
+    # table fetch is cached too, insert into table invalidates results which reference the table
+    table = db1.tables.get('t1')
+    table.limit(2).fetch()
+    table.limit(2).fetch()
+    count = len(sql_calls(mock_post))
+
+    table.insert(pd.DataFrame([{'a': 3}]))
+    assert server.result_cache_stats()['items'] == 0
+    table.limit(2).fetch()
+    assert len(sql_calls(mock_post)) == count + 2
+
+    # other tables are not affected
+    server.query('select * from db1.t2').fetch()
+    server.query('delete from db1.t1 where a=1').fetch()
+    server.query('select * from db1.t2').fetch()
+    assert server.result_cache_stats()['items'] == 1
+
+    # unknown statement clears the cache
+    server.query('set x=1').fetch()
+    assert server.result_cache_stats()['items'] == 0
+
+    server.disable_result_cache()
+    assert server.result_cache_stats() is None
+
+
+def test_lru_cache():
+    cache = LRUCache(max_size=3, sizeof=lambda value: 1)
+    for i in range(4):
+        cache.set(i, i, tags=[f'tag{i % 2}'])
+    # the first item is evicted
+    assert cache.get(0) is None
+    assert cache.get(1) == 1
+
+    # 1 was used recently, 2 is evicted
+    cache.set(4, 4)
+    assert cache.get(2) is None
+    assert cache.get(1) == 1
+
+    assert cache.invalidate('tag1') == 2
+    assert len(cache) == 1
+
+    # expired items
+    cache = LRUCache(ttl=-1)
+    cache.set(1, 1)
+    assert cache.get(1) is None
+    assert cache.stats()['misses'] == 1
+
+
+@patch('requests.Session.post')
+def test_metadata_cache(mock_post):
+    server = mindsdb_sdk.connect()
+    server.enable_metadata_cache(ttl=60)
+
+    response_mock(mock_post, pd.DataFrame([{'NAME': 'db1', 'ENGINE': 'postgres', 'CONNECTION_DATA': {}}]))
+
+    assert server.databases.get('db1').name == 'db1'
+    assert server.databases.db1.engine == 'postgres'
+    assert [db.name for db in server.databases.list()] == ['db1']
+    assert len(sql_calls(mock_post)) == 1
+
+    # index is invalidated by collection
+    server.databases.create('db2', engine='postgres', connection_args={})
+    server.databases.get('db1')
+    assert len(sql_calls(mock_post)) == 3
+
+    # models are cached by project
+    response_mock(mock_post, pd.DataFrame([{'NAME': 'm1', 'VERSION': 1, 'STATUS': 'complete', 'ACTIVE': True}]))
+    assert server.models.get('m1').name == 'm1'
+    server.models.get('m1')
+    count = len(sql_calls(mock_post))
+    assert count == 4
+
+    # model version is always requested from server
+    server.models.get('m1', version=1)
+    assert len(sql_calls(mock_post)) == count + 1
+
+    server.refresh_metadata()
+    server.models.get('m1')
+    assert len(sql_calls(mock_post)) == count + 2
+
+    server.disable_metadata_cache()
+    server.models.get('m1')
+    server.models.get('m1')
+    assert len(sql_calls(mock_post)) == count + 4
+
+
+@patch('requests.Session.post')
+def test_prediction_cache(mock_post):
+    predicted_rows = []
+
+    def post(url, json=None, **kwargs):
+        if url.endswith('/predict'):
+            predicted_rows.extend(row['x'] for row in json['data'])
+            return json_response([{'x': row['x'], 'y': row['x'] * 2} for row in json['data']])
+        # retrain
+        return table_response(['NAME', 'STATUS'], [['m1', 'generating']])
+
+    mock_post.side_effect = post
+
+    server = mindsdb_sdk.connect()
+    server.enable_prediction_cache(ttl=60)
+    model = Model(server, {'name': 'm1'})
+
+    assert model.predict({'x': 1})['y'][0] == 2
+    assert model.predict({'x': 1})['y'][0] == 2
+    assert predicted_rows == [1]
+
+    # only missed rows are sent, once per unique row
+    result = model.predict(pd.DataFrame({'x': [3, 1, 2, 3]}))
+    assert list(result['y']) == [6, 2, 4, 6]
+    assert predicted_rows == [1, 3, 2]
+
+    # other params
+    model.predict({'x': 1}, params={'a': 1})
+    # without cache
+    model.predict({'x': 1}, cache=False)
+    assert predicted_rows == [1, 3, 2, 1, 1]
+
+    stats = server.prediction_cache_stats()
+    assert stats['items'] == 4
+    assert stats['hits'] == 2
+
+    # retrain invalidates predictions of model
+    model.retrain()
+    model.predict({'x': 1})
+    assert predicted_rows[-1] == 1
+    assert server.prediction_cache_stats()['items'] == 1
+
+    server.disable_prediction_cache()
+    assert server.prediction_cache_stats() is None
+
+
+@patch('requests.Session.put')
+@patch('requests.Session.post')
+def test_search_cache(mock_post, mock_put):
+    server = mindsdb_sdk.connect()
+    server.enable_search_cache(ttl=60)
+    kb = KnowledgeBase(server.api, server, {'name': 'kb1'})
+
+    response_mock(mock_post, pd.DataFrame([{'content': 'doc', 'relevance': 0.9}]))
+    mock_put.return_value = json_response({})
+
+    df = kb.find('How to reset  password?', limit=5).fetch()
+    # normalized query text
+    df2 = kb.find(' how to reset password? ', limit=5).fetch()
+    assert df.equals(df2)
+    assert len(sql_calls(mock_post)) == 1
+
+    # different limit or filters
+    kb.find('how to reset password?', limit=3).fetch()
+    kb.find('how to reset password?', limit=5, filters={'a': 1}).fetch()
+    assert len(sql_calls(mock_post)) == 3
+
+    # find_many uses the same cache
+    result = kb.find_many(['how to reset password?', 'other'], limit=5, max_workers=1)
+    assert list(result['query_index']) == [0, 1]
+    assert len(sql_calls(mock_post)) == 4
+
+    # insert into knowledge base invalidates its results
+    kb.insert({'content': 'new doc'})
+    kb.find('how to reset password?', limit=5).fetch()
+    assert len(sql_calls(mock_post)) == 5
+
+    stats = server.search_cache_stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 5
+
+    server.disable_search_cache()
+    assert server.search_cache_stats() is None
@@ -0,0 +1,78 @@
+from unittest.mock import patch
+
+import pytest
+import pandas as pd
+
+import mindsdb_sdk
+from mindsdb_sdk.utils.dataframe import build_dataframe
+
+from tests.helpers import response_mock
+
+COLUMNS = ['i', 's', 'f', 'j', 'b']
+ROWS = [
+    [1, 'a', None, [1, 2], True],
+    [2, 'a', 1.5, {'x': 1}, None],
+    [None, 'b', 2, None, False],
+    [4, 'a', 3.5, None, True],
+]
+
+
+def test_default_dtypes():
+    # the same as construction from rows
+    expected = pd.DataFrame(ROWS, columns=COLUMNS)
+    assert build_dataframe(COLUMNS, rows=ROWS).equals(expected)
+
+    columns_data = [list(column) for column in zip(*ROWS)]
+    assert build_dataframe(COLUMNS, columns_data=columns_data).equals(expected)
+
+
+def test_nullable_and_categorical():
+    df = build_dataframe(COLUMNS, rows=ROWS, dtype_backend='numpy_nullable', categorical_threshold=0.5)
+
+    assert str(df['i'].dtype) == 'Int64'
+    assert list(df['i'].isna()) == [False, False, True, False]
+    assert str(df['f'].dtype) == 'Float64'
+    assert str(df['b'].dtype) == 'boolean'
+    assert isinstance(df['s'].dtype, pd.CategoricalDtype)
+    assert list(df['s']) == ['a', 'a', 'b', 'a']
+    # json values are kept as is
+    assert df['j'][0] == [1, 2]
+
+    # duplicated names of columns
+    df = build_dataframe(['a', 'a'], rows=[[1, 'x']], dtype_backend='numpy_nullable')
+    assert list(df.columns) == ['a', 'a']
+
+    with pytest.raises(ValueError):
+        build_dataframe(COLUMNS, rows=ROWS, dtype_backend='arrow')
+
+
+def test_column_types():
+    rows = [['2024-01-02', '1', 1], [None, '2', 2]]
+    df = build_dataframe(['d', 's', 'x'], rows=rows, column_types=['datetime', 'varchar(10)', 'bigint'])
+
+    assert pd.api.types.is_datetime64_any_dtype(df['d'])
+    assert df['d'][0] == pd.Timestamp('2024-01-02')
+    assert pd.isna(df['d'][1])
+    assert pd.api.types.is_string_dtype(df['s'])
+    assert df['x'].dtype == 'int64'
+
+    # nulls in string column stay nulls
+    df = build_dataframe(['s'], rows=[['a'], [None], [1]], column_types=['varchar'])
+    assert df['s'][0] == 'a'
+    assert pd.isna(df['s'][1])
+    assert df['s'][2] == '1'
+
+
+@patch('requests.Session.post')
+def test_connect_options(mock_post):
+    server = mindsdb_sdk.connect(dtype_backend='numpy_nullable')
+
+    response_mock(mock_post, {
+        'type': 'table',
+        'column_names': ['a', 'b'],
+        'column_types': ['int', None],
+        'data': [[1, 'x'], [None, 'y']],
+    })
+    df = server.query('select * from t1').fetch()
+    assert str(df['a'].dtype) == 'Int64'
+    assert str(df['b'].dtype) == 'string'
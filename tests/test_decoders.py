@@ -0,0 +1,80 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+import pandas as pd
+
+import mindsdb_sdk
+from mindsdb_sdk.connectors.decoders import decode_sql_response_stream
+
+
+def split_bytes(data: bytes, size: int):
+    return [data[i: i + size] for i in range(0, len(data), size)]
+
+
+RESPONSE = {
+    'type': 'table',
+    'column_names': ['id', 'name', 'value'],
+    'data': [
+        [1, 'ёжик', 1.5],
+        [22, 'a "quoted" \\ str', None],
+        [333, None, -1e10],
+        [4444, '{"json": [1, 2]}', True],
+    ],
+    'context': {'db': 'mindsdb'},
+}
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64, 100000])
+def test_stream_decoding(chunk_size):
+    body = json.dumps(RESPONSE, ensure_ascii=False).encode()
+
+    result = decode_sql_response_stream(split_bytes(body, chunk_size))
+
+    assert result['type'] == 'table'
+    assert result['column_names'] == RESPONSE['column_names']
+    assert result['context'] == RESPONSE['context']
+    assert 'data' not in result
+    assert result['columns_data'] == [list(col) for col in zip(*RESPONSE['data'])]
+
+
+def test_stream_decoding_order_and_errors():
+    # data is before column names
+    body = b'{"data": [[1], [2]], "column_names": ["a"], "type": "table"}'
+    result = decode_sql_response_stream(split_bytes(body, 5))
+    assert result['columns_data'] == [[1, 2]]
+
+    # empty result
+    result = decode_sql_response_stream([b'{"type": "table", "column_names": ["a", "b"], "data": []}'])
+    assert result['columns_data'] == [[], []]
+
+    result = decode_sql_response_stream([b'{"type": "error", "error_code": 0, "error_message": "wrong"}'])
+    assert result == {'type': 'error', 'error_code': 0, 'error_message': 'wrong'}
+
+    # truncated response
+    with pytest.raises(ValueError):
+        decode_sql_response_stream([b'{"type": "table", "data": [[1], [2'])
+
+
+@patch('requests.Session.post')
+def test_stream_sql_query(mock_post):
+    body = json.dumps(RESPONSE).encode()
+
+    r_mock = MagicMock()
+    r_mock.status_code = 200
+    r_mock.__enter__.return_value = r_mock
+    r_mock.iter_content.side_effect = lambda chunk_size: iter(split_bytes(body, 10))
+    mock_post.return_value = r_mock
+
+    server = mindsdb_sdk.connect(stream_results=True)
+    df = server.query('select * from t1').fetch()
+
+    assert mock_post.call_args[1]['stream'] is True
+    expected = pd.DataFrame(RESPONSE['data'], columns=RESPONSE['column_names'])
+    assert df.equals(expected)
+
+    # not streamed result
+    r_mock.json.return_value = RESPONSE
+    df = server.query('select * from t1').fetch(stream=False)
+    assert 'stream' not in mock_post.call_args[1]
+    assert df.equals(expected)
@@ -0,0 +1,111 @@
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+import mindsdb_sdk
+from mindsdb_sdk.knowledge_bases import KnowledgeBase
+from mindsdb_sdk.utils.batch import BatchError
+
+from tests.helpers import json_response, ok_response
+
+
+def make_kb(**data):
+    server = mindsdb_sdk.connect()
+    return KnowledgeBase(server.api, server, {'name': 'kb1', **data})
+
+
+def test_find_filters():
+    kb = make_kb(metadata_columns=['author', 'tenant', 'year'], id_column='doc_id')
+
+    query = kb.find(
+        'dogs',
+        limit=3,
+        filters={'author': 'bob', 'tenant': ['a', 'b'], 'year': {'>=': 2020, '<': 2024}, 'doc_id': None},
+        columns=['doc_id', 'chunk_content', 'relevance'],
+        relevance_threshold=0.5,
+    )
+    assert query.sql == (
+        "SELECT doc_id, chunk_content, relevance FROM mindsdb.kb1 "
+        "WHERE content = 'dogs' AND author = 'bob' AND tenant IN ('a', 'b') AND year >= 2020 AND year < 2024 "
+        "AND doc_id IS NULL AND relevance >= 0.5 LIMIT 3"
+    )
+    # pagination keeps filters
+    select, _, limit = query._get_batch_select()
+    assert 'tenant IN' in select.to_string() and limit == 3
+
+    # the same filters without query
+    assert make_kb().find(None, filters={'a': {'not in': [1, 2]}}).sql == (
+        'SELECT * FROM mindsdb.kb1 WHERE a NOT IN (1, 2) LIMIT 10'
+    )
+
+    with pytest.raises(ValueError):
+        kb.find('dogs', filters={'unknown': 1})
+    with pytest.raises(ValueError):
+        kb.find('dogs', filters={'year': {'~': 1}})
+    with pytest.raises(ValueError):
+        kb.find('dogs', filters={'year': {'in': 1}})
+
+
+@patch('requests.Session.post')
+@patch('requests.Session.put')
+def test_sync(mock_put, mock_post, tmp_path):
+    put_response = json_response({})
+    mock_put.return_value = put_response
+    mock_post.return_value = ok_response()
+
+    kb = make_kb(id_column='doc_id')
+    manifest = str(tmp_path / 'kb1.sqlite')
+
+    def sent_ids():
+        ids = [row['doc_id'] for call in mock_put.call_args_list for row in call[1]['json']['knowledge_base']['rows']]
+        mock_put.reset_mock()
+        return ids
+
+    df = pd.DataFrame({'doc_id': [1, 2, 3], 'content': ['a', 'b', 'c'], 'author': ['x', 'y', 'z']})
+    stats = kb.sync(df, manifest_path=manifest)
+    assert (stats['inserted'], stats['unchanged']) == (3, 0)
+    assert sent_ids() == [1, 2, 3]
+
+    # nothing changed, order of columns doesn't matter
+    stats = kb.sync(df[['author', 'content', 'doc_id']], manifest_path=manifest)
+    assert (stats['inserted'], stats['unchanged']) == (0, 3)
+    assert sent_ids() == []
+
+    # changed, new and deleted rows, data as stream of dicts
+    rows = [
+        {'doc_id': 1, 'content': 'a', 'author': 'x'},
+        {'doc_id': 2, 'content': 'b2', 'author': 'y'},
+        {'doc_id': 4, 'content': 'd', 'author': 'w'},
+    ]
+    stats = kb.sync(iter(rows), manifest_path=manifest, delete_missing=True, block_rows=2)
+    assert (stats['inserted'], stats['unchanged'], stats['deleted']) == (2, 1, 1)
+    assert sent_ids() == [2, 4]
+    assert mock_post.call_args[1]['json']['query'] == "DELETE FROM mindsdb.kb1 WHERE id IN ('3')"
+
+    # failed insert doesn't change manifest
+    mock_put.side_effect = RuntimeError('fail')
+    rows[0]['content'] = 'a2'
+    with pytest.raises(BatchError):
+        kb.sync(rows, manifest_path=manifest)
+    mock_put.side_effect = None
+    mock_put.reset_mock()
+    stats = kb.sync(rows, manifest_path=manifest)
+    assert sent_ids() == [1]
+
+    # partially failed insert keeps rows of successful chunks
+    def fail_doc_3(url, json, **kwargs):
+        if any(row['doc_id'] == 3 for row in json['knowledge_base']['rows']):
+            raise ConnectionError('fail')
+        return put_response
+
+    mock_put.side_effect = fail_doc_3
+    rows = [{'doc_id': i, 'content': f'new {i}', 'author': 'x'} for i in range(1, 6)]
+    with pytest.raises(BatchError):
+        kb.sync(rows, manifest_path=manifest, chunk_size=2)
+    mock_put.side_effect = None
+    mock_put.reset_mock()
+    # first chunk isn't sent again, the last one wasn't sent after failure
+    stats = kb.sync(rows, manifest_path=manifest)
+    assert (stats['inserted'], stats['unchanged']) == (3, 2)
+    assert sent_ids() == [3, 4, 5]
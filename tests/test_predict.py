@@ -0,0 +1,117 @@
+import io
+import json
+from unittest.mock import patch
+from urllib.parse import urlparse, parse_qs
+
+import pandas as pd
+import pytest
+import requests
+
+import mindsdb_sdk
+from mindsdb_sdk.connectors import rest_api
+from mindsdb_sdk.connectors.decoders import RESULT_FORMATS
+from mindsdb_sdk.models import Model
+from tests.local_server import LocalServer, read_body, respond
+
+
+def predict(df: pd.DataFrame, params: dict) -> pd.DataFrame:
+    df = df.copy()
+    df['y'] = df['x'] * params.get('k', 1)
+    return df
+
+
+class PredictServer(LocalServer):
+    """
+    Local http server with predict endpoint. Server which doesn't support columnar formats
+    rejects their content types with 415. Server with error responds to any request with it
+    """
+
+    def __init__(self, columnar=True, error=None):
+        super().__init__()
+        self.columnar = columnar
+        self.error = error
+        self.requests = []
+
+    def do_POST(self, request):
+        body = read_body(request)
+        content_type = request.headers.get('Content-Type')
+        self.requests.append(content_type)
+        if self.error is not None:
+            status, detail = self.error
+            return respond(request, json.dumps({'detail': detail}), status=status)
+
+        if content_type in (RESULT_FORMATS['arrow'], rest_api.PREDICT_SPLIT_CONTENT_TYPE):
+            if not self.columnar:
+                return respond(request, '{}', status=415)
+
+        if content_type == RESULT_FORMATS['arrow']:
+            import pyarrow as pa
+            params = json.loads(parse_qs(urlparse(request.path).query)['params'][0])
+            df = predict(pa.ipc.open_stream(body).read_all().to_pandas(), params)
+            sink = io.BytesIO()
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return respond(request, sink.getvalue(), content_type=RESULT_FORMATS['arrow'])
+
+        body = json.loads(body)
+        if 'data' in body:
+            df = predict(pd.DataFrame(body['data']), body['params'])
+            return respond(request, df.to_json(orient='records'))
+        df = predict(pd.DataFrame(body['rows'], columns=body['columns']), body['params'])
+        return respond(request, df.to_json(orient='split', index=False))
+
+
+DATA = pd.DataFrame({'x': [1, 2, 3], 's': ['a', 'b', 'c']})
+
+
+@pytest.mark.parametrize('predict_format', ['records', 'split', 'arrow'])
+def test_predict_formats(predict_format):
+    if predict_format == 'arrow':
+        pytest.importorskip('pyarrow')
+
+    with PredictServer() as server:
+        con = mindsdb_sdk.connect(server.url, predict_format=predict_format)
+        model = Model(con, {'name': 'm1'})
+        result = model.predict(DATA, params={'k': 2})
+
+    assert list(result['y']) == [2, 4, 6]
+    assert list(result['s']) == ['a', 'b', 'c']
+    expected_type = {
+        'records': 'application/json',
+        'split': rest_api.PREDICT_SPLIT_CONTENT_TYPE,
+        'arrow': RESULT_FORMATS['arrow'],
+    }[predict_format]
+    assert server.requests == [expected_type]
+
+
+@pytest.mark.parametrize('predict_format', ['split', 'arrow'])
+def test_predict_fallback(predict_format):
+    if predict_format == 'arrow':
+        pytest.importorskip('pyarrow')
+
+    with PredictServer(columnar=False) as server:
+        con = mindsdb_sdk.connect(server.url, predict_format=predict_format)
+        model = Model(con, {'name': 'm1'})
+        result = model.predict(DATA)
+        assert list(result['y']) == [1, 2, 3]
+        assert len(server.requests) == 2
+
+        # 415: server doesn't support columnar format, records are sent at once
+        model.predict(DATA)
+        assert len(server.requests) == 3
+
+    # errors of model are not fallback, even if they mention format
+    for error in [(500, 'model failed'), (422, 'invalid date format in column x')]:
+        with PredictServer(error=error) as server:
+            con = mindsdb_sdk.connect(server.url, predict_format=predict_format)
+            model = Model(con, {'name': 'm1'})
+            # status check can be mocked by other tests
+            with patch.object(rest_api, '_raise_for_status', lambda r: r.raise_for_status()):
+                with pytest.raises(requests.HTTPError):
+                    model.predict(DATA)
+            assert len(server.requests) == 1
+            assert con.api._predict_formats_supported
+
+    with pytest.raises(ValueError):
+        mindsdb_sdk.connect(predict_format='xml')
@@ -0,0 +1,40 @@
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+from mindsdb_sql_parser.ast import Insert
+
+from mindsdb_sdk.utils.sql import render_values
+
+
+def render_ast(df):
+    return Insert(table='t', columns=list(df.columns), values=df.to_dict('split')['data']).to_string()
+
+
+def render(df):
+    return Insert(table='t', columns=list(df.columns)).to_string() + 'VALUES ' + ', '.join(render_values(df))
+
+
+def test_render_values_as_ast():
+    n = 20
+    df = pd.DataFrame({
+        'int': np.arange(n) - 10,
+        'float': [np.nan, 0.1, 1e20, -1e-7, np.inf] * (n // 5),
+        'float32': np.linspace(0, 1, n, dtype='float32'),
+        'bool': [True, False] * (n // 2),
+        'str': ["a'b", 'x"y', 'ж', '\n', '\\', None, '', 'plain', '\x00', '😀'] * (n // 10),
+        'mixed': pd.Series([1, 'a', 2.5, None, np.int64(3), np.nan, True, dt.date(2020, 1, 1), [1], 'b'] * (n // 10),
+                           dtype=object),
+        'datetime': pd.date_range('2020-01-01', periods=n, freq='37min'),
+        'datetime_tz': pd.date_range('2020-01-01', periods=n, freq='h', tz='UTC'),
+        'timedelta': pd.to_timedelta(np.arange(n), unit='s'),
+        'nullable': pd.array([None, 1, 2, 3] * (n // 4), dtype='Int64'),
+        'category': pd.Categorical(['x', 'y', None, 'z'] * (n // 4)),
+    })
+    df.loc[3, 'datetime'] = pd.NaT
+    df.loc[4, 'datetime'] = pd.Timestamp('2020-01-01 10:00:00.5')
+
+    for column in df.columns:
+        assert render(df[[column]]) == render_ast(df[[column]])
+    assert render(df) == render_ast(df)
+    assert render(df[:0]) == render_ast(df[:0])
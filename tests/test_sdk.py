@@ -1,4 +1,5 @@
 import datetime as dt
+import time
 from unittest.mock import Mock
 from unittest.mock import patch
 
@@ -7,34 +8,21 @@ import pandas as pd
 from mindsdb_sql_parser import parse_sql
 
 import mindsdb_sdk
-from mindsdb_sdk.models import ModelVersion
+from mindsdb_sdk.models import Model, ModelVersion
+from mindsdb_sdk.projects import Project
 from mindsdb_sdk.tables import Table
+from mindsdb_sdk.databases import Database
 from mindsdb_sdk.agents import Agent
 from mindsdb_sdk.connect import DEFAULT_LOCAL_API_URL, DEFAULT_CLOUD_API_URL
 from mindsdb_sdk.connectors import rest_api
+from mindsdb_sdk.utils.batch import BatchReport
+
+from tests.helpers import response_mock
 
 # patch _raise_for_status
 rest_api._raise_for_status = Mock()
 
 
-def response_mock(mock, data):
-    if isinstance(data, pd.DataFrame):
-        # to sql/query format (mostly used)
-        pd_data = data.to_dict('split')
-        data = {
-            'type': 'table',
-            'column_names': pd_data['columns'],
-            'data': pd_data['data']
-        }
-
-    def side_effect(*args, **kwargs):
-        r_mock = Mock()
-        r_mock.status_code = 200
-        r_mock.json.return_value = data
-        return r_mock
-    mock.side_effect = side_effect
-
-
 def responses_mock(mock, data):
     side_effect_fns = []
     for d in data:
@@ -344,7 +332,13 @@ class Test(BaseFlow):
         self.check_table(view)
 
         # get existing
+        response_mock(mock_post, pd.DataFrame([{'TABLE_NAME': 'v1'}]))
         view = project.get_view('v1')
+        check_sql_call(
+            mock_post,
+            f"SELECT TABLE_NAME FROM information_schema.tables WHERE TABLE_SCHEMA = '{project.name}'"
+            " AND TABLE_NAME = 'v1' AND TABLE_TYPE = 'VIEW'"
+        )
 
         assert view.name == 'v1'
         self.check_table(view)
@@ -627,6 +621,10 @@ class TestSimplify(BaseFlow):
         self.check_database(database)
 
         database = con.databases.get('db1')
+        check_sql_call(
+            mock_post,
+            "SELECT NAME, ENGINE, CONNECTION_DATA FROM information_schema.databases WHERE TYPE = 'data' AND NAME = 'db1'"
+        )
         database = con.databases.db1
         self.check_database(database)
 
@@ -654,6 +652,9 @@ class TestSimplify(BaseFlow):
         self.check_project(project, database)
 
         project = con.projects.get('db1')
+        check_sql_call(
+            mock_post, "SELECT NAME FROM information_schema.databases WHERE TYPE = 'project' AND NAME = 'db1'"
+        )
         project = con.projects.db1
         self.check_project(project, database)
 
@@ -711,6 +712,7 @@ class TestSimplify(BaseFlow):
         assert handler.title == 'OpenAI'
 
         _ = con.ml_handlers.get('openai')
+        check_sql_call(mock_post, "show handlers WHERE type = 'ml' AND name = 'openai'")
         openai_handler = con.ml_handlers.openai
 
         # --------- ml_engines -------------
@@ -725,6 +727,7 @@ class TestSimplify(BaseFlow):
         assert ml_engine.handler == 'openai'
 
         _ = con.ml_engines.get('openai1')
+        check_sql_call(mock_post, "show ml_engines WHERE name = 'openai1'")
         _ = con.ml_engines.openai1
 
         con.ml_engines.create(
@@ -794,7 +797,13 @@ class CustomPredictor():
         self.check_table(view)
 
         # get existing
+        response_mock(mock_post, pd.DataFrame([{'TABLE_NAME': 'v1'}]))
         view = project.views.get('v1')
+        check_sql_call(
+            mock_post,
+            f"SELECT TABLE_NAME FROM information_schema.tables WHERE TABLE_SCHEMA = '{project.name}'"
+            " AND TABLE_NAME = 'v1' AND TABLE_TYPE = 'VIEW'"
+        )
         view = project.views.v1
 
         assert view.name == 'v1'
@@ -1581,6 +1590,40 @@ class TestAgents():
         }
         assert completion.content == 'Angel Falls in Venezuela at 979m'
 
+    @patch('requests.Session.post')
+    def test_completion_many(self, mock_post):
+        def post(url, json=None, **kwargs):
+            question = json['messages'][0]['question']
+            if question == 'q1':
+                raise RuntimeError('agent failed')
+            # later conversations are completed earlier
+            time.sleep(0.03 if question == 'q0' else 0)
+            r_mock = Mock()
+            r_mock.status_code = 200
+            r_mock.json.return_value = {'message': {'content': f'answer {question}', 'role': 'assistant'}}
+            return r_mock
+        mock_post.side_effect = post
+
+        server = mindsdb_sdk.connect()
+        messages_list = [[{'question': f'q{i}', 'answer': None}] for i in range(5)]
+        reports = []
+        report = BatchReport()
+        results = server.agents.completion_many(
+            'test_agent', messages_list, max_concurrency=3, rate_limit=1000, on_progress=reports.append,
+            report=report
+        )
+
+        assert [r.content for r in results if not isinstance(r, Exception)] == [
+            'answer q0', 'answer q2', 'answer q3', 'answer q4'
+        ]
+        assert isinstance(results[1], RuntimeError)
+        assert len(reports[-1].completed) == 4
+        assert reports[-1].p95 >= reports[-1].p50
+        # final report
+        assert report.completed == {0, 2, 3, 4}
+        assert list(report.failed) == [1]
+        assert report.finished_at is not None
+
     @patch('requests.Session.delete')
     def test_delete(self, mock_delete):
         server = mindsdb_sdk.connect()
@@ -1590,7 +1633,9 @@ class TestAgents():
 
     @patch('requests.Session.get')
     @patch('requests.Session.put')
-    def test_add_file(self, mock_put, mock_get):
+    def test_add_file(self, mock_put, mock_get, tmp_path, monkeypatch):
+        # manifest of uploaded files is kept in temporary directory
+        monkeypatch.setattr('mindsdb_sdk.utils.sync.DEFAULT_SYNC_DIR', str(tmp_path))
         server = mindsdb_sdk.connect()
         responses_mock(mock_get, [
             # Existing agent get.
@@ -1671,6 +1716,71 @@ class TestAgents():
         }
         assert agent_update_json == expected_agent_json
 
+    @patch('requests.Session.get')
+    @patch('requests.Session.put')
+    def test_add_files(self, mock_put, mock_get, tmp_path):
+        server = mindsdb_sdk.connect()
+        agent_data = {
+            'name': 'test_agent',
+            'project_id': 1,
+            'model': {'model_name': 'gpt-3.5-turbo'},
+            'data': {'tables': []},
+            'created_at': None,
+            'updated_at': None,
+        }
+        responses_mock(mock_get, [
+            agent_data,
+            # list of files is requested once
+            [{'name': 'existing'}],
+        ])
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = agent_data
+        mock_put.return_value = response
+
+        paths = []
+        for name, content in [('a.txt', b'a'), ('b.txt', b'b'), ('copy_of_a.txt', b'a'), ('existing.txt', b'e')]:
+            path = tmp_path / name
+            path.write_bytes(content)
+            paths.append(str(path))
+
+        manifest_path = str(tmp_path / 'files.sqlite')
+        server.agents.add_files('test_agent', paths, max_workers=2, manifest_path=manifest_path)
+
+        uploads = [call[0][0] for call in mock_put.call_args_list if '/api/files/' in call[0][0]]
+        assert sorted(uploads) == [
+            f'{DEFAULT_LOCAL_API_URL}/api/files/a',
+            f'{DEFAULT_LOCAL_API_URL}/api/files/b',
+        ]
+        # file is uploaded with extension: server recognizes type of file by it
+        bodies = [
+            b''.join(part for part in call[1]['data']._parts if isinstance(part, bytes))
+            for call in mock_put.call_args_list if '/api/files/' in call[0][0]
+        ]
+        for filename in (b'a.txt', b'b.txt'):
+            body = next(body for body in bodies if b'filename="' + filename + b'"' in body)
+            assert b'name="original_file_name"\r\n\r\n' + filename + b'\r\n' in body
+        assert len([call for call in mock_get.call_args_list if '/api/files/' in call[0][0]]) == 1
+
+        # agent is updated once, copy of file refers to the uploaded one
+        updates = [call for call in mock_put.call_args_list if '/agents/' in call[0][0]]
+        assert len(updates) == 1
+        assert updates[0][1]['json']['agent']['data']['tables'] == ['files.a', 'files.b', 'files.existing']
+
+        # the same content in the next call isn't uploaded again
+        mock_put.reset_mock()
+        responses_mock(mock_get, [
+            dict(agent_data, data={'tables': []}),
+            [{'name': 'existing'}, {'name': 'a'}, {'name': 'b'}],
+        ])
+        path = tmp_path / 'other_copy_of_b.txt'
+        path.write_bytes(b'b')
+        server.agents.add_files('test_agent', [str(path)], manifest_path=manifest_path)
+
+        assert not [call for call in mock_put.call_args_list if '/api/files/' in call[0][0]]
+        updates = [call for call in mock_put.call_args_list if '/agents/' in call[0][0]]
+        assert updates[0][1]['json']['agent']['data']['tables'] == ['files.b']
+
     @patch('requests.Session.get')
     @patch('requests.Session.put')
     def test_add_webpage(self, mock_put, mock_get):
@@ -1969,3 +2079,122 @@ class TestConfig():
             'api_key': 'cohere-test789'
         }
 
+
+
+
+class TestFetchIter:
+
+    @patch('requests.Session.post')
+    def test_table(self, mock_post):
+        server = mindsdb_sdk.connect(login='a@b.com')
+        table = Database(server, 'db1').tables.get('t1').filter(a=1)
+
+        responses_mock(mock_post, [
+            pd.DataFrame([{'id': 1}, {'id': 2}]),
+            pd.DataFrame([{'id': 3}, {'id': 4}]),
+            pd.DataFrame([{'id': 5}]),
+        ])
+        batches = list(table.fetch_iter(batch_size=2))
+        assert [list(df['id']) for df in batches] == [[1, 2], [3, 4], [5]]
+
+        check_sql_call(mock_post, 'SELECT * FROM db1.t1 WHERE a = 1 LIMIT 2', call_stack_num=-3)
+        check_sql_call(mock_post, 'SELECT * FROM db1.t1 WHERE a = 1 LIMIT 2 OFFSET 2', call_stack_num=-2)
+        check_sql_call(mock_post, 'SELECT * FROM db1.t1 WHERE a = 1 LIMIT 2 OFFSET 4', call_stack_num=-1)
+
+        # keyset pagination, total limit of the table is respected
+        responses_mock(mock_post, [
+            pd.DataFrame([{'id': 1}, {'id': 2}]),
+            pd.DataFrame([{'id': 3}]),
+        ])
+        batches = list(table.limit(3).fetch_iter(batch_size=2, order_by='id'))
+        assert [list(df['id']) for df in batches] == [[1, 2], [3]]
+
+        check_sql_call(mock_post, 'SELECT * FROM db1.t1 WHERE a = 1 ORDER BY id LIMIT 2', call_stack_num=-2)
+        check_sql_call(mock_post, 'SELECT * FROM db1.t1 WHERE a = 1 AND id > 2 ORDER BY id LIMIT 1', call_stack_num=-1)
+
+    @patch('requests.Session.post')
+    def test_query(self, mock_post):
+        server = mindsdb_sdk.connect(login='a@b.com')
+
+        responses_mock(mock_post, [
+            pd.DataFrame([{'x': 1}, {'x': 2}]),
+            pd.DataFrame([], columns=['x']),
+        ])
+        query = server.query('select x from t1 where y=1')
+        batches = list(query.fetch_iter(batch_size=2))
+        assert len(batches) == 1
+
+        check_sql_call(mock_post, 'SELECT * FROM (SELECT x FROM t1 WHERE y = 1) AS t LIMIT 2',
+                       database='mindsdb', call_stack_num=-2)
+        check_sql_call(mock_post, 'SELECT * FROM (SELECT x FROM t1 WHERE y = 1) AS t LIMIT 2 OFFSET 2',
+                       database='mindsdb', call_stack_num=-1)
+
+        # limit of query: batch is not requested after the last row
+        mock_post.reset_mock()
+        responses_mock(mock_post, [
+            pd.DataFrame([{'x': 1}, {'x': 2}]),
+            pd.DataFrame([{'x': 3}]),
+        ])
+        query = server.query('select x from t1 order by x limit 3')
+        batches = list(query.fetch_iter(batch_size=2))
+        assert [list(df['x']) for df in batches] == [[1, 2], [3]]
+
+        assert mock_post.call_count == 2
+        check_sql_call(mock_post, 'SELECT * FROM (SELECT x FROM t1 ORDER BY x LIMIT 3) AS t LIMIT 2',
+                       database='mindsdb', call_stack_num=-2)
+        check_sql_call(mock_post, 'SELECT * FROM (SELECT x FROM t1 ORDER BY x LIMIT 3) AS t LIMIT 1 OFFSET 2',
+                       database='mindsdb', call_stack_num=-1)
+
+
+class TestWaitModels:
+
+    @patch('mindsdb_sdk.models.time.sleep')
+    @patch('requests.Session.post')
+    def test_wait_all(self, mock_post, mock_sleep):
+        server = mindsdb_sdk.connect(login='a@b.com')
+        project = Project(server, server.api, 'proj')
+        m1 = Model(project, {'name': 'm1', 'status': 'generating'})
+        m2 = ModelVersion(project, {'name': 'm2', 'version': 2, 'status': 'generating'})
+
+        def status(m1, m2_v1, m2_v2):
+            return pd.DataFrame([
+                {'NAME': 'm1', 'VERSION': 1, 'ACTIVE': '1', 'STATUS': m1, 'ERROR': None},
+                {'NAME': 'm2', 'VERSION': 1, 'ACTIVE': '1', 'STATUS': m2_v1, 'ERROR': None},
+                {'NAME': 'm2', 'VERSION': 2, 'ACTIVE': '0', 'STATUS': m2_v2, 'ERROR': 'fail'},
+            ])
+
+        responses_mock(mock_post, [
+            status('generating', 'complete', 'training'),
+            status('training', 'complete', 'error'),
+            status('complete', 'complete', 'error'),
+        ])
+        mock_post.reset_mock()
+        finished = list(project.models.wait_all([m1, m2]))
+
+        assert finished == [m2, m1]
+        assert m2.data['status'] == 'error' and m2.data['error'] == 'fail'
+        assert m1.data['status'] == 'complete'
+
+        # one query for all models
+        assert mock_post.call_count == 3
+        check_sql_call(mock_post, "SELECT NAME, VERSION, ACTIVE, STATUS, ERROR FROM models WHERE NAME IN ('m1', 'm2')",
+                       call_stack_num=0)
+        # finished models are not requested
+        check_sql_call(mock_post, "SELECT NAME, VERSION, ACTIVE, STATUS, ERROR FROM models WHERE NAME IN ('m1')")
+
+        # delays grow exponentially
+        delays = [call[0][0] for call in mock_sleep.call_args_list]
+        assert 0.15 <= delays[0] <= 0.3
+        assert 0.3 * 1.5 ** 2 / 2 <= delays[2] <= 0.3 * 1.5 ** 2
+
+        # training error
+        m2.data['status'] = 'generating'
+        responses_mock(mock_post, [status('complete', 'complete', 'error')])
+        with pytest.raises(RuntimeError):
+            m2.wait_complete()
+
+        # timeout
+        responses_mock(mock_post, [status('training', 'complete', 'error')] * 10)
+        with patch('mindsdb_sdk.models.time.monotonic', side_effect=[0, 0, 1, 2, 3, 4]):
+            with pytest.raises(TimeoutError):
+                m1.wait_complete(timeout=2)
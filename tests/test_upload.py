@@ -0,0 +1,248 @@
+import gzip
+import io
+import json
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+
+import mindsdb_sdk
+from mindsdb_sdk.connectors.multipart import MultipartEncoder
+from mindsdb_sdk.utils.dataframe import iter_csv
+from mindsdb_sdk.utils.upload import choose_upload_format
+from tests.local_server import LocalServer, read_body, respond
+
+
+def parse_multipart(body: bytes, content_type: str) -> dict:
+    boundary = content_type.split('boundary=')[1].encode()
+    fields = {}
+    for part in body.split(b'--' + boundary)[1:-1]:
+        headers, content = part[2:-2].split(b'\r\n\r\n', 1)
+        name = headers.decode().split('name="')[1].split('"')[0]
+        fields[name] = content
+    return fields
+
+
+class UploadServer(LocalServer):
+    """
+    Local http server which accepts upload of files
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def __init__(self):
+        super().__init__()
+        self.uploads = []
+
+    def do_PUT(self, request):
+        body = read_body(request)
+        self.uploads.append({
+            'path': request.path,
+            'chunked': request.headers.get('Transfer-Encoding') == 'chunked',
+            'fields': parse_multipart(body, request.headers['Content-Type']),
+        })
+        respond(request)
+
+
+def test_iter_csv():
+    df = pd.DataFrame({'a': np.arange(25), 'b': ['x, "y"', None, 'z', 'w', 'v'] * 5})
+    assert b''.join(iter_csv(df, block_rows=10)) == df.to_csv(index=False).encode()
+    assert b''.join(iter_csv(df[:0])) == df[:0].to_csv(index=False).encode()
+
+
+def test_multipart_encoder(tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(os.urandom(100000))
+
+    with open(path, 'rb') as fd:
+        encoder = MultipartEncoder({'name': 'data'}, {'file': ('data.bin', fd)}, block_size=4096)
+        blocks = list(encoder)
+    assert max(len(block) for block in blocks) <= 4096
+    body = b''.join(blocks)
+    assert encoder.len == len(body)
+
+    fields = parse_multipart(body, encoder.content_type)
+    assert fields['name'] == b'data'
+    assert fields['file'] == path.read_bytes()
+
+    # size of iterable is unknown
+    assert MultipartEncoder({}, {'file': ('a.csv', iter([b'a']))}).len is None
+
+
+def test_streaming_upload(tmp_path):
+    path = tmp_path / 'big.csv'
+    content = b'a,b\n' + b'1,2\n' * 500000
+    path.write_bytes(content)
+
+    df = pd.DataFrame({'a': np.arange(30000), 'b': ['text'] * 30000})
+
+    with UploadServer() as server:
+        con = mindsdb_sdk.connect(server.url)
+
+        # file is read by blocks and sent with content length
+        con.api.upload_file('big.csv', str(path))
+        upload = server.uploads[-1]
+        assert upload['path'] == '/api/files/big'
+        assert not upload['chunked']
+        assert upload['fields']['name'] == b'big'
+        assert upload['fields']['file'] == content
+
+        # small dataframe
+        con.api.upload_file('small', df[:10])
+        assert not server.uploads[-1]['chunked']
+        assert server.uploads[-1]['fields']['file'] == df[:10].to_csv(index=False).encode()
+
+        # big dataframe is encoded to csv by blocks
+        with patch('mindsdb_sdk.connectors.rest_api.STREAM_UPLOAD_MIN_SIZE', 0):
+            con.api.upload_file('df', df, file_format='csv')
+        upload = server.uploads[-1]
+        assert upload['chunked']
+        assert upload['fields']['file'] == df.to_csv(index=False).encode()
+
+
+def decode_upload(content: bytes, file_name: str) -> pd.DataFrame:
+    if file_name.endswith('.parquet'):
+        return pd.read_parquet(io.BytesIO(content))
+    if file_name.endswith('.arrow'):
+        import pyarrow as pa
+        return pa.ipc.open_stream(content).read_all().to_pandas()
+    if file_name.endswith('.csv.gz'):
+        content = gzip.decompress(content)
+    elif file_name.endswith('.csv.zst'):
+        import zstandard
+        content = zstandard.ZstdDecompressor().decompressobj().decompress(content)
+    return pd.read_csv(io.BytesIO(content))
+
+
+@pytest.mark.parametrize('file_format', ['csv', 'csv.gz', 'csv.zst', 'parquet', 'arrow'])
+@pytest.mark.parametrize('stream', [False, True])
+def test_upload_formats(file_format, stream):
+    if file_format in ('parquet', 'arrow'):
+        pytest.importorskip('pyarrow')
+    if file_format == 'csv.zst':
+        pytest.importorskip('zstandard')
+
+    df = pd.DataFrame({'a': np.arange(1000), 'b': [f'v{i % 7}' for i in range(1000)], 'c': np.linspace(0, 1, 1000)})
+
+    min_size = 0 if stream else 1 << 24
+    with UploadServer() as server, patch('mindsdb_sdk.connectors.rest_api.STREAM_UPLOAD_MIN_SIZE', min_size), \
+            patch('mindsdb_sdk.utils.upload.ENCODE_BLOCK_ROWS', 300):
+        con = mindsdb_sdk.connect(server.url)
+        con.api.upload_file('df', df, file_format=file_format)
+
+    upload = server.uploads[-1]
+    assert upload['chunked'] == stream
+    assert upload['fields']['name'] == b'df'
+    file_name = upload['fields']['original_file_name'].decode()
+    if file_format != 'csv':
+        assert file_name == f'df.{file_format}'
+    pd.testing.assert_frame_equal(decode_upload(upload['fields']['file'], file_name), df)
+
+
+def test_choose_upload_format():
+    pytest.importorskip('pyarrow')
+
+    small = pd.DataFrame({'a': [1, 2]})
+    big = pd.DataFrame({'a': np.arange(200000)})
+    assert choose_upload_format(small) == 'csv'
+    assert choose_upload_format(big) == 'parquet'
+    # not supported by server
+    assert choose_upload_format(big, ['csv']) == 'csv'
+    assert choose_upload_format(big, ['csv', 'csv.gz']) == 'csv.gz'
+
+    with pytest.raises(ValueError):
+        mindsdb_sdk.connect(upload_formats=['xlsx'])
+
+
+class PartsServer(LocalServer):
+    """
+    Local http server which accepts upload of files by parts.
+    `drops` is a dict: number of part -> count of times when connection is dropped during upload of this part
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def __init__(self, drops: dict = None):
+        super().__init__()
+        self.drops = dict(drops or {})
+        self.uploads = {}
+        self.part_requests = []
+        self.files = {}
+
+    def do_POST(self, request):
+        body = json.loads(read_body(request))
+        path = request.path.split('/')
+        if path[-1] == 'parts':
+            upload_id = f'u{len(self.uploads)}'
+            self.uploads[upload_id] = {}
+            respond(request, json.dumps({'upload_id': upload_id}))
+        else:
+            # complete
+            name, upload_id = path[3], path[5]
+            parts = self.uploads.pop(upload_id)
+            assert sorted(parts) == list(range(body['parts']))
+            self.files[name] = b''.join(parts[i] for i in range(body['parts']))
+            respond(request, '{}')
+
+    def do_GET(self, request):
+        upload_id = request.path.split('/')[5]
+        if upload_id not in self.uploads:
+            respond(request, '{}', status=404)
+        else:
+            respond(request, json.dumps({'parts': list(self.uploads[upload_id])}))
+
+    def do_PUT(self, request):
+        path = request.path.split('/')
+        upload_id, num = path[5], int(path[6])
+        self.part_requests.append(num)
+        size = int(request.headers['Content-Length'])
+        if self.drops.get(num, 0) > 0:
+            # connection is dropped in the middle of part
+            self.drops[num] -= 1
+            request.rfile.read(size // 2)
+            request.close_connection = True
+            return
+        self.uploads[upload_id][num] = request.rfile.read(size)
+        respond(request, '{}')
+
+
+@patch('mindsdb_sdk.connectors.parts_upload.RETRY_MAX_WAIT', 0)
+def test_parts_upload(tmp_path):
+    path = tmp_path / 'big.csv'
+    content = os.urandom(10000)
+    path.write_bytes(content)
+    manifest_dir = tmp_path / 'manifests'
+
+    with patch('mindsdb_sdk.connectors.parts_upload.DEFAULT_MANIFEST_DIR', str(manifest_dir)):
+        # dropped connections are retried
+        with PartsServer(drops={3: 2}) as server:
+            con = mindsdb_sdk.connect(server.url)
+            # file is opened by parts, not for single request
+            with patch.object(con.api, 'open_file', side_effect=AssertionError):
+                con.api.upload_file('big.csv', str(path), part_size=1000)
+        assert server.files['big'] == content
+        assert server.part_requests.count(3) == 3
+        assert os.listdir(manifest_dir) == []
+
+        # upload fails after retries, it is continued from not acknowledged part
+        with PartsServer(drops={6: 100}) as server:
+            con = mindsdb_sdk.connect(server.url)
+            with pytest.raises(requests.ConnectionError):
+                con.api.upload_file('big.csv', str(path), part_size=1000)
+            assert len(os.listdir(manifest_dir)) == 1
+
+            server.drops = {}
+            server.part_requests = []
+            con.api.upload_file('big.csv', str(path), part_size=1000, resume=True)
+        assert server.part_requests == [6, 7, 8, 9]
+        assert server.files['big'] == content
+        assert os.listdir(manifest_dir) == []
+
+    # server doesn't support upload by parts
+    with UploadServer() as server:
+        con = mindsdb_sdk.connect(server.url)
+        con.api.upload_file('big.csv', str(path), part_size=1000)
+    assert server.uploads[-1]['fields']['file'] == content